@@ -5,10 +5,9 @@ from app.dependencies.db_dependency import get_async_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.auth_dependency import get_current_user
 from app.models.user import User
-from app.dependencies.rate_limiter import limiter, rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
+from app.dependencies.rate_limiter import limiter
 from app.schemas.barangay_schema import BarangayAccountCreate
-from app.admin._super_admin_services import create_barangay_account, create_complaint_category, create_department, create_lgu_account, delete_pinecone_data, get_user_rejected_complaints, verify_user_account, get_all_unverified_users, get_all_categories, get_all_users, update_category_configs, get_submission_restricted_users, get_suspended_users, lift_suspension, remove_submission_restriction
+from app.admin._super_admin_services import create_barangay_account, create_complaint_category, create_department, create_lgu_account, delete_pinecone_data, reset_rag_caches, get_user_rejected_complaints, verify_user_account, get_all_unverified_users, get_all_categories, get_all_users, update_category_configs, get_submission_restricted_users, get_suspended_users, lift_suspension, remove_submission_restriction
 from fastapi import status
 from app.admin._super_admin_schemas import ComplaintCategoryCreate, LGUAccountCreate, DepartmentAccountCreate, CategoryConfigsUpdate
 from app.schemas.emergency_hotline import CreateEmergencyHotlineModel
@@ -47,8 +46,6 @@ async def get_emergency_hotlines_route(
 async def create_barangay(request: Request, barangay_data: BarangayAccountCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         return await create_barangay_account(barangay_data, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -57,8 +54,6 @@ async def create_barangay(request: Request, barangay_data: BarangayAccountCreate
 async def create_category(request: Request, category_data: ComplaintCategoryCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         return await create_complaint_category(category_data, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -68,8 +63,6 @@ async def create_category(request: Request, category_data: ComplaintCategoryCrea
 async def create_department_route(request: Request, department_data: DepartmentAccountCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         return await create_department(department_data, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -79,8 +72,6 @@ async def create_department_route(request: Request, department_data: DepartmentA
 async def create_lgu_account_route(request: Request, lgu_data: LGUAccountCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         return await create_lgu_account(lgu_data, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -89,8 +80,6 @@ async def create_lgu_account_route(request: Request, lgu_data: LGUAccountCreate,
 async def verify_user_account_route(request: Request, user_id: int, db: AsyncSession = Depends(get_async_db)):
     try:
         return await verify_user_account(user_id, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
 
@@ -105,8 +94,6 @@ async def get_unverified_users_route(
 ):
     try:
         return await get_all_unverified_users(current_user, db, page=page, page_size=page_size)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
 
@@ -123,8 +110,6 @@ async def get_users_route(
 ):
     try:
         return await get_all_users(current_user, db, page=page, page_size=page_size, is_verified=is_verified)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
 
@@ -137,8 +122,6 @@ async def get_categories_route(
 ):
     try:
         return await get_all_categories(current_user, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -153,8 +136,6 @@ async def update_category_configs_route(
 ):
     try:
         return await update_category_configs(category_id, config_data, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
 
@@ -177,11 +158,10 @@ async def delete_pinecone_data_route(request: Request, index_name: str, db: Asyn
         # Delete all vectors
         index = pc.Index(index_name)
         index.delete(delete_all=True)
+        await reset_rag_caches(index_name)
         
         return {"detail": f"Pinecone data deleted successfully from index '{index_name}'"}
     
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -199,8 +179,6 @@ async def get_submission_restricted_users_route(
 ):
     try:
         return await get_submission_restricted_users(current_user, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -213,8 +191,6 @@ async def get_suspended_users_route(
 ):
     try:
         return await get_suspended_users(current_user, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
 
@@ -228,8 +204,6 @@ async def lift_suspension_route(
 ):
     try:
         return await lift_suspension(user_id, current_user, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -243,8 +217,6 @@ async def remove_submission_restriction_route(
 ):
     try:
         return await remove_submission_restriction(user_id, current_user, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
     
@@ -258,7 +230,5 @@ async def get_user_rejected_complaints_route(
 ):
     try:
         return await get_user_rejected_complaints(user_id, current_user, db)
-    except RateLimitExceeded as e:
-        raise rate_limit_exceeded_handler(None, e)
     except HTTPException as e:
         raise e
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import HTTPException, status
 from pinecone import Pinecone
-from sqlalchemy.ext import asyncio
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.department import Department
 from app.models.complaint import Complaint
@@ -14,12 +14,14 @@ from app.models.barangay_account import BarangayAccount
 from app.schemas.barangay_schema import BarangayWithUserData, BarangayAccountCreate
 from app.admin._super_admin_schemas import ComplaintCategoryCreate, DepartmentAccountCreate, LGUAccountCreate, CategoryConfigsUpdate
 from sqlalchemy import select, func
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from datetime import datetime
 from sqlalchemy.orm import selectinload
 from app.constants.roles import UserRole
 from app.core.config import settings
 from app.utils.caching import delete_cache
+from app.domain.IEmbeddingService.vector_store.hybrid_rag_repository import reset_corpus
+from app.services.semantic_cache_service import semantic_answer_cache
 from typing import Optional
 from app.constants.complaint_status import ComplaintStatus
 
@@ -165,7 +167,7 @@ async def create_barangay_account(barangay_data: BarangayAccountCreate, db: Asyn
     if result.scalars().first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Barangay account already exists")
 
-    hashed_password = hash_password(barangay_data.password)
+    hashed_password = await hash_password_async(barangay_data.password)
 
     new_account = User(
         email=barangay_data.barangay_email,
@@ -218,7 +220,7 @@ async def create_department(department_data: DepartmentAccountCreate, db: AsyncS
     if result.scalars().first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Department account already exists")
 
-    hashed_password = hash_password(department_data.password)
+    hashed_password = await hash_password_async(department_data.password)
 
     new_account = User(
         email=department_data.email,
@@ -251,7 +253,7 @@ async def create_lgu_account(lgu_data: LGUAccountCreate, db: AsyncSession):
         if result.scalars().first():
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="LGU account already exists")
 
-        hashed_password = hash_password(lgu_data.password)
+        hashed_password = await hash_password_async(lgu_data.password)
 
         new_account = User(
             email=lgu_data.email,
@@ -268,6 +270,13 @@ async def create_lgu_account(lgu_data: LGUAccountCreate, db: AsyncSession):
     except HTTPException as e:
         raise e
     
+async def reset_rag_caches(index_name: str) -> None:
+    """After a purge of the RAG index, drop every process's in-memory corpus and all cached answers."""
+    if index_name != settings.PINECONE_RAG_INDEX_NAME:
+        return
+    await reset_corpus()
+    await semantic_answer_cache.clear()
+
 async def delete_pinecone_data(index_name: str):
     try:
         # Create Pinecone client
@@ -288,6 +297,7 @@ async def delete_pinecone_data(index_name: str):
         
         # Delete all vectors
         await asyncio.to_thread(index.delete, delete_all=True)
+        await reset_rag_caches(index_name)
         
         return {"message": f"All data deleted from index '{index_name}'"}
     
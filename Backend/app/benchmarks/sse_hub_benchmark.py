@@ -0,0 +1,135 @@
+"""SSE hub fan-out benchmark.
+
+Opens many in-process streams on an SSEHub, each drained by its own task
+through SSEHub.frames (the generator /notifications/stream iterates), and
+measures stream setup, broadcast latency, per-user event throughput, a
+keepalive tick and teardown. No Redis or HTTP is involved, so the numbers are
+the hub's own cost per process.
+
+    python -m app.benchmarks.sse_hub_benchmark --streams 10000
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+
+from app.services.sse_hub import SSEHub, encode_event
+
+
+class _Counter:
+    def __init__(self):
+        self.received = 0
+        self.target = 0
+        self.done = asyncio.Event()
+
+    def expect(self, target: int) -> None:
+        self.received = 0
+        self.target = target
+        self.done.clear()
+
+
+async def _consume(hub: SSEHub, queue: asyncio.Queue, counter: _Counter) -> None:
+    async for _ in hub.frames(queue):
+        counter.received += 1
+        if counter.received >= counter.target:
+            counter.done.set()
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.1f} ms"
+
+
+async def run(streams: int, streams_per_user: int, broadcasts: int, user_events: int, queue_size: int) -> dict:
+    hub = SSEHub(queue_size=queue_size, keepalive_seconds=3600)
+    counter = _Counter()
+    users = max(1, streams // streams_per_user)
+    results = {"streams": streams, "users": users}
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    registered = []
+    consumers = []
+    for index in range(streams):
+        user_id = str(index % users)
+        queue, _ = hub.register(user_id)
+        registered.append((user_id, queue))
+        consumers.append(asyncio.create_task(_consume(hub, queue, counter)))
+    await asyncio.sleep(0)
+    results["open"] = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["bytes_per_stream"] = peak / streams
+    assert hub.connection_count == streams
+
+    frame = encode_event("announcement", json.dumps({"title": "Benchmark", "message": "x" * 200}))
+    counter.expect(streams * broadcasts)
+    start = time.perf_counter()
+    for _ in range(broadcasts):
+        hub.publish_all((None, frame))
+    publish_elapsed = time.perf_counter() - start
+    await counter.done.wait()
+    results["broadcast_publish"] = publish_elapsed / broadcasts
+    results["broadcast_delivered"] = (time.perf_counter() - start) / broadcasts
+
+    counter.expect(user_events * streams_per_user)
+    start = time.perf_counter()
+    for index in range(user_events):
+        event_id = f"{index + 1}-0"
+        frame = encode_event("notification", json.dumps({"title": "Benchmark", "message": "y" * 200}), event_id)
+        hub.publish_user(str(index % users), ((index + 1, 0), frame))
+        # Let consumers drain between batches, as the Redis listener would
+        if index % 1000 == 999:
+            await asyncio.sleep(0)
+    await counter.done.wait()
+    results["user_events_per_second"] = user_events / (time.perf_counter() - start)
+
+    counter.expect(streams)
+    start = time.perf_counter()
+    sent = hub.send_keepalives()
+    results["keepalive_tick"] = time.perf_counter() - start
+    await counter.done.wait()
+    assert sent == streams
+
+    start = time.perf_counter()
+    for user_index in range(users):
+        hub.close_user(str(user_index))
+    await asyncio.gather(*consumers)
+    for user_id, queue in registered:
+        hub.unregister(user_id, queue)
+    results["close"] = time.perf_counter() - start
+    hub.stop()
+
+    results["overflows"] = hub.stats()["overflows"]
+    assert hub.connection_count == 0 and hub.user_count == 0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=10000)
+    parser.add_argument("--streams-per-user", type=int, default=1)
+    parser.add_argument("--broadcasts", type=int, default=20)
+    parser.add_argument("--user-events", type=int, default=50000)
+    parser.add_argument("--queue-size", type=int, default=100)
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(args.streams, args.streams_per_user, args.broadcasts, args.user_events, args.queue_size)
+    )
+    print(f"streams:                  {results['streams']:,} ({results['users']:,} users)")
+    print(f"open all streams:         {_ms(results['open'])}")
+    print(f"memory per stream:        {results['bytes_per_stream']:,.0f} bytes")
+    print(f"broadcast publish:        {_ms(results['broadcast_publish'])} per event")
+    print(f"broadcast delivered:      {_ms(results['broadcast_delivered'])} per event to all streams")
+    print(f"user events:              {results['user_events_per_second']:,.0f} per second")
+    print(f"keepalive tick:           {_ms(results['keepalive_tick'])}")
+    print(f"close all streams:        {_ms(results['close'])}")
+    print(f"queue overflows:          {results['overflows']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown, worker_ready
 from datetime import timedelta
 from app.core.config import settings
+from app.core.clients import clients
 
 celery_worker = Celery(
     "worker",
@@ -29,8 +32,30 @@ celery_worker.conf.beat_schedule = {
         "task": "app.tasks.restriction_tasks.unrestrict_users_task",
         "schedule": timedelta(minutes=10),
     },
+    "reconcile-complaint-rollup-nightly": {
+        "task": "app.tasks.rollup_tasks.reconcile_complaint_rollup_task",
+        "schedule": crontab(hour=18, minute=0),  # 02:00 Asia/Manila
+    },
 }
 
 celery_worker.autodiscover_tasks([
     "app.tasks",
-])
\ No newline at end of file
+])
+
+
+@worker_process_init.connect
+def _start_clients(**kwargs):
+    # One set of pooled outbound clients per worker process, reused by every task
+    clients.start()
+
+
+@worker_process_shutdown.connect
+def _close_clients(**kwargs):
+    from app.tasks.worker_loop import run_async
+    run_async(clients.aclose())
+
+
+@worker_ready.connect
+def _backfill_rollup(**kwargs):
+    # Dashboards read complaint_daily_rollup; seed it on first deploy instead of waiting for the nightly rebuild
+    celery_worker.send_task("app.tasks.rollup_tasks.backfill_complaint_rollup_task")
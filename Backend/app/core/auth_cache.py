@@ -0,0 +1,277 @@
+"""In-process authentication caches.
+
+Keeps three things local to each API process so authenticating a request
+needs no Redis round-trip:
+
+- decoded JWT claims, keyed by a hash of the token and kept until the
+  token's own ``exp``;
+- the set of revoked token ids (jti), loaded from Redis once and then kept
+  in sync through the ``auth:invalidate`` pub/sub channel;
+- a compact snapshot of each recently authenticated user (id, role, account
+  ids), dropped when another process announces a change to that user.
+
+Until the pub/sub listener is subscribed and the revoked set loaded, and
+whenever the subscription drops, revocation and user lookups fall back to
+Redis, so a missed message can never let a revoked token through.
+Revocations written before the index existed (bare ``jwt_denylist:{jti}``
+keys) are copied into it by the first process to sync.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis import pubsub_client, redis_client
+from app.utils.logger import logger
+
+INVALIDATION_CHANNEL = "auth:invalidate"
+TOKEN_DENYLIST_PREFIX = "jwt_denylist"
+# Sorted set of revoked jtis scored by their expiry, used to seed local sets
+TOKEN_DENYLIST_INDEX = "jwt_denylist_index"
+# Set once jtis revoked before the index existed have been copied into it
+TOKEN_DENYLIST_BACKFILLED = "jwt_denylist_index:backfilled"
+TOKEN_DENYLIST_SCAN_BATCH = 500
+USER_CACHE_PREFIX = "auth_user"
+SYNC_RETRY_SECONDS = 5
+# How often a full cache may trigger a scan for expired claims
+CLAIMS_SWEEP_INTERVAL_SECONDS = 60
+
+
+def user_cache_key(user_id: int) -> str:
+    return f"{USER_CACHE_PREFIX}:{user_id}"
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class AuthCache:
+    def __init__(self, max_tokens: int, user_ttl_seconds: float):
+        self.max_tokens = max_tokens
+        self.user_ttl_seconds = user_ttl_seconds
+        # Least recently used first
+        self._claims: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._next_sweep = 0.0
+        self._revoked: Dict[str, float] = {}
+        self._users: Dict[int, Tuple[float, dict]] = {}
+        self._synced = False
+        self._pubsub = None
+        self._listener_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+        self.claims_hits = 0
+        self.claims_misses = 0
+        self.user_hits = 0
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    # Decoded claims
+
+    def get_claims(self, token: str) -> Optional[dict]:
+        key = _token_digest(token)
+        payload = self._claims.get(key)
+        if payload is None:
+            self.claims_misses += 1
+            return None
+        if payload.get("exp", 0) <= time.time():
+            self._claims.pop(key, None)
+            self.claims_misses += 1
+            return None
+        self._claims.move_to_end(key)
+        self.claims_hits += 1
+        return payload
+
+    def put_claims(self, token: str, payload: dict) -> None:
+        key = _token_digest(token)
+        self._claims[key] = payload
+        self._claims.move_to_end(key)
+        if len(self._claims) <= self.max_tokens:
+            return
+        now = time.time()
+        if now >= self._next_sweep:
+            # Full scans are rate limited so a full cache keeps inserts O(1)
+            self._next_sweep = now + CLAIMS_SWEEP_INTERVAL_SECONDS
+            for k in [k for k, v in self._claims.items() if v.get("exp", 0) <= now]:
+                del self._claims[k]
+        while len(self._claims) > self.max_tokens:
+            self._claims.popitem(last=False)
+
+    # Revoked token ids
+
+    def is_revoked(self, jti: str) -> Optional[bool]:
+        """Local answer, or None when the local set cannot be trusted yet."""
+        if not self._synced:
+            return None
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self._revoked.pop(jti, None)
+            return False
+        return True
+
+    def add_revoked(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = float(expires_at)
+
+    # User snapshots
+
+    def get_user(self, user_id: int) -> Optional[dict]:
+        if not self._synced:
+            return None
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._users.pop(user_id, None)
+            return None
+        self.user_hits += 1
+        return snapshot
+
+    def put_user(self, user_id: int, snapshot: dict) -> None:
+        self._users[user_id] = (time.monotonic() + self.user_ttl_seconds, snapshot)
+
+    def drop_user(self, user_id: int) -> None:
+        self._users.pop(user_id, None)
+
+    # Pub/sub sync
+
+    async def ensure_started(self) -> None:
+        if self._listener_task is not None and not self._listener_task.done():
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        async with self._lock:
+            if self._listener_task is not None and not self._listener_task.done():
+                return
+            self._retry_at = time.monotonic() + SYNC_RETRY_SECONDS
+            try:
+                self._pubsub = pubsub_client.pubsub()
+                # Subscribe before loading so no revocation falls between the two
+                await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+                now = time.time()
+                entries = await redis_client.zrangebyscore(TOKEN_DENYLIST_INDEX, now, "+inf", withscores=True)
+                self._revoked = {jti: score for jti, score in entries}
+                await self._backfill_revocations(now)
+                # Snapshots cached before a gap may have missed invalidations
+                self._users.clear()
+                self._listener_task = asyncio.create_task(self._listen())
+                self._synced = True
+                logger.info(f"Auth cache synced. revoked_tokens={len(self._revoked)}")
+            except Exception as e:
+                self._synced = False
+                logger.warning(f"Auth cache sync failed, using Redis lookups: {e}")
+                await self._close_pubsub()
+
+    async def _backfill_revocations(self, now: float) -> None:
+        """Copy revocations stored only as jwt_denylist:{jti} keys into the index."""
+        if await redis_client.exists(TOKEN_DENYLIST_BACKFILLED):
+            return
+        backfilled = 0
+        keys = []
+        async for key in redis_client.scan_iter(match=f"{TOKEN_DENYLIST_PREFIX}:*", count=TOKEN_DENYLIST_SCAN_BATCH):
+            keys.append(key)
+            if len(keys) >= TOKEN_DENYLIST_SCAN_BATCH:
+                backfilled += await self._backfill_batch(keys, now)
+                keys = []
+        if keys:
+            backfilled += await self._backfill_batch(keys, now)
+        # Only after the index holds every old key, so later syncs can skip the scan
+        await redis_client.set(TOKEN_DENYLIST_BACKFILLED, "1")
+        logger.info(f"Auth denylist index backfilled. revoked_tokens={backfilled}")
+
+    async def _backfill_batch(self, keys: list, now: float) -> int:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        ttls = await pipe.execute()
+        revoked = {
+            key.split(":", 1)[1]: now + ttl
+            for key, ttl in zip(keys, ttls)
+            if ttl is not None and ttl > 0
+        }
+        if revoked:
+            await redis_client.zadd(TOKEN_DENYLIST_INDEX, revoked)
+            self._revoked.update(revoked)
+        return len(revoked)
+
+    async def _listen(self) -> None:
+        try:
+            async for message in self._pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                    if payload.get("kind") == "jti":
+                        self.add_revoked(payload["jti"], payload["exp"])
+                    elif payload.get("kind") == "user":
+                        self.drop_user(int(payload["user_id"]))
+                except Exception as e:
+                    logger.exception(f"Error processing auth invalidation: {e}")
+        except asyncio.CancelledError:
+            self._synced = False
+        except Exception as e:
+            # The next ensure_started() resubscribes and reloads
+            self._synced = False
+            logger.warning(f"Auth invalidation listener stopped: {e}")
+            await self._close_pubsub()
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    async def stop(self) -> None:
+        self._synced = False
+        if self._listener_task:
+            self._listener_task.cancel()
+        await self._close_pubsub()
+
+    def stats(self) -> dict:
+        lookups = self.claims_hits + self.claims_misses
+        return {
+            "synced": self._synced,
+            "cached_tokens": len(self._claims),
+            "claims_hit_rate": round(self.claims_hits / lookups, 4) if lookups else 0.0,
+            "revoked_tokens": len(self._revoked),
+            "cached_users": len(self._users),
+            "user_hits": self.user_hits,
+        }
+
+
+auth_cache = AuthCache(
+    max_tokens=settings.AUTH_TOKEN_CACHE_SIZE,
+    user_ttl_seconds=settings.AUTH_LOCAL_USER_TTL_SECONDS,
+)
+
+
+async def publish_revocation(jti: str, expires_at: int, ttl: int) -> None:
+    """Store a revoked jti in Redis and tell every process about it."""
+    auth_cache.add_revoked(jti, expires_at)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.setex(f"{TOKEN_DENYLIST_PREFIX}:{jti}", ttl, "revoked")
+    pipe.zadd(TOKEN_DENYLIST_INDEX, {jti: expires_at})
+    pipe.zremrangebyscore(TOKEN_DENYLIST_INDEX, "-inf", time.time())
+    pipe.publish(INVALIDATION_CHANNEL, json.dumps({"kind": "jti", "jti": jti, "exp": expires_at}))
+    await pipe.execute()
+
+
+async def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user's cached auth snapshot here, in Redis and in every other process."""
+    try:
+        auth_cache.drop_user(int(user_id))
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(user_cache_key(user_id))
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps({"kind": "user", "user_id": int(user_id)}))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached user {user_id}: {e}")
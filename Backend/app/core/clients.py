@@ -0,0 +1,119 @@
+# app/core/clients.py
+"""Process-wide clients for outbound HTTP, OpenAI and Pinecone.
+
+Every outbound call in a process goes through the clients held here, so
+connections (and their TLS sessions) are pooled and kept alive across
+requests and tasks instead of being set up per call:
+
+- ``clients.http``: shared ``httpx.AsyncClient`` for third-party APIs
+  (geocoding, SMS, Turnstile, Expo). Pass per-call ``timeout``/``headers``.
+- ``clients.openai``: shared ``AsyncOpenAI`` on its own connection pool.
+- ``clients.pinecone`` / ``clients.pinecone_index(name)``: one Pinecone
+  client and one data-plane handle per index (each handle owns a pool).
+
+The FastAPI lifespan calls ``start()`` and ``aclose()``; Celery does the same
+from its worker-process signals. Clients are also created on first use, and
+rebuilt in a forked child, so scripts and tests need no setup. Limits come
+from the HTTP_* / OPENAI_* / PINECONE_* settings.
+"""
+
+import os
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from pinecone import Pinecone
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._pid: Optional[int] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._openai: Optional[AsyncOpenAI] = None
+        self._pinecone: Optional[Pinecone] = None
+        self._indexes: Dict[str, object] = {}
+
+    def _ensure_process(self) -> None:
+        # Pooled connections cannot be shared with a forked child; start over there
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._http = None
+            self._openai = None
+            self._pinecone = None
+            self._indexes = {}
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        self._ensure_process()
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=settings.HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+        return self._http
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        self._ensure_process()
+        if self._openai is None:
+            self._openai = AsyncOpenAI(
+                api_key=settings.OPEN_AI_API_KEY,
+                timeout=settings.OPENAI_TIMEOUT_SECONDS,
+                max_retries=settings.OPENAI_MAX_RETRIES,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+                        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                    ),
+                ),
+            )
+        return self._openai
+
+    @property
+    def pinecone(self) -> Pinecone:
+        self._ensure_process()
+        if self._pinecone is None:
+            self._pinecone = Pinecone(api_key=settings.PINECONE_API_KEY, pool_threads=settings.PINECONE_POOL_THREADS)
+        return self._pinecone
+
+    def pinecone_index(self, name: str):
+        self._ensure_process()
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._indexes[name] = self.pinecone.Index(name)
+        return index
+
+    def start(self) -> None:
+        """Create the clients up front so the first request does not pay for it."""
+        self.http
+        self.openai
+        self.pinecone
+        logger.info(f"Client registry started. pid={os.getpid()}")
+
+    async def aclose(self) -> None:
+        if self._pid != os.getpid():
+            return
+        if self._http is not None:
+            await self._http.aclose()
+        if self._openai is not None:
+            await self._openai.close()
+        for index in self._indexes.values():
+            close = getattr(index, "close", None)
+            if close is not None:
+                close()
+        self._http = None
+        self._openai = None
+        self._pinecone = None
+        self._indexes = {}
+        logger.info(f"Client registry closed. pid={os.getpid()}")
+
+
+clients = ClientRegistry()
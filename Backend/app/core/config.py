@@ -4,8 +4,13 @@ class Settings:
     DATABASE_URL_ASYNC: str = os.getenv("DATABASE_URL_ASYNC")
     DATABASE_URL_SYNC: str = os.getenv("DATABASE_URL_SYNC")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
+    # bcrypt runs on this many threads per process; more queued calls than PASSWORD_HASH_MAX_PENDING get a 503
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
     ALGORITHM: str = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15")) # Default to 5 minutes
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "20000"))  # decoded JWTs kept per process
+    AUTH_LOCAL_USER_TTL_SECONDS: float = float(os.getenv("AUTH_LOCAL_USER_TTL_SECONDS", "60"))
     REFRESH_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", "10080"))  # Default to 7 days
     SMTP_SERVER: str = os.getenv("SMTP_SERVER")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
@@ -13,14 +18,71 @@ class Settings:
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD")
     MAIL_FROM: str = os.getenv("MAIL_FROM")
     REDIS_URL: str = os.getenv("REDIS_URL")
+    REDIS_MAX_CONNECTIONS: str = os.getenv("REDIS_MAX_CONNECTIONS")  # overrides the role's pool size (app/core/redis.py)
     CLOUDINARY_CLOUD_NAME: str = os.getenv("CLOUDINARY_CLOUD_NAME")
     CLOUDINARY_API_KEY: str = os.getenv("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET: str = os.getenv("CLOUDINARY_API_SECRET")
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY")
     PINECONE_ENVIRONMENT: str = os.getenv("PINECONE_ENVIRONMENT", "us-east-1")
     EXPO_PUSH_URL = os.getenv("EXPO_PUSH_URL")
+    EXPO_ACCESS_TOKEN: str = os.getenv("EXPO_ACCESS_TOKEN")
+    PUSH_SEND_CONCURRENCY: int = int(os.getenv("PUSH_SEND_CONCURRENCY", "4"))  # parallel 100-message Expo requests
+    PUSH_RECEIPT_DELAY_SECONDS: int = int(os.getenv("PUSH_RECEIPT_DELAY_SECONDS", "900"))
     TURNSTILE_SECRET_KEY: str = os.getenv("TURNSTILE_SECRET_KEY") or os.getenv("RECAPTCHA_SITE_KEY")
     OPEN_AI_API_KEY: str = os.getenv("OPEN_AI_API_KEY")
+    # Shared outbound clients (app/core/clients.py), one pool per process
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+    OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+    PINECONE_POOL_THREADS: int = int(os.getenv("PINECONE_POOL_THREADS", "4"))
+    # Chatbot answers are reused for questions at least this cosine-similar to a cached one
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    SEMANTIC_CACHE_TTL_SECONDS: int = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "604800"))
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000"))
+    # PDF ingestion: page ranges are extracted on worker threads, chunks embedded and upserted in batches
+    RAG_INGEST_WORKERS: int = int(os.getenv("RAG_INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+    RAG_INGEST_PAGES_PER_TASK: int = int(os.getenv("RAG_INGEST_PAGES_PER_TASK", "25"))
+    RAG_INGEST_MAX_BYTES: int = int(os.getenv("RAG_INGEST_MAX_BYTES", str(50 * 1024 * 1024)))
+    RAG_INGEST_JOB_TTL_SECONDS: int = int(os.getenv("RAG_INGEST_JOB_TTL_SECONDS", "86400"))
+    RAG_EMBED_BATCH_SIZE: int = int(os.getenv("RAG_EMBED_BATCH_SIZE", "64"))
+    RAG_EMBED_CONCURRENCY: int = int(os.getenv("RAG_EMBED_CONCURRENCY", "4"))
+    RAG_UPSERT_BATCH_SIZE: int = int(os.getenv("RAG_UPSERT_BATCH_SIZE", "100"))
+    # Chatbot retrieval from an in-process BM25 + vector index instead of a Pinecone query per question
+    RAG_HYBRID_RETRIEVAL: bool = os.getenv("RAG_HYBRID_RETRIEVAL", "true").lower() == "true"
+    RAG_CORPUS_SYNC_SECONDS: float = float(os.getenv("RAG_CORPUS_SYNC_SECONDS", "5"))
+    # Change log entries kept for incremental sync; processes further behind reload the corpus
+    RAG_CORPUS_CHANGES_MAX: int = int(os.getenv("RAG_CORPUS_CHANGES_MAX", "10000"))
+    # Chat history sent to the LLM is capped at this many (estimated) tokens
+    CHAT_HISTORY_TOKEN_BUDGET: int = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+    # Fold turns that leave the history window into a rolling per-session summary
+    CHAT_MEMORY_SUMMARIZE: bool = os.getenv("CHAT_MEMORY_SUMMARIZE", "false").lower() == "true"
     RESEND_API_KEY: str = os.getenv("RESEND_API_KEY")
+    DB_POOL_ROLE: str = os.getenv("DB_POOL_ROLE", "api")  # api | worker | job
+    # Optional overrides of the role's pool profile (see app/database/database.py)
+    DB_POOL_SIZE: str = os.getenv("DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: str = os.getenv("DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: str = os.getenv("DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: str = os.getenv("DB_POOL_RECYCLE")
+    DB_SLOW_CHECKOUT_MS: float = float(os.getenv("DB_SLOW_CHECKOUT_MS", "200"))
+    # Comma-separated asyncpg URLs of streaming replicas used by read-only endpoints
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5"))
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+    # Upper bound on a lag probe (connect + query); a slow replica counts as unhealthy
+    REPLICA_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("REPLICA_PROBE_TIMEOUT_SECONDS", "2"))
+    # Cache TTL for results read from a replica; 0 skips caching them
+    REPLICA_CACHE_TTL_SECONDS: int = int(os.getenv("REPLICA_CACHE_TTL_SECONDS", "15"))
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+    OUTBOX_POLL_INTERVAL_SECONDS: float = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "0.5"))
+    OUTBOX_RETENTION_DAYS: int = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+    # Per-user SSE replay log used to resume streams from Last-Event-ID
+    SSE_REPLAY_MAXLEN: int = int(os.getenv("SSE_REPLAY_MAXLEN", "200"))
+    SSE_REPLAY_TTL_SECONDS: int = int(os.getenv("SSE_REPLAY_TTL_SECONDS", "86400"))
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
 
 settings = Settings()
\ No newline at end of file
@@ -1,6 +1,189 @@
 # app/core/redis.py
-from redis.asyncio import Redis
+"""Shared Redis connection layer.
+
+Every Redis user in a process goes through the clients defined here:
+
+- ``redis_client``: command client (decoded responses, short socket timeouts)
+  on a blocking pool sized for the process role (DB_POOL_ROLE), so a burst
+  waits for a free connection instead of opening an unbounded number.
+- ``redis_auto``: the same client with automatic pipelining. Commands issued
+  in the same event-loop tick (e.g. an ``asyncio.gather`` of cache reads) are
+  sent as one pipeline and cost a single round-trip.
+- ``pubsub_client``: long-lived subscriptions. It has no socket timeout,
+  because an idle subscription must not time out, and its own small pool.
+
+``redis_pool_stats()`` reports pool usage, pipelining and health for /metrics/redis.
+"""
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from redis.asyncio import BlockingConnectionPool, Redis
+
 from app.core.config import settings
+from app.utils.logger import logger
+
+# Connections per process. Celery prefork children each get their own pool.
+REDIS_POOL_PROFILES = {
+    "api": {"max_connections": 50, "timeout": 5},
+    "worker": {"max_connections": 10, "timeout": 10},
+    "job": {"max_connections": 4, "timeout": 10},
+}
+PUBSUB_MAX_CONNECTIONS = 4
+
+# Upper bound on commands sent in one automatic pipeline
+AUTO_PIPELINE_MAX_BATCH = 512
+
+
+def get_redis_pool_profile(role: str = None) -> dict:
+    role = role or settings.DB_POOL_ROLE
+    profile = dict(REDIS_POOL_PROFILES.get(role, REDIS_POOL_PROFILES["api"]))
+    if settings.REDIS_MAX_CONNECTIONS:
+        profile["max_connections"] = int(settings.REDIS_MAX_CONNECTIONS)
+    return profile
+
+
+def _build_pool(**kwargs) -> BlockingConnectionPool:
+    return BlockingConnectionPool.from_url(settings.REDIS_URL, decode_responses=True, **kwargs)
+
+
+_profile = get_redis_pool_profile()
+command_pool = _build_pool(
+    socket_connect_timeout=2,
+    socket_timeout=2,
+    retry_on_timeout=False,
+    health_check_interval=30,
+    **_profile,
+)
+pubsub_pool = _build_pool(
+    socket_connect_timeout=2,
+    socket_keepalive=True,
+    health_check_interval=30,
+    max_connections=PUBSUB_MAX_CONNECTIONS,
+    timeout=_profile["timeout"],
+)
 
 # Async Redis client
-redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True, socket_connect_timeout=2, socket_timeout=2, retry_on_timeout=False)
+redis_client = Redis(connection_pool=command_pool)
+pubsub_client = Redis(connection_pool=pubsub_pool)
+
+
+class AutoPipeline:
+    """Batches commands issued in the same event-loop tick into one pipeline.
+
+    ``await redis_auto.get(key)`` queues the command and returns a future; the
+    queue is flushed by a callback scheduled with ``call_soon``, which runs
+    after every task already runnable in this tick has issued its commands.
+    A lone command is sent as-is. Command errors are delivered to the caller
+    that issued the command; connection errors fail the whole batch.
+    """
+
+    def __init__(self, client: Redis, max_batch: int = AUTO_PIPELINE_MAX_BATCH):
+        self._client = client
+        self._max_batch = max_batch
+        self._pending: List[Tuple[str, tuple, dict, asyncio.Future]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.commands = 0
+        self.max_batch_seen = 0
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def command(*args, **kwargs):
+            return self._enqueue(name, args, kwargs)
+
+        return command
+
+    def _enqueue(self, name: str, args: tuple, kwargs: dict) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if self._pending and loop is not self._loop:
+            # Commands from another loop (e.g. a Celery task loop) never share a batch
+            return asyncio.ensure_future(getattr(self._client, name)(*args, **kwargs))
+        future = loop.create_future()
+        if not self._pending:
+            self._loop = loop
+            loop.call_soon(self._flush)
+        self._pending.append((name, args, kwargs, future))
+        return future
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self._max_batch):
+            batch = pending[start:start + self._max_batch]
+            self._loop.create_task(self._send(batch))
+
+    async def _send(self, batch) -> None:
+        self.batches += 1
+        self.commands += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        try:
+            if len(batch) == 1:
+                name, args, kwargs, _ = batch[0]
+                results = [await getattr(self._client, name)(*args, **kwargs)]
+            else:
+                pipe = self._client.pipeline(transaction=False)
+                for name, args, kwargs, _ in batch:
+                    getattr(pipe, name)(*args, **kwargs)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "commands": self.commands,
+            "avg_batch": round(self.commands / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch_seen,
+        }
+
+
+redis_auto = AutoPipeline(redis_client)
+
+_health = {"ok": None, "latency_ms": None, "checked_at": None, "error": None}
+
+
+async def ping_redis() -> bool:
+    """Ping through the command pool and record the result for redis_pool_stats()."""
+    start = time.perf_counter()
+    try:
+        await redis_client.ping()
+        _health.update(ok=True, latency_ms=round((time.perf_counter() - start) * 1000, 3), error=None)
+    except Exception as e:
+        _health.update(ok=False, latency_ms=None, error=str(e))
+        logger.warning(f"Redis health check failed: {e}")
+    _health["checked_at"] = time.time()
+    return bool(_health["ok"])
+
+
+def _pool_usage(pool) -> dict:
+    in_use = getattr(pool, "_in_use_connections", ())
+    available = getattr(pool, "_available_connections", ())
+    return {
+        "max_connections": pool.max_connections,
+        "in_use": len(in_use),
+        "idle": sum(1 for connection in available if connection is not None),
+    }
+
+
+def redis_pool_stats() -> dict:
+    return {
+        "role": settings.DB_POOL_ROLE,
+        "command_pool": _pool_usage(command_pool),
+        "pubsub_pool": _pool_usage(pubsub_pool),
+        "auto_pipeline": redis_auto.stats(),
+        "health": dict(_health),
+    }
@@ -1,14 +1,21 @@
+import asyncio
+import os
+import threading
+import time
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
 
+from app.core.auth_cache import TOKEN_DENYLIST_PREFIX, auth_cache, publish_revocation
 from app.core.config import settings
 from app.core.redis import redis_client
+from app.utils.logger import logger
 
 TOKEN_AUDIENCE = "ucrs"
-TOKEN_DENYLIST_PREFIX = "jwt_denylist"
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
@@ -16,6 +23,105 @@ def hash_password(password: str) -> str:
 def decrypt_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a small, bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    without blocking other requests. At most `max_pending` calls may be queued
+    or running; beyond that callers get a 503 instead of piling up behind a
+    login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+        self.run_total_s = 0.0
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                pending = self._pending
+            else:
+                self._pending += 1
+                pending = None
+        if pending is not None:
+            logger.warning(f"Password hashing overloaded, rejecting request (pending={pending})")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        # Released when the work finishes, even if the awaiting request was cancelled
+        future = self._executor.submit(timed)
+        future.add_done_callback(self._release)
+        result, started, finished = await asyncio.wrap_future(future)
+
+        with self._lock:
+            self.completed += 1
+            self.wait_total_s += started - submitted
+            self.wait_max_s = max(self.wait_max_s, started - submitted)
+            self.run_total_s += finished - started
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = self._pending
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": min(pending, self.workers),
+                "queued": max(0, pending - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_ms": {
+                    "avg": round(self.wait_total_s * 1000 / self.completed, 3) if self.completed else 0.0,
+                    "max": round(self.wait_max_s * 1000, 3),
+                },
+                "hash_ms_avg": round(self.run_total_s * 1000 / self.completed, 3) if self.completed else 0.0,
+            }
+
+
+_password_hasher: PasswordHasher | None = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _password_hasher
+    # Executor threads do not survive a fork, so each process builds its own
+    if _password_hasher is None or _password_hasher._pid != os.getpid():
+        _password_hasher = PasswordHasher(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+        )
+    return _password_hasher
+
+
+async def hash_password_async(password: str) -> str:
+    return await get_password_hasher().run(hash_password, password)
+
+async def decrypt_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await get_password_hasher().run(decrypt_password, plain_password, hashed_password)
+
 def _create_token(data: dict, token_type: str, expires_in_minutes: int) -> str:
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expires_in_minutes)
@@ -54,9 +160,24 @@ def verify_token(token: str, expected_token_type: str | None = None) -> dict:
         raise JWTError("Invalid token")
 
 
+def verify_token_cached(token: str, expected_token_type: str | None = None) -> dict:
+    """verify_token with decoded claims reused from the in-process cache until they expire."""
+    payload = auth_cache.get_claims(token)
+    if payload is None:
+        payload = verify_token(token)
+        auth_cache.put_claims(token, payload)
+    if expected_token_type and payload.get("token_type") != expected_token_type:
+        raise JWTError("Invalid token")
+    return payload
+
+
 async def is_token_revoked(jti: str | None) -> bool:
     if not jti:
         return False
+    await auth_cache.ensure_started()
+    revoked = auth_cache.is_revoked(jti)
+    if revoked is not None:
+        return revoked
     return bool(await redis_client.exists(f"{TOKEN_DENYLIST_PREFIX}:{jti}"))
 
 
@@ -73,5 +194,5 @@ async def revoke_token_jti(jti: str | None, expires_at) -> None:
     if ttl <= 0:
         return
 
-    await redis_client.setex(f"{TOKEN_DENYLIST_PREFIX}:{jti}", ttl, "revoked")
+    await publish_revocation(jti, expiration_timestamp, ttl)
     
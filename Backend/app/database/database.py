@@ -1,19 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.database.pool_metrics import InstrumentedAsyncQueuePool, instrument_engine
+from app.utils.logger import logger
 
 _engine = None
 _sessionmaker = None
 
+# Per-process pool sizing. Total Postgres connections for the fleet is roughly
+# sum over processes of (pool_size + max_overflow), so Celery prefork children
+# (one engine each) get much smaller pools than API workers.
+POOL_PROFILES = {
+    "api": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 10, "pool_recycle": 1800},
+    "worker": {"pool_size": 2, "max_overflow": 3, "pool_timeout": 30, "pool_recycle": 1800},
+    "job": {"pool_size": 1, "max_overflow": 1, "pool_timeout": 60, "pool_recycle": 1800},
+}
+
+
+def get_pool_profile(role: str = None) -> dict:
+    role = role or settings.DB_POOL_ROLE
+    profile = dict(POOL_PROFILES.get(role, POOL_PROFILES["api"]))
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    for key, value in overrides.items():
+        if value:
+            profile[key] = int(value)
+    return profile
+
+
 def get_engine():
     global _engine
     if _engine is None:
-        print("🔥 Creating NEW engine in process")
+        role = settings.DB_POOL_ROLE
+        profile = get_pool_profile(role)
+        logger.info(f"Creating DB engine in process (role={role}, pool={profile})")
         _engine = create_async_engine(
             settings.DATABASE_URL_ASYNC,
             pool_pre_ping=True,
+            poolclass=InstrumentedAsyncQueuePool,
             connect_args={"server_settings": {"timezone": "Asia/Manila"}},
+            **profile,
         )
+        instrument_engine(_engine, role=role, slow_checkout_ms=settings.DB_SLOW_CHECKOUT_MS)
     return _engine
 
 
@@ -32,4 +64,4 @@ def AsyncSessionLocal():
     return get_sessionmaker()()
 
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
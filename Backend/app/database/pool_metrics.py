@@ -0,0 +1,163 @@
+"""Connection pool telemetry.
+
+Tracks how long callers wait to check a connection out of the SQLAlchemy
+pool, how many connections are in use / in overflow, and how long physical
+connections live. Exposed through the /metrics/db-pool endpoint so Postgres
+connection budgets can be sized across API and Celery processes.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.utils.logger import logger
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Process-local counters for one engine's pool."""
+
+    def __init__(self, role: str, slow_checkout_ms: float):
+        self.role = role
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.slow_checkouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.lifetime_total_s = 0.0
+        self.lifetime_max_s = 0.0
+        self.pool = None
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for index, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+            slow = wait_ms >= self.slow_checkout_ms
+            if slow:
+                self.slow_checkouts += 1
+
+        if slow:
+            logger.warning(
+                f"Slow DB pool checkout: waited {wait_ms:.1f}ms "
+                f"(role={self.role}, pid={os.getpid()}, {self._gauges_text()})"
+            )
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_close(self, lifetime_s: Optional[float]) -> None:
+        with self._lock:
+            self.connections_closed += 1
+            if lifetime_s is not None:
+                self.lifetime_total_s += lifetime_s
+                self.lifetime_max_s = max(self.lifetime_max_s, lifetime_s)
+
+    def _gauges(self) -> dict:
+        if self.pool is None:
+            return {}
+        return {
+            "pool_size": self.pool.size(),
+            "checked_out": self.pool.checkedout(),
+            "checked_in": self.pool.checkedin(),
+            "overflow": max(0, self.pool.overflow()),
+        }
+
+    def _gauges_text(self) -> str:
+        return ", ".join(f"{key}={value}" for key, value in self._gauges().items())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waited = self.checkouts + self.checkout_timeouts
+            buckets = {
+                f"le_{bound}ms": count
+                for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            buckets["gt_max"] = self.wait_buckets[-1]
+            return {
+                "role": self.role,
+                "pid": os.getpid(),
+                "gauges": self._gauges(),
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "slow_checkout_threshold_ms": self.slow_checkout_ms,
+                "checkout_wait_ms": {
+                    "avg": round(self.wait_total_ms / waited, 3) if waited else 0.0,
+                    "max": round(self.wait_max_ms, 3),
+                    "buckets": buckets,
+                },
+                "connections": {
+                    "opened": self.connections_opened,
+                    "closed": self.connections_closed,
+                    "lifetime_avg_s": (
+                        round(self.lifetime_total_s / self.connections_closed, 3)
+                        if self.connections_closed else 0.0
+                    ),
+                    "lifetime_max_s": round(self.lifetime_max_s, 3),
+                },
+            }
+
+
+_metrics: Optional[PoolMetrics] = None
+
+
+def get_pool_metrics() -> Optional[PoolMetrics]:
+    return _metrics
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times every checkout, including waits for a free slot."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            if _metrics is not None:
+                _metrics.record_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        if _metrics is not None:
+            _metrics.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+def instrument_engine(engine, role: str, slow_checkout_ms: float) -> PoolMetrics:
+    """Attach lifetime tracking to an engine's pool and register its metrics."""
+    global _metrics
+    metrics = PoolMetrics(role=role, slow_checkout_ms=slow_checkout_ms)
+    metrics.pool = engine.sync_engine.pool
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        metrics.record_connect()
+
+    @event.listens_for(engine.sync_engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        connected_at = connection_record.info.pop("connected_at", None)
+        metrics.record_close(time.monotonic() - connected_at if connected_at else None)
+
+    _metrics = metrics
+    return metrics
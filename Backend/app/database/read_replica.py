@@ -0,0 +1,184 @@
+"""Read-replica routing.
+
+Read-only endpoints get their session from `get_read_sessionmaker`, which
+picks a streaming replica whose replay lag is within REPLICA_MAX_LAG_SECONDS
+and falls back to the primary when no replica qualifies. Callers that wrote
+recently are pinned to the primary for READ_YOUR_WRITES_SECONDS so they never
+read their own change from a replica that has not replayed it yet.
+
+Replica lag is probed by a background task (start_replica_monitor, run from
+the app lifespan), never on the request path; until a replica has passed a
+probe, reads go to the primary.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.database.database import get_pool_profile, get_sessionmaker
+from app.dependencies.rate_limiter import _get_client_identity
+from app.utils.logger import logger
+
+STICKY_PREFIX = "db_sticky"
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Replication lag in seconds; 0 when the replica has replayed everything it received,
+# so an idle primary does not make a caught-up replica look stale.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())), 0)
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_async_engine(
+            url,
+            pool_pre_ping=True,
+            connect_args={"server_settings": {"timezone": "Asia/Manila"}},
+            **get_pool_profile(),
+        )
+        self.sessionmaker = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.lag_seconds: Optional[float] = None
+        self.healthy = False
+        self.checked_at = 0.0
+
+    @property
+    def host(self) -> str:
+        return self.engine.url.host or self.url
+
+    async def _probe(self) -> float:
+        async with self.engine.connect() as conn:
+            lag = (await conn.execute(LAG_QUERY)).scalar()
+        return float(lag or 0)
+
+    async def refresh(self) -> None:
+        self.checked_at = time.monotonic()
+        try:
+            # Bounds connect and query together, so a hung replica cannot stall the monitor
+            self.lag_seconds = await asyncio.wait_for(self._probe(), settings.REPLICA_PROBE_TIMEOUT_SECONDS)
+            self.healthy = self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+            if not self.healthy:
+                logger.warning(f"Replica {self.host} lagging {self.lag_seconds:.1f}s, routing reads to primary")
+        except Exception as e:
+            self.healthy = False
+            self.lag_seconds = None
+            logger.warning(f"Replica {self.host} health check failed: {e!r}")
+
+    def is_usable(self) -> bool:
+        # A verdict older than a few probe intervals means the monitor is not running
+        fresh = time.monotonic() - self.checked_at < settings.REPLICA_HEALTH_CHECK_SECONDS * 3
+        return self.healthy and fresh
+
+
+_replicas: Optional[List[Replica]] = None
+_round_robin = itertools.count()
+_monitor_task: Optional[asyncio.Task] = None
+
+
+def get_replicas() -> List[Replica]:
+    global _replicas
+    if _replicas is None:
+        urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+        _replicas = [Replica(url) for url in urls]
+        if _replicas:
+            logger.info(f"Read replicas configured: {[replica.host for replica in _replicas]}")
+    return _replicas
+
+
+def _sticky_key(identity: str) -> str:
+    return f"{STICKY_PREFIX}:{identity}"
+
+
+async def mark_recent_write(identity: str) -> None:
+    try:
+        await redis_client.set(_sticky_key(identity), 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to mark read-your-writes window for {identity}: {e}")
+
+
+async def has_recent_write(identity: str) -> bool:
+    try:
+        return bool(await redis_client.exists(_sticky_key(identity)))
+    except Exception:
+        # Without the marker we cannot prove the replica is safe to read from
+        return True
+
+
+async def get_read_sessionmaker(identity: Optional[str] = None):
+    """Sessionmaker for a replica within the lag budget, or the primary."""
+    replicas = get_replicas()
+    if not replicas:
+        return get_sessionmaker()
+
+    if identity and await has_recent_write(identity):
+        return get_sessionmaker()
+
+    start = next(_round_robin)
+    for offset in range(len(replicas)):
+        replica = replicas[(start + offset) % len(replicas)]
+        if replica.is_usable():
+            return replica.sessionmaker
+
+    return get_sessionmaker()
+
+
+async def _monitor_replicas(replicas: List[Replica]) -> None:
+    while True:
+        await asyncio.gather(*(replica.refresh() for replica in replicas))
+        await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+def start_replica_monitor() -> None:
+    """Probe replica lag in the background for this process; no-op without replicas."""
+    global _monitor_task
+    replicas = get_replicas()
+    if replicas and (_monitor_task is None or _monitor_task.done()):
+        _monitor_task = asyncio.create_task(_monitor_replicas(replicas))
+
+
+async def stop_replica_monitor() -> None:
+    global _monitor_task
+    if _monitor_task is not None:
+        _monitor_task.cancel()
+        try:
+            await _monitor_task
+        except asyncio.CancelledError:
+            pass
+        _monitor_task = None
+
+
+def replica_status() -> list:
+    return [
+        {"host": replica.host, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+        for replica in get_replicas()
+    ]
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Pins a caller to the primary for a short window after a successful write."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if (
+            request.method in UNSAFE_METHODS
+            and response.status_code < 400
+            and get_replicas()
+        ):
+            await mark_recent_write(_get_client_identity(request))
+        return response
@@ -1,13 +1,15 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from jose import JWTError
 from app.models.user import User
-from app.dependencies.db_dependency import get_async_db
+from app.database.database import AsyncSessionLocal
+from app.dependencies.db_dependency import _session_scope, get_async_db
 from app.utils.caching import get_cache, set_cache
-from app.core.security import is_token_revoked, verify_token
+from app.core.auth_cache import auth_cache, user_cache_key
+from app.core.security import is_token_revoked, verify_token_cached
 from app.constants.roles import UserRole
 from app.models.barangay_account import BarangayAccount
 from app.models.department_account import DepartmentAccount
@@ -16,10 +18,6 @@ from app.utils.logger import logger
 bearer = HTTPBearer()
 
 USER_CACHE_TTL_SECONDS = 300
-USER_CACHE_PREFIX = "auth_user"
-
-def _user_cache_key(user_id: int) -> str:
-    return f"{USER_CACHE_PREFIX}:{user_id}"
 
 def _serialize_user_for_cache(user: User) -> dict:
     return {
@@ -66,15 +64,52 @@ def _build_user_from_cache(cached_user: dict):
 
     return user
 
+def get_token_claims(request: Request, token: str) -> dict:
+    """Access-token claims, decoded at most once per request (and usually served from the process cache)."""
+    claims = getattr(request.state, "token_claims", None)
+    if claims is None:
+        claims = verify_token_cached(token, expected_token_type="access")
+        request.state.token_claims = claims
+    return claims
+
+async def _load_user(db: AsyncSession, user_id: int) -> User:
+    result = await db.execute(
+        select(User)
+        .options(
+            selectinload(User.barangay_account).selectinload(BarangayAccount.barangay),
+            selectinload(User.department_account),
+        )
+        .where(User.id == user_id)
+    )
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
 async def get_current_user(
+    request: Request,
     token: HTTPAuthorizationCredentials = Depends(bearer),
     db: AsyncSession = Depends(get_async_db)
+) -> User:
+    return await _authenticate(request, token, db)
+
+async def get_current_user_for_stream(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(bearer),
+) -> User:
+    """get_current_user for long-lived streams: a cache miss borrows a session only for the lookup."""
+    return await _authenticate(request, token, None)
+
+async def _authenticate(
+    request: Request,
+    token: HTTPAuthorizationCredentials,
+    db: AsyncSession | None,
 ) -> User:
     if not token:
         raise HTTPException(status_code=401, detail="Authorization token missing")
 
     try:
-        payload = verify_token(token.credentials, expected_token_type="access")
+        payload = get_token_claims(request, token.credentials)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -87,8 +122,13 @@ async def get_current_user(
 
     user = None
     from_cache = False
-    cache_key = _user_cache_key(user_id)
-    cached_user = await get_cache(cache_key)
+    cache_key = user_cache_key(user_id)
+    # Local snapshot first; auth_cache only serves it while invalidations are flowing
+    cached_user = auth_cache.get_user(user_id)
+    if cached_user is None:
+        cached_user = await get_cache(cache_key)
+        if cached_user:
+            auth_cache.put_user(user_id, cached_user)
     if cached_user:
         user = _build_user_from_cache(cached_user)
         if user and user.role == UserRole.BARANGAY_OFFICIAL and not user.barangay_account:
@@ -98,21 +138,17 @@ async def get_current_user(
         from_cache = user is not None
 
     if not user:
-        result = await db.execute(
-            select(User)
-            .options(
-                selectinload(User.barangay_account).selectinload(BarangayAccount.barangay),
-                selectinload(User.department_account),
-            )
-            .where(User.id == user_id)
-        )
-        user = result.scalars().first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        await set_cache(cache_key, _serialize_user_for_cache(user), expiration=USER_CACHE_TTL_SECONDS)
+        if db is None:
+            async with _session_scope(AsyncSessionLocal()) as session:
+                user = await _load_user(session, user_id)
+        else:
+            user = await _load_user(db, user_id)
+        snapshot = _serialize_user_for_cache(user)
+        await set_cache(cache_key, snapshot, expiration=USER_CACHE_TTL_SECONDS)
+        auth_cache.put_user(user_id, snapshot)
     
     if user.role == UserRole.BARANGAY_OFFICIAL:
-        logger.info(
+        logger.debug(
             "Fetched user with barangay data (%s), Barangay: %s",
             "cache" if from_cache else "database",
             user.barangay_account.barangay_id if user.barangay_account else "N/A",
@@ -120,7 +156,7 @@ async def get_current_user(
         return user
     
     if user.role == UserRole.DEPARTMENT_STAFF:
-        logger.info(
+        logger.debug(
             "Fetched user with department data (%s), Department Account ID: %s",
             "cache" if from_cache else "database",
             user.department_account.id if user.department_account else "N/A",
@@ -128,3 +164,8 @@ async def get_current_user(
         return user
 
     return user
+
+async def get_current_superadmin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.role != UserRole.SUPERADMIN.value:
+        raise HTTPException(status_code=403, detail="Access denied. Superadmin privileges required.")
+    return current_user
@@ -1,10 +1,16 @@
-from app.database.database import AsyncSessionLocal
+from app.database.database import AsyncSessionLocal, get_sessionmaker
+from app.database.read_replica import get_read_sessionmaker
+from app.dependencies.rate_limiter import _get_client_identity
+from app.utils.caching import mark_served_from_replica
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import InterfaceError, OperationalError
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
-    session = AsyncSessionLocal()
+
+@asynccontextmanager
+async def _session_scope(session: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
     try:
         yield session
     except Exception:
@@ -20,3 +26,15 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
         except (InterfaceError, OperationalError):
             pass
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with _session_scope(AsyncSessionLocal()) as session:
+        yield session
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints: a healthy replica, or the primary after the caller's own write."""
+    session_factory = await get_read_sessionmaker(_get_client_identity(request))
+    if session_factory is not get_sessionmaker():
+        mark_served_from_replica()
+    async with _session_scope(session_factory()) as session:
+        yield session
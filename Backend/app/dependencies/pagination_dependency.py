@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, Query, status
+from app.utils.query_optimization import KeysetPagination, ListingFilters
+
+
+def get_keyset_pagination(
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+) -> KeysetPagination:
+    try:
+        return KeysetPagination(cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def get_listing_filters(
+    status_filter: Optional[str] = Query(None, alias="status", description="Complaint status"),
+    category_id: Optional[int] = Query(None, description="Category ID"),
+    start_date: Optional[datetime] = Query(None, description="Only include records created on or after this date"),
+    end_date: Optional[datetime] = Query(None, description="Only include records created on or before this date"),
+) -> ListingFilters:
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must be before end_date")
+    return ListingFilters(status=status_filter, category_id=category_id, start_date=start_date, end_date=end_date)
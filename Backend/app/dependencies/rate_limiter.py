@@ -1,18 +1,79 @@
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+import asyncio
+import functools
+import math
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
 from jose import JWTError
-from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+from app.core.redis import redis_client
+from app.core.security import verify_token_cached
+from app.utils.logger import logger
+
+RATE_LIMIT_PREFIX = "ratelimit"
+
+# Shared per-identity budget for endpoints that call OpenAI; each call spends its cost
+OPENAI_BUDGET = "100/minute"
+OPENAI_SCOPE = "openai"
+ASK_COST = 10
+COMPLAINT_SUBMIT_COST = 5
+
+RATE_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# GCRA (a token bucket stored as one "theoretical arrival time" per key).
+# Uses the Redis clock so every worker agrees on time. Returns
+# {allowed, remaining, retry_after_ms, reset_ms}.
+RATE_LIMIT_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period_ms = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = period_ms / limit
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + math.ceil(interval * cost)
+local allow_at = new_tat - period_ms
+if allow_at > now then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((period_ms - (new_tat - now)) / interval), 0, math.ceil(new_tat - now)}
+"""
+
 
-from app.core.security import verify_token
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """'10/minute' -> (10, 60)."""
+    amount, _, period = rate.partition("/")
+    period = period.strip().rstrip("s")
+    if period not in RATE_PERIODS:
+        raise ValueError(f"Unsupported rate period in {rate!r}")
+    return int(amount), RATE_PERIODS[period]
 
 
 def _get_client_identity(request: Request) -> str:
+    # Resolved once per request; the limiter, replica routing and middleware all ask
+    identity = getattr(request.state, "client_identity", None)
+    if identity is None:
+        identity = _resolve_client_identity(request)
+        request.state.client_identity = identity
+    return identity
+
+
+def _resolve_client_identity(request: Request) -> str:
     auth_header = request.headers.get("Authorization")
     if auth_header and auth_header.startswith("Bearer "):
         token = auth_header.split(" ", 1)[1]
         try:
-            payload = verify_token(token, expected_token_type="access")
+            payload = getattr(request.state, "token_claims", None)
+            if payload is None:
+                payload = verify_token_cached(token, expected_token_type="access")
+                request.state.token_claims = payload
             user_id = payload.get("user_id")
             if user_id:
                 return f"user:{user_id}"
@@ -32,10 +93,97 @@ def _get_client_identity(request: Request) -> str:
     return get_remote_address(request)
 
 
-limiter = Limiter(key_func=_get_client_identity)
+class RedisRateLimiter:
+    """Rate limits shared by every worker, enforced atomically in Redis.
+
+    Used like slowapi's limiter: ``@limiter.limit("10/minute")`` on an
+    endpoint that takes ``request: Request``. Each decorated endpoint has its
+    own bucket per client identity unless ``scope`` names a bucket shared by
+    several endpoints; ``cost`` is how much of the budget one call spends.
+    Decorators can be stacked. If Redis is unavailable requests are allowed.
+    """
+
+    def __init__(self, key_func: Callable[[Request], str], prefix: str = RATE_LIMIT_PREFIX):
+        self.key_func = key_func
+        self.prefix = prefix
+        self._script = redis_client.register_script(RATE_LIMIT_SCRIPT)
+
+    def limit(self, rate: str, cost: int = 1, scope: Optional[str] = None):
+        amount, period = parse_rate(rate)
+        if cost > amount:
+            raise ValueError(f"Cost {cost} can never fit in {rate!r}")
+
+        def decorator(func):
+            bucket = scope or f"{func.__module__}.{func.__name__}"
+            is_async = asyncio.iscoroutinefunction(func)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.get("request")
+                if not isinstance(request, Request):
+                    request = next((arg for arg in args if isinstance(arg, Request)), None)
+                if request is not None:
+                    await self.hit(request, bucket, amount, period, cost)
+                if is_async:
+                    return await func(*args, **kwargs)
+                return await run_in_threadpool(func, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def hit(self, request: Request, bucket: str, amount: int, period: int, cost: int = 1) -> None:
+        key = f"{self.prefix}:{bucket}:{self.key_func(request)}"
+        try:
+            allowed, remaining, retry_after_ms, reset_ms = await self._script(
+                keys=[key], args=[amount, period * 1000, cost]
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, allowing request ({bucket}): {e}")
+            return
+
+        headers = {
+            "X-RateLimit-Limit": str(amount),
+            "X-RateLimit-Remaining": str(max(0, int(remaining))),
+            "X-RateLimit-Reset": str(math.ceil(int(reset_ms) / 1000)),
+        }
+        # With stacked limits, report the one closest to running out
+        current = getattr(request.state, "rate_limit_headers", None)
+        if current is None or int(headers["X-RateLimit-Remaining"]) <= int(current["X-RateLimit-Remaining"]):
+            request.state.rate_limit_headers = headers
+
+        if not allowed:
+            retry_after = str(max(1, math.ceil(int(retry_after_ms) / 1000)))
+            logger.warning(f"Rate limit exceeded: {key}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Try again later.",
+                headers={**headers, "Retry-After": retry_after},
+            )
+
+
+class RateLimitHeadersMiddleware:
+    """Adds the X-RateLimit-* headers recorded by the limiter to successful responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                rate_headers = scope.get("state", {}).get("rate_limit_headers")
+                if rate_headers:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in rate_headers.items():
+                        if name not in headers:
+                            headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
 
-def rate_limit_exceeded_handler(request, exc):
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"detail": "Rate limit exceeded. Try again later."},
-    )
+limiter = RedisRateLimiter(key_func=_get_client_identity)
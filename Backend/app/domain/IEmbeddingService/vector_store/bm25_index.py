@@ -0,0 +1,95 @@
+# app/domain/IEmbeddingService/vector_store/bm25_index.py
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Words too common in English / Filipino questions to say anything about a chunk
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from",
+    "how", "i", "in", "is", "it", "my", "of", "on", "or", "the", "to", "what", "when",
+    "where", "who", "with", "ako", "ang", "ba", "ko", "mga", "na", "nang", "ng", "ni",
+    "po", "sa", "si", "yung",
+})
+
+# Words plus compound identifiers such as "2023-15", "no.12" or "0917-123-4567"
+_TOKEN_RE = re.compile(r"\w+(?:[-./]\w+)*")
+_SPLIT_RE = re.compile(r"[-./]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms; compounds are kept whole and also split into their parts."""
+    tokens = []
+    for match in _TOKEN_RE.findall(text.lower()):
+        parts = _SPLIT_RE.split(match)
+        if len(parts) > 1:
+            tokens.append(match)
+        tokens.extend(part for part in parts if part and part not in _STOPWORDS)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index that supports adding and removing
+    single documents. IDF and the average length are derived at query time,
+    so an update never rescans the corpus.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self._k1 = k1
+        self._b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    @property
+    def term_count(self) -> int:
+        return len(self._postings)
+
+    def add(self, doc_id: str, text: str) -> None:
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = sum(terms.values())
+        self._total_length += self._doc_lengths[doc_id]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        """Top `limit` (doc_id, score) pairs for the query, best first."""
+        doc_count = len(self._doc_terms)
+        if not doc_count:
+            return []
+        avg_length = self._total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = tf + self._k1 * (1 - self._b + self._b * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self._k1 + 1) / norm
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,401 @@
+# app/domain/IEmbeddingService/vector_store/hybrid_rag_repository.py
+"""
+hybrid_rag_repository.py
+─────────────────────────────────────────────────────────────────────────────
+In-process hybrid retriever for the chatbot knowledge base.
+
+Pure vector search misses questions that hinge on an exact token — an
+ordinance number, a barangay name, a hotline. This repository keeps the
+whole RAG corpus in memory and ranks chunks by both a BM25 keyword index
+and cosine similarity, fused with reciprocal-rank fusion (RRF).
+
+Design decisions
+────────────────
+1. PINECONE STAYS THE SOURCE OF TRUTH — chunks are still written to Pinecone.
+   Each process loads the corpus from it once (list + fetch), and until
+   that load has finished every query is delegated to Pinecone.
+
+2. INCREMENTAL SYNC — writers bump a Redis version counter and record the
+   changed chunk ids under that version. Processes poll the counter at most
+   every RAG_CORPUS_SYNC_SECONDS, in the background, and re-fetch only the
+   chunks changed since their own version. The change log is capped at
+   RAG_CORPUS_CHANGES_MAX entries; a process whose version predates the
+   trimmed range reloads the whole corpus instead. A purge of the whole
+   index (reset_corpus) raises the floor to the new version, so every
+   process reloads.
+
+3. RECIPROCAL-RANK FUSION — BM25 and cosine scores are not comparable, so
+   each ranking contributes 1 / (RRF_K + rank) per chunk. A chunk found by
+   both rankings beats one found by either alone. Every fused result must
+   still clear the cosine _SCORE_THRESHOLD, so a shared keyword alone never
+   turns an off-topic question into a grounded answer.
+
+4. SAME RESULT SHAPE — results look exactly like PineconeRAGVectorRepository
+   results (score stays the cosine similarity), so RAGService and the
+   semantic answer cache need no changes.
+
+Key schema
+──────────
+rag_corpus:version   →  counter bumped on every corpus change
+rag_corpus:changes   →  zset chunk_id → version it last changed in
+rag_corpus:floor     →  newest version trimmed from the changes zset
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.domain.IEmbeddingService.vector_store.bm25_index import BM25Index
+from app.domain.IEmbeddingService.vector_store.pinecone_rag_repository import (
+    _MAX_TOP_K,
+    _SCORE_THRESHOLD,
+    PineconeRAGVectorRepository,
+)
+from app.domain.interfaces.i_rag_vector_repository import IRAGVectorRepository
+from app.domain.value_objects.rag_retrieval_result import RAGRetrievalResult
+from app.utils.logger import logger
+
+CORPUS_VERSION_KEY = "rag_corpus:version"
+CORPUS_CHANGES_KEY = "rag_corpus:changes"
+CORPUS_FLOOR_KEY = "rag_corpus:floor"
+
+# Candidates taken from each ranking before fusion
+_CANDIDATES = 50
+# Standard RRF damping constant; larger values flatten the rank weights
+_RRF_K = 60
+# Pinecone fetch accepts ids in the query string, so keep requests small
+_FETCH_BATCH = 100
+
+# Bumps the version and tags every changed id with it, then trims the oldest
+# entries beyond ARGV[1] and remembers the newest version it trimmed, atomically.
+_RECORD_CHANGES_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+    redis.call('ZADD', KEYS[2], version, ARGV[i])
+end
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[1])
+if excess > 0 then
+    local newest = redis.call('ZRANGE', KEYS[2], excess - 1, excess - 1, 'WITHSCORES')
+    redis.call('SET', KEYS[3], newest[2])
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+end
+return version
+"""
+
+# Bumps the version and raises the floor to it, so every process reloads.
+_RESET_CORPUS_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+redis.call('SET', KEYS[3], version)
+redis.call('DEL', KEYS[2])
+return version
+"""
+
+
+async def record_corpus_changes(chunk_ids: Iterable[str]) -> None:
+    """Tell every process's hybrid index that these chunks were written or deleted."""
+    chunk_ids = list(chunk_ids)
+    if not chunk_ids:
+        return
+    try:
+        await redis_client.eval(
+            _RECORD_CHANGES_SCRIPT,
+            3,
+            CORPUS_VERSION_KEY,
+            CORPUS_CHANGES_KEY,
+            CORPUS_FLOOR_KEY,
+            settings.RAG_CORPUS_CHANGES_MAX,
+            *chunk_ids,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record RAG corpus changes: {e}")
+
+
+async def reset_corpus() -> None:
+    """Tell every process's hybrid index to reload the whole corpus, e.g. after a purge."""
+    await redis_client.eval(_RESET_CORPUS_SCRIPT, 3, CORPUS_VERSION_KEY, CORPUS_CHANGES_KEY, CORPUS_FLOOR_KEY)
+
+
+def _matches(metadata: dict, filters: Optional[dict]) -> bool:
+    """Local evaluation of the Pinecone filter subset we use: equality, $eq, $in."""
+    for field, condition in (filters or {}).items():
+        value = metadata.get(field)
+        if isinstance(condition, dict):
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _supports_filters(filters: Optional[dict]) -> bool:
+    return all(
+        not isinstance(condition, dict) or set(condition) <= {"$eq", "$in"}
+        for condition in (filters or {}).values()
+    )
+
+
+class HybridRAGVectorRepository(IRAGVectorRepository):
+    """
+    BM25 + vector implementation of IRAGVectorRepository, served from memory.
+
+    DIP: Implements IRAGVectorRepository — RAGService is unchanged.
+    OCP: Wraps PineconeRAGVectorRepository for writes, loading and fallback.
+    """
+
+    def __init__(self, vector_repo: PineconeRAGVectorRepository, sync_interval: float = 5.0):
+        self._remote = vector_repo
+        self._sync_interval = sync_interval
+
+        self._chunks: Dict[str, RAGRetrievalResult] = {}
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._bm25 = BM25Index()
+        # Dense matrix of unit vectors, rebuilt lazily after changes
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._matrix_stale = False
+
+        self._version: Optional[int] = None
+        self._loaded = False
+        self._next_sync = 0.0
+        self._sync_task: Optional[asyncio.Task] = None
+
+        self.local_queries = 0
+        self.remote_queries = 0
+
+    # ── Local index maintenance ─────────────────────────────────────────────
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _put(self, chunk_id: str, values: List[float], metadata: dict) -> None:
+        meta = dict(metadata or {})
+        text = meta.pop("content", None) or meta.pop("text", "")
+        chunk = RAGRetrievalResult(
+            chunk_id=chunk_id,
+            text=text,
+            source=meta.pop("source", "unknown"),
+            score=0.0,
+            metadata=meta,
+        )
+        self._chunks[chunk_id] = chunk
+        self._vectors[chunk_id] = self._unit(values)
+        self._bm25.add(chunk_id, text)
+        self._matrix_stale = True
+
+    def _drop(self, chunk_id: str) -> None:
+        if self._chunks.pop(chunk_id, None) is not None:
+            self._vectors.pop(chunk_id, None)
+            self._bm25.remove(chunk_id)
+            self._matrix_stale = True
+
+    def _refresh_matrix(self) -> None:
+        self._ids = list(self._vectors)
+        self._positions = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        self._matrix = (
+            np.vstack([self._vectors[chunk_id] for chunk_id in self._ids])
+            if self._ids else np.zeros((0, 0), dtype=np.float32)
+        )
+        self._matrix_stale = False
+
+    def _fetch(self, chunk_ids: List[str]) -> Dict[str, object]:
+        """Blocking Pinecone fetch of full vectors; run in a thread."""
+        vectors = {}
+        for start in range(0, len(chunk_ids), _FETCH_BATCH):
+            response = self._remote._index.fetch(
+                ids=chunk_ids[start:start + _FETCH_BATCH],
+                namespace=self._remote._namespace,
+            )
+            vectors.update(response.vectors)
+        return vectors
+
+    def _list_ids(self) -> List[str]:
+        return [
+            chunk_id
+            for page in self._remote._index.list(namespace=self._remote._namespace)
+            for chunk_id in page
+        ]
+
+    async def _apply(self, chunk_ids: List[str]) -> None:
+        vectors = await asyncio.to_thread(self._fetch, chunk_ids)
+        for chunk_id in chunk_ids:
+            vector = vectors.get(chunk_id)
+            if vector is None:
+                self._drop(chunk_id)
+            else:
+                self._put(chunk_id, vector.values, vector.metadata)
+
+    async def _load(self, version: int) -> None:
+        chunk_ids = await asyncio.to_thread(self._list_ids)
+        listed = set(chunk_ids)
+        for chunk_id in [c for c in self._chunks if c not in listed]:
+            self._drop(chunk_id)
+        await self._apply(chunk_ids)
+        logger.info(f"Hybrid RAG index loaded. chunks={len(self._chunks)} version={version}")
+
+    async def _sync(self) -> None:
+        try:
+            # One MULTI so the floor and the change list agree with the version
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.get(CORPUS_VERSION_KEY)
+            pipe.get(CORPUS_FLOOR_KEY)
+            # Before the first load the whole corpus is fetched, so no changes are needed
+            since = f"({self._version}" if self._loaded else "+inf"
+            pipe.zrangebyscore(CORPUS_CHANGES_KEY, since, "+inf")
+            version, floor, changed = await pipe.execute()
+            version, floor = int(version or 0), int(floor or 0)
+            if self._loaded and version == self._version:
+                return
+            if not self._loaded or self._version < floor:
+                # Read the version first, so changes made during the load are picked up next time
+                await self._load(version)
+                self._loaded = True
+            else:
+                await self._apply(list(changed))
+                logger.info(f"Hybrid RAG index synced. changed={len(changed)} version={version}")
+            self._version = version
+        except Exception as e:
+            logger.warning(f"Hybrid RAG index sync failed: {e}")
+
+    def _schedule_sync(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        self._next_sync = now + self._sync_interval
+        self._sync_task = asyncio.create_task(self._sync())
+
+    # ── Write ───────────────────────────────────────────────────────────────
+
+    async def upsert_chunk(
+        self,
+        chunk_id: str,
+        embedding: List[float],
+        text: str,
+        source: str,
+        metadata: dict,
+    ) -> None:
+        await self._remote.upsert_chunk(chunk_id, embedding, text, source, metadata)
+        self._put(chunk_id, embedding, {"content": text, "source": source, **metadata})
+        await record_corpus_changes([chunk_id])
+
+    async def delete_chunk(self, chunk_id: str) -> None:
+        await self._remote.delete_chunk(chunk_id)
+        self._drop(chunk_id)
+        await record_corpus_changes([chunk_id])
+
+    # ── Read ────────────────────────────────────────────────────────────────
+
+    def _result(self, chunk_id: str, score: float) -> RAGRetrievalResult:
+        chunk = self._chunks[chunk_id]
+        return RAGRetrievalResult(
+            chunk_id=chunk.chunk_id,
+            text=chunk.text,
+            source=chunk.source,
+            score=score,
+            metadata=dict(chunk.metadata),
+        )
+
+    def _rank(
+        self,
+        embedding: List[float],
+        query_text: Optional[str],
+        filters: Optional[dict],
+    ) -> List[Tuple[str, float]]:
+        """(chunk_id, cosine) pairs ordered by fused rank."""
+        if self._matrix_stale:
+            self._refresh_matrix()
+        if not self._ids:
+            return []
+
+        query = self._unit(embedding)
+        if query.shape[0] != self._matrix.shape[1]:
+            return []
+        similarities = self._matrix @ query
+        relevant = similarities >= _SCORE_THRESHOLD
+        candidates = min(_CANDIDATES, len(self._ids))
+        top = np.argpartition(-similarities, candidates - 1)[:candidates]
+        vector_ranked = [
+            self._ids[i] for i in top[np.argsort(-similarities[top])]
+            if relevant[i]
+        ]
+
+        fused: Dict[str, float] = {}
+        rankings = [vector_ranked]
+        if query_text:
+            rankings.append([
+                chunk_id for chunk_id, _ in self._bm25.search(query_text, _CANDIDATES)
+                if relevant[self._positions[chunk_id]]
+            ])
+        for ranking in rankings:
+            rank = 0
+            for chunk_id in ranking:
+                chunk = self._chunks[chunk_id]
+                if filters and not _matches({**chunk.metadata, "source": chunk.source}, filters):
+                    continue
+                rank += 1
+                fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (_RRF_K + rank)
+
+        ordered = sorted(fused, key=fused.get, reverse=True)
+        return [(chunk_id, float(similarities[self._positions[chunk_id]])) for chunk_id in ordered]
+
+    async def retrieve_similar_chunks(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        query_text: Optional[str] = None,
+    ) -> List[RAGRetrievalResult]:
+        """
+        Chunks ranked by RRF of BM25 (when query_text is given) and cosine
+        similarity, computed in-process. Falls back to Pinecone until the
+        local index is loaded or when the filter cannot be evaluated locally.
+        """
+        self._schedule_sync()
+        if not self._loaded or not _supports_filters(filters):
+            self.remote_queries += 1
+            return await self._remote.retrieve_similar_chunks(embedding, top_k=top_k, filters=filters)
+
+        self.local_queries += 1
+        safe_top_k = min(top_k, _MAX_TOP_K)
+        ranked = self._rank(embedding, query_text, filters)[:safe_top_k]
+        results = [self._result(chunk_id, score) for chunk_id, score in ranked]
+        logger.info(f"Hybrid retrieved {len(results)} chunks (requested top_k={safe_top_k})")
+        return results
+
+    async def fetch_chunk_by_id(self, chunk_id: str) -> Optional[RAGRetrievalResult]:
+        if not self._loaded:
+            return await self._remote.fetch_chunk_by_id(chunk_id)
+        if chunk_id not in self._chunks:
+            return None
+        return self._result(chunk_id, 1.0)
+
+    async def fetch_chunks_by_source(self, source: str) -> List[RAGRetrievalResult]:
+        if not self._loaded:
+            return await self._remote.fetch_chunks_by_source(source)
+        return [chunk for chunk in self._chunks.values() if chunk.source == source]
+
+    # ── Local math ──────────────────────────────────────────────────────────
+
+    def compute_similarity(self, vec_a: List[float], vec_b: List[float]) -> float:
+        return float(self._unit(vec_a) @ self._unit(vec_b))
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "version": self._version,
+            "chunks": len(self._chunks),
+            "terms": self._bm25.term_count,
+            "local_queries": self.local_queries,
+            "remote_queries": self.remote_queries,
+        }
@@ -37,9 +37,10 @@ class PineconeRAGVectorRepository(IRAGVectorRepository):
         api_key: str,
         index_name: str,
         namespace: str = "",
+        index=None,
     ):
-        self._pc = Pinecone(api_key=api_key)
-        self._index = self._pc.Index(index_name)
+        # A shared index handle (app.core.clients) reuses its connection pool
+        self._index = index if index is not None else Pinecone(api_key=api_key).Index(index_name)
         self._namespace = namespace
 
     # ── Write ───────────────────────────────────────────────────────────────
@@ -76,6 +77,7 @@ class PineconeRAGVectorRepository(IRAGVectorRepository):
         embedding: List[float],
         top_k: int = _DEFAULT_TOP_K,
         filters: Optional[dict] = None,
+        query_text: Optional[str] = None,
     ) -> List[RAGRetrievalResult]:
         """
         Retrieve the most semantically similar chunks for a query embedding.
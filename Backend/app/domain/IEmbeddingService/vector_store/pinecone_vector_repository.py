@@ -37,10 +37,10 @@ class PineconeVectorRepository(IVectorRepository):
     DIMENSION = 1024
     METRIC = "cosine"
 
-    def __init__(self, api_key: str, environment: str = "us-east-1"):
-        self._pc = Pinecone(api_key=api_key)
+    def __init__(self, api_key: str, environment: str = "us-east-1", pc: Optional[Pinecone] = None, index=None):
+        self._pc = pc or Pinecone(api_key=api_key)
         self._environment = environment
-        self._index = None
+        self._index = index
 
     async def initialize(self) -> None:
         """
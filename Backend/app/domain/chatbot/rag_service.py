@@ -1,8 +1,8 @@
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from app.domain.interfaces.i_rag_model import IRAGLanguageModel
+from app.domain.interfaces.i_rag_model import IRAGLanguageModel, IStreamingRAGLanguageModel, LanguageModelError
 from app.domain.interfaces.i_rag_vector_repository import IRAGVectorRepository
 from app.domain.value_objects.rag_retrieval_result import RAGRetrievalResult
 from app.utils.logger import logger
@@ -12,6 +12,20 @@ class RAGResponse:
     answer: str
     sources: List[RAGRetrievalResult]
     is_grounded: bool
+    # The model failed and `answer` is an apology for the resident, not an answer
+    is_fallback: bool = False
+
+
+@dataclass
+class RAGStream:
+    """Retrieval is done; the answer arrives through `tokens`."""
+    tokens: AsyncIterator[str]
+    sources: List[RAGRetrievalResult]
+    is_grounded: bool
+
+
+async def _single(text: str) -> AsyncIterator[str]:
+    yield text
 
 
 class RAGService:
@@ -26,35 +40,85 @@ class RAGService:
         self._vector_repo = vector_repo
         self._language_model = language_model
 
-    async def query(
+    async def _retrieve(
         self,
         question: str,
         embedding: List[float],
-        *,
-        history: Optional[List[dict]] = None,
-        top_k: int = _DEFAULT_TOP_K,
-        filters: Optional[dict] = None,
-    ) -> RAGResponse:
+        top_k: int,
+        filters: Optional[dict],
+    ) -> List[RAGRetrievalResult]:
         chunks: List[RAGRetrievalResult] = await self._vector_repo.retrieve_similar_chunks(
             embedding=embedding,
             top_k=top_k,
             filters=filters,
+            query_text=question,
         )
-
         if not chunks:
-          
             logger.warning("No chunks above threshold — calling LLM for no-context response.")
-            answer = await self._language_model.generate_no_context_answer(
+        return chunks[: self._MAX_CONTEXT_CHUNKS]
+
+    async def query(
+        self,
+        question: str,
+        embedding: List[float],
+        *,
+        history: Optional[List[dict]] = None,
+        top_k: int = _DEFAULT_TOP_K,
+        filters: Optional[dict] = None,
+    ) -> RAGResponse:
+        context_chunks = await self._retrieve(question, embedding, top_k, filters)
+
+        try:
+            if not context_chunks:
+                answer = await self._language_model.generate_no_context_answer(
+                    question=question,
+                    history=history or [],
+                )
+                return RAGResponse(answer=answer, sources=[], is_grounded=False)
+
+            context_texts = [chunk.text for chunk in context_chunks]
+            answer = await self._language_model.generate_answer(
                 question=question,
+                context=context_texts,
                 history=history or [],
             )
-            return RAGResponse(answer=answer, sources=[], is_grounded=False)
+            return RAGResponse(answer=answer, sources=context_chunks, is_grounded=True)
+
+        except LanguageModelError as e:
+            return RAGResponse(answer=e.user_message, sources=[], is_grounded=False, is_fallback=True)
+
+    async def stream_query(
+        self,
+        question: str,
+        embedding: List[float],
+        *,
+        history: Optional[List[dict]] = None,
+        top_k: int = _DEFAULT_TOP_K,
+        filters: Optional[dict] = None,
+    ) -> RAGStream:
+        """
+        Like query(), but returns as soon as retrieval is done and streams
+        the answer. Models without streaming support yield it in one piece.
+
+        A model failure surfaces as LanguageModelError, from this call or
+        while iterating `tokens`.
+        """
+        model = self._language_model
+        if not isinstance(model, IStreamingRAGLanguageModel):
+            response = await self.query(question, embedding, history=history, top_k=top_k, filters=filters)
+            if response.is_fallback:
+                raise LanguageModelError(response.answer)
+            return RAGStream(tokens=_single(response.answer), sources=response.sources, is_grounded=response.is_grounded)
+
+        context_chunks = await self._retrieve(question, embedding, top_k, filters)
+
+        if not context_chunks:
+            tokens = model.stream_no_context_answer(question=question, history=history or [])
+            return RAGStream(tokens=tokens, sources=[], is_grounded=False)
 
-        context_chunks = chunks[: self._MAX_CONTEXT_CHUNKS]
-        context_texts = [chunk.text for chunk in context_chunks]
-        answer = await self._language_model.generate_answer(
+        tokens = model.stream_answer(
             question=question,
-            context=context_texts,
+            context=[chunk.text for chunk in context_chunks],
             history=history or [],
         )
-        return RAGResponse(answer=answer, sources=context_chunks, is_grounded=True)
\ No newline at end of file
+        return RAGStream(tokens=tokens, sources=context_chunks, is_grounded=True)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from openai import AsyncOpenAI
 
 from app.domain.interfaces.i_embedding_service import IEmbeddingService
@@ -12,8 +12,9 @@ class OpenAIEmbeddingService(IEmbeddingService):
     Async client used since this runs at query time (chatbot side).
     """
 
-    def __init__(self, api_key: str, model: str = "text-embedding-3-large"):
-        self._client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "text-embedding-3-large", client: Optional[AsyncOpenAI] = None):
+        # Pass the process-wide client (app.core.clients) to share its connection pool
+        self._client = client or AsyncOpenAI(api_key=api_key)
         self._model = model
 
     async def generate(self, text: str) -> List[float]:
@@ -22,4 +23,15 @@ class OpenAIEmbeddingService(IEmbeddingService):
             input=text,
             dimensions=1024
         )
-        return result.data[0].embedding
\ No newline at end of file
+        return result.data[0].embedding
+
+    async def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        result = await self._client.embeddings.create(
+            model=self._model,
+            input=texts,
+            dimensions=1024
+        )
+        # The API returns one item per input, tagged with its input index
+        return [item.embedding for item in sorted(result.data, key=lambda item: item.index)]
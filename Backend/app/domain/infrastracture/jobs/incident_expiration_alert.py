@@ -130,7 +130,7 @@ def _should_notify(incident, target_user_id: int, current_checkpoint: int) -> bo
 
 async def run_expiry_warning_notifications():
     
-    from app.tasks.notification_tasks import send_notifications_task
+    from app.services.notification_services import send_bulk_notifications
 
     """
     Scheduler job — runs every 30 minutes via AsyncIOScheduler.
@@ -214,6 +214,7 @@ async def run_expiry_warning_notifications():
 
             # {incident_id: (target_user_id, checkpoint)}
             to_update: dict[int, tuple[int, int]] = {}
+            notifications: list[dict] = []
 
             for incident in incidents:
                 unresolved_links = [
@@ -261,18 +262,18 @@ async def run_expiry_warning_notifications():
                 hours_left = round(hours_until_expiry, 1)
                 urgency = "CRITICAL" if current_checkpoint == 3 else "Warning"
                 
-                send_notifications_task.delay(
-                    user_id=target_user_id,
-                    title=f"{urgency}: Incident Expiring in {current_checkpoint} Hours",
-                    message=(
+                notifications.append({
+                    "user_id": target_user_id,
+                    "title": f"{urgency}: Incident Expiring in {current_checkpoint} Hours",
+                    "message": (
                         f"Incident '{incident.title}' is still unresolved "
                         f"and will expire in approximately {hours_left} hour(s). "
                         f"Please take action before it is automatically resolved."
                     ),
-                    incident_id=incident.id,
-                    complaint_id=None,
-                    notification_type="warning" if current_checkpoint > 3 else "critical",
-                )
+                    "incident_id": incident.id,
+                    "complaint_id": None,
+                    "notification_type": "warning" if current_checkpoint > 3 else "critical",
+                })
 
                 to_update[incident.id] = (target_user_id, current_checkpoint)
                 logger.info(
@@ -294,7 +295,8 @@ async def run_expiry_warning_notifications():
                             last_expiry_notif_checkpoint=checkpoint,
                         )
                     )
-                await db.commit()
+                # Commits the checkpoint updates together with the warning rows
+                await send_bulk_notifications(notifications, db)
                 logger.info(
                     f"Expiry warning job complete. "
                     f"Notified {len(to_update)} incident(s)."
@@ -1,4 +1,5 @@
 import os
+from app.core.clients import clients
 from app.core.config import settings
 from app.database.database import AsyncSessionLocal
 from app.domain.IEmbeddingService.vector_store.pinecone_vector_repository import PineconeVectorRepository
@@ -12,6 +13,8 @@ def get_vector_repository():
         _vector_repository = PineconeVectorRepository(
             api_key=settings.PINECONE_API_KEY,
             environment=settings.PINECONE_ENVIRONMENT,
+            pc=clients.pinecone,
+            index=clients.pinecone_index(PineconeVectorRepository.INDEX_NAME),
         )
     return _vector_repository
 
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 from openai import AsyncOpenAI
 from app.domain.interfaces.i_incident_verifier import IIncidentVerifier
 
@@ -43,8 +44,8 @@ NORMALIZATION (apply before deciding):
 
 OUTPUT: Reply YES or NO only. No punctuation. No explanation."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4.1-mini"):
-        self._client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "gpt-4.1-mini", client: Optional[AsyncOpenAI] = None):
+        self._client = client or AsyncOpenAI(api_key=api_key)
         self._model = model
 
     async def is_same_incident(
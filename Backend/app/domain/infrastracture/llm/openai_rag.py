@@ -22,21 +22,30 @@ Design decisions
 
 5. HISTORY is passed straight through from RedisMemoryService — no
    additional processing here; trimming is the memory layer's job.
+
+6. FAILURES ARE NOT ANSWERS — a failed call raises LanguageModelError
+   carrying the resident-facing message, so callers can show it without
+   caching it or saving it as a conversation turn.
+
+7. STREAMING — stream_answer / stream_no_context_answer use the same prompts
+   and limits but yield deltas as they arrive. Their timeouts bound the time
+   to the first token and the gap between tokens, not the whole completion.
 """
 
 from __future__ import annotations
 
-from typing import List
+from typing import AsyncIterator, List, Optional
 import asyncio
+import time
 from openai import AsyncOpenAI, APIError, RateLimitError, APITimeoutError, APIConnectionError
 
 
-from app.domain.interfaces.i_rag_model import IRAGLanguageModel
+from app.domain.interfaces.i_rag_model import IStreamingRAGLanguageModel, LanguageModelError
 
 from app.utils.logger import logger
 
 
-class OpenAIRAGLanguageModel(IRAGLanguageModel):
+class OpenAIRAGLanguageModel(IStreamingRAGLanguageModel):
 
     # Master system prompt
     # All behavioral rules live here — never duplicated in user messages.
@@ -262,9 +271,11 @@ HARD LIMITS
     _MAX_TOKENS_NO_CONTEXT = 80    # one clarifying sentence only
     _TEMP_ANSWER           = 0.2   # factual but slightly flexible
     _TEMP_NO_CONTEXT       = 0.0   # deterministic classification
+    _FIRST_TOKEN_TIMEOUT   = 20    # seconds until the first streamed token
+    _STREAM_IDLE_TIMEOUT   = 10    # seconds between streamed tokens
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini") -> None:
-        self._client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", client: Optional[AsyncOpenAI] = None) -> None:
+        self._client = client or AsyncOpenAI(api_key=api_key)
         self._model = model
 
     def _build_messages(
@@ -291,66 +302,56 @@ HARD LIMITS
             for i, chunk in enumerate(chunks)
         )
         
-    async def _call_openai(
-        self,
-        messages: List[dict],
-        max_tokens: int,
-        temperature: float,
-        label: str,
-    ) -> str:
-        try:
-            response = await asyncio.wait_for(
-                self._client.chat.completions.create(
-                    model=self._model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                ),
-                timeout=20  # ⏱️ hard timeout (seconds)
-            )
+    def _answer_prompt(self, question: str, context: List[str]) -> str:
+        formatted_context = self._format_context(context)
 
-            answer = response.choices[0].message.content.strip()
-            usage = response.usage
+        logger.info("formatted_context:\n%s", formatted_context)  # Debug log for formatted context
 
-            logger.info(
-                "[OpenAI] %s | model=%s | prompt_tokens=%d | "
-                "completion_tokens=%d | total_tokens=%d | answer_len=%d",
-                label,
-                self._model,
-                usage.prompt_tokens,
-                usage.completion_tokens,
-                usage.total_tokens,
-                len(answer),
-            )
+        return (
+            f"RETRIEVED CONTEXT\n"
+            f"{'─' * 48}\n"
+            f"{formatted_context}\n\n"
+            f"TANONG NG RESIDENTE\n"
+            f"{'─' * 48}\n"
+            f"{question}"
+        )
 
-            return answer
+    @staticmethod
+    def _no_context_prompt(question: str) -> str:
+        return (
+            f"TANONG NG RESIDENTE (walang nakuhang dokumento)\n"
+            f"{'─' * 48}\n"
+            f"{question}\n\n"
+            f"Sundin ang NO-CONTEXT CLASSIFICATION na nasa system prompt. "
+            f"Isang pangungusap lamang ang sagot."
+        )
 
-     
-        except asyncio.TimeoutError:
+    @staticmethod
+    def _fallback_message(error: Exception, label: str) -> str:
+        """Logs a failed OpenAI call and returns the message shown to the resident instead."""
+        if isinstance(error, asyncio.TimeoutError):
             logger.warning("[OpenAI] %s TIMEOUT", label)
             return (
                 "Paumanhin, mabagal ang koneksyon sa ngayon. "
                 "Pakisubukang muli pagkatapos ng ilang sandali."
             )
 
-      
-        except APIConnectionError:
-            logger.exception("[OpenAI] %s CONNECTION ERROR", label, exc_info=True)
+        # APITimeoutError subclasses APIConnectionError, so check it first
+        if isinstance(error, APITimeoutError):
+            logger.warning("[OpenAI] %s API TIMEOUT", label)
             return (
                 "Paumanhin, mabagal ang koneksyon sa ngayon. "
                 "Pakisuri ang inyong internet connection at subukang muli."
             )
 
-     
-        except APITimeoutError:
-            logger.warning("[OpenAI] %s API TIMEOUT", label)
+        if isinstance(error, APIConnectionError):
+            logger.error("[OpenAI] %s CONNECTION ERROR", label, exc_info=error)
             return (
                 "Paumanhin, mabagal ang koneksyon sa ngayon. "
                 "Pakisuri ang inyong internet connection at subukang muli."
             )
 
-   
-        except RateLimitError:
+        if isinstance(error, RateLimitError):
             logger.warning("[OpenAI] %s RATE LIMITED", label)
             return (
                 "Maraming request sa ngayon. "
@@ -358,11 +359,11 @@ HARD LIMITS
             )
 
         # ⚠️ GENERIC API ERROR
-        except APIError as e:
-            logger.exception(
+        if isinstance(error, APIError):
+            logger.error(
                 "[OpenAI] %s API ERROR | status=%s | message=%s",
-                label, getattr(e, "status_code", "unknown"), str(e),
-                exc_info=True
+                label, getattr(error, "status_code", "unknown"), str(error),
+                exc_info=error
             )
             return (
                 "May pansamantalang problema sa system. "
@@ -370,17 +371,53 @@ HARD LIMITS
             )
 
         # ❌ FALLBACK (unexpected errors)
-        except Exception as e:
-            logger.critical(
-                "[OpenAI] %s UNKNOWN ERROR | type=%s | error=%s",
-                label, type(e).__name__, e,
-                exc_info=True
+        logger.critical(
+            "[OpenAI] %s UNKNOWN ERROR | type=%s | error=%s",
+            label, type(error).__name__, error,
+            exc_info=error
+        )
+        return (
+            "Paumanhin, may hindi inaasahang error. "
+            "Pakisubukang muli."
+        )
+
+    async def _call_openai(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+        label: str,
+    ) -> str:
+        try:
+            response = await asyncio.wait_for(
+                self._client.chat.completions.create(
+                    model=self._model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                ),
+                timeout=20  # ⏱️ hard timeout (seconds)
             )
-            return (
-                "Paumanhin, may hindi inaasahang error. "
-                "Pakisubukang muli."
+
+            answer = response.choices[0].message.content.strip()
+            usage = response.usage
+
+            logger.info(
+                "[OpenAI] %s | model=%s | prompt_tokens=%d | "
+                "completion_tokens=%d | total_tokens=%d | answer_len=%d",
+                label,
+                self._model,
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                usage.total_tokens,
+                len(answer),
             )
 
+            return answer
+
+        except Exception as e:
+            raise LanguageModelError(self._fallback_message(e, label)) from e
+
     async def generate_answer(
         self,
         question: str,
@@ -391,20 +428,7 @@ HARD LIMITS
         Called when Pinecone returned relevant context chunks.
         Answers strictly from the retrieved documents.
         """
-        formatted_context = self._format_context(context)
-        
-        logger.info("formatted_context:\n%s", formatted_context)  # Debug log for formatted context
-
-        user_prompt = (
-            f"RETRIEVED CONTEXT\n"
-            f"{'─' * 48}\n"
-            f"{formatted_context}\n\n"
-            f"TANONG NG RESIDENTE\n"
-            f"{'─' * 48}\n"
-            f"{question}"
-        )
-
-        messages = self._build_messages(user_prompt, history)
+        messages = self._build_messages(self._answer_prompt(question, context), history)
 
         return await self._call_openai(
             messages=messages,
@@ -423,19 +447,117 @@ HARD LIMITS
         The system prompt already contains the full classification rules —
         this user message is intentionally minimal to save tokens.
         """
-        user_prompt = (
-            f"TANONG NG RESIDENTE (walang nakuhang dokumento)\n"
-            f"{'─' * 48}\n"
-            f"{question}\n\n"
-            f"Sundin ang NO-CONTEXT CLASSIFICATION na nasa system prompt. "
-            f"Isang pangungusap lamang ang sagot."
-        )
-
-        messages = self._build_messages(user_prompt, history)
+        messages = self._build_messages(self._no_context_prompt(question), history)
 
         return await self._call_openai(
             messages=messages,
             max_tokens=self._MAX_TOKENS_NO_CONTEXT,
             temperature=self._TEMP_NO_CONTEXT,
             label="generate_no_context_answer",
-        )
\ No newline at end of file
+        )
+
+    async def _stream_openai(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+        label: str,
+    ) -> AsyncIterator[str]:
+        """
+        Streams completion fragments as they arrive.
+
+        A failure before the first fragment raises LanguageModelError with
+        the same resident-facing message as _call_openai. A failure after
+        fragments were sent is re-raised as is, because a partial answer
+        cannot be corrected.
+        """
+        started = time.perf_counter()
+        first_token_ms = None
+        answer_len = 0
+        usage = None
+        stream = None
+        try:
+            stream = await asyncio.wait_for(
+                self._client.chat.completions.create(
+                    model=self._model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ),
+                timeout=self._FIRST_TOKEN_TIMEOUT,
+            )
+            chunks = stream.__aiter__()
+            while True:
+                timeout = self._FIRST_TOKEN_TIMEOUT if first_token_ms is None else self._STREAM_IDLE_TIMEOUT
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                answer_len += len(delta)
+                yield delta
+
+            logger.info(
+                "[OpenAI] %s (stream) | model=%s | first_token_ms=%.0f | total_ms=%.0f | "
+                "prompt_tokens=%s | completion_tokens=%s | answer_len=%d",
+                label,
+                self._model,
+                first_token_ms or 0,
+                (time.perf_counter() - started) * 1000,
+                getattr(usage, "prompt_tokens", "?"),
+                getattr(usage, "completion_tokens", "?"),
+                answer_len,
+            )
+
+        except Exception as e:
+            if answer_len:
+                logger.warning("[OpenAI] %s stream interrupted after %d chars: %s", label, answer_len, e)
+                raise
+            raise LanguageModelError(self._fallback_message(e, label)) from e
+
+        finally:
+            if stream is not None:
+                await stream.close()
+
+    async def stream_answer(
+        self,
+        question: str,
+        context: List[str],
+        history: Optional[List[dict]] = None,
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of generate_answer."""
+        messages = self._build_messages(self._answer_prompt(question, context), history or [])
+
+        async for fragment in self._stream_openai(
+            messages=messages,
+            max_tokens=self._MAX_TOKENS_ANSWER,
+            temperature=self._TEMP_ANSWER,
+            label="stream_answer",
+        ):
+            yield fragment
+
+    async def stream_no_context_answer(
+        self,
+        question: str,
+        history: Optional[List[dict]] = None,
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of generate_no_context_answer."""
+        messages = self._build_messages(self._no_context_prompt(question), history or [])
+
+        async for fragment in self._stream_openai(
+            messages=messages,
+            max_tokens=self._MAX_TOKENS_NO_CONTEXT,
+            temperature=self._TEMP_NO_CONTEXT,
+            label="stream_no_context_answer",
+        ):
+            yield fragment
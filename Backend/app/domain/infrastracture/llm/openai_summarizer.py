@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+
+from openai import AsyncOpenAI
+
+from app.domain.interfaces.i_conversation_summarizer import IConversationSummarizer
+from app.utils.logger import logger
+
+
+class OpenAIConversationSummarizer(IConversationSummarizer):
+    """
+    Rolling chat summary for RedisMemoryService.
+
+    Runs after the answer has been sent, so it never adds to response time.
+    The summary is written in the conversation's own language and keeps only
+    what a follow-up question could refer back to.
+    """
+
+    SYSTEM_PROMPT = (
+        "You maintain a running summary of a conversation between a resident of "
+        "Santa Maria, Laguna and the CFMS assistant. Merge the new messages into "
+        "the existing summary. Keep the resident's concerns, locations, names, "
+        "reference numbers and anything the assistant promised or asked for; drop "
+        "greetings and small talk. Write at most 5 short sentences in the same "
+        "language the resident uses. Reply with the summary only."
+    )
+
+    _MAX_TOKENS = 200
+    _TIMEOUT = 20  # seconds
+
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", client: AsyncOpenAI | None = None) -> None:
+        self._client = client or AsyncOpenAI(api_key=api_key)
+        self._model = model
+
+    async def summarize(self, previous_summary: str, messages: list[dict]) -> str:
+        transcript = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+        response = await asyncio.wait_for(
+            self._client.chat.completions.create(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": self.SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": (
+                            f"EXISTING SUMMARY\n{previous_summary or '(none)'}\n\n"
+                            f"NEW MESSAGES\n{transcript}"
+                        ),
+                    },
+                ],
+                max_tokens=self._MAX_TOKENS,
+                temperature=0.0,
+            ),
+            timeout=self._TIMEOUT,
+        )
+        summary = response.choices[0].message.content.strip()
+        logger.info(
+            "[OpenAI] summarize_history | model=%s | messages=%d | summary_len=%d",
+            self._model, len(messages), len(summary),
+        )
+        return summary
@@ -1,11 +1,18 @@
 import os
 import logging
+from typing import AsyncIterator, List, Optional, Tuple
 
 from app.domain.chatbot.rag_service import RAGService, RAGResponse
 from app.domain.IEmbeddingService.vector_store.pinecone_rag_repository import PineconeRAGVectorRepository
+from app.domain.IEmbeddingService.vector_store.hybrid_rag_repository import HybridRAGVectorRepository
+from app.domain.interfaces.i_rag_model import LanguageModelError
+from app.domain.interfaces.i_rag_vector_repository import IRAGVectorRepository
 from app.domain.infrastracture.llm.openai_rag import OpenAIRAGLanguageModel
+from app.domain.infrastracture.llm.openai_summarizer import OpenAIConversationSummarizer
 from app.domain.config.embeddings.openai_embedding import OpenAIEmbeddingService
 from app.services.rag_memory_service import RedisMemoryService
+from app.services.semantic_cache_service import SemanticAnswerCache, semantic_answer_cache
+from app.core.clients import clients
 from app.core.config import settings
 from app.core.redis import redis_client
 
@@ -18,10 +25,34 @@ class ChatbotService:
         rag_service: RAGService,
         embedding_service: OpenAIEmbeddingService,
         memory: RedisMemoryService,
+        answer_cache: SemanticAnswerCache | None = None,
     ):
         self._rag = rag_service
         self._embedder = embedding_service
         self._memory = memory
+        self._answer_cache = answer_cache
+
+    async def _cached_answer(
+        self,
+        question: str,
+        history: List[dict],
+    ) -> Tuple[Optional[RAGResponse], Optional[List[float]]]:
+        """Cached answer for the question, and its embedding if one had to be generated."""
+        # Cached answers are context-free; a follow-up ("magkano po yun?") needs its history
+        use_cache = self._answer_cache is not None and not history
+
+        # Exact repeat of a cached question — no embedding call needed
+        if use_cache:
+            result = await self._answer_cache.get_exact(question)
+            if result is not None:
+                return result, None
+
+        # Generate embedding for the question; a semantically close cached answer is reused
+        embedding = await self._embedder.generate(question)
+        result = None
+        if use_cache:
+            result = await self._answer_cache.get_similar(embedding)
+        return result, embedding
 
     async def ask(
         self,
@@ -36,15 +67,22 @@ class ChatbotService:
         #    - returns existing history (empty list if new session)
         session_ctx = await self._memory.load_session(user_id, session_id)
 
-        # 2. Generate embedding for the question
-        embedding = await self._embedder.generate(question)
+        # 2. Exact or semantically close cached answer (only without history)
+        result, embedding = await self._cached_answer(question, session_ctx.history)
 
-        # 3. Query RAG with question, embedding, and history
-        result = await self._rag.query(
-            question=question,
-            embedding=embedding,
-            history=session_ctx.history,
-        )
+        # 3. Otherwise query RAG with question, embedding, and history
+        if result is None:
+            result = await self._rag.query(
+                question=question,
+                embedding=embedding,
+                history=session_ctx.history,
+            )
+            # A failed model call is shown to the resident but neither cached nor remembered
+            if result.is_fallback:
+                return result
+            # Only context-free answers are reusable by other users
+            if self._answer_cache and result.is_grounded and not session_ctx.history:
+                await self._answer_cache.store(question, embedding, result)
 
         # 4. Append new Q&A pair, trim, and write back to Redis
         await self._memory.save_turn(
@@ -52,30 +90,120 @@ class ChatbotService:
             session_id=session_id,
             question=question,
             answer=result.answer,
-            current_history=session_ctx.history,
         )
 
         return result
 
+    async def ask_stream(
+        self,
+        question: str,
+        user_id: str,
+        session_id: str,
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Streaming counterpart of ask(), yielding (event, data) pairs:
+        ("token", {"text": ...}) for each answer fragment, then
+        ("done", {"is_grounded": ...}) once the turn is saved.
+
+        If the model fails before answering, a single ("error", {"detail": ...})
+        carries the message for the resident instead, and nothing is cached
+        or saved.
 
-def create_chatbot_service() -> ChatbotService:
-    pinecone_repo = PineconeRAGVectorRepository(
+        The turn is only saved, and the answer only cached, when the stream
+        completes; a client that disconnects mid-answer leaves no half turn
+        in the history.
+        """
+        session_ctx = await self._memory.load_session(user_id, session_id)
+
+        result, embedding = await self._cached_answer(question, session_ctx.history)
+
+        if result is not None:
+            # Cached answers are complete already; send them in one piece
+            yield "token", {"text": result.answer}
+        else:
+            parts = []
+            try:
+                stream = await self._rag.stream_query(
+                    question=question,
+                    embedding=embedding,
+                    history=session_ctx.history,
+                )
+                async for fragment in stream.tokens:
+                    parts.append(fragment)
+                    yield "token", {"text": fragment}
+            except LanguageModelError as e:
+                if parts:
+                    raise
+                yield "error", {"detail": e.user_message}
+                return
+
+            result = RAGResponse(answer="".join(parts).strip(), sources=stream.sources, is_grounded=stream.is_grounded)
+            if self._answer_cache and result.is_grounded and not session_ctx.history:
+                await self._answer_cache.store(question, embedding, result)
+
+        await self._memory.save_turn(
+            user_id=user_id,
+            session_id=session_id,
+            question=question,
+            answer=result.answer,
+        )
+
+        yield "done", {"is_grounded": result.is_grounded}
+
+
+_hybrid_repository: HybridRAGVectorRepository | None = None
+
+
+def _create_pinecone_repository() -> PineconeRAGVectorRepository:
+    index_name = os.environ["PINECONE_RAG_INDEX_NAME"]
+    return PineconeRAGVectorRepository(
         api_key=os.environ["PINECONE_API_KEY"],
-        index_name=os.environ["PINECONE_RAG_INDEX_NAME"],
+        index_name=index_name,
+        index=clients.pinecone_index(index_name),
     )
 
-    language_model = OpenAIRAGLanguageModel(api_key=settings.OPEN_AI_API_KEY)
-    embedding_service = OpenAIEmbeddingService(api_key=settings.OPEN_AI_API_KEY)
+
+def get_hybrid_rag_repository() -> HybridRAGVectorRepository:
+    """Process-wide hybrid index; it holds the corpus, so it must not be rebuilt per request."""
+    global _hybrid_repository
+    if _hybrid_repository is None:
+        _hybrid_repository = HybridRAGVectorRepository(
+            vector_repo=_create_pinecone_repository(),
+            sync_interval=settings.RAG_CORPUS_SYNC_SECONDS,
+        )
+    return _hybrid_repository
+
+
+def get_rag_vector_repository() -> IRAGVectorRepository:
+    if settings.RAG_HYBRID_RETRIEVAL:
+        return get_hybrid_rag_repository()
+    return _create_pinecone_repository()
+
+
+def create_chatbot_service() -> ChatbotService:
+    vector_repo = get_rag_vector_repository()
+
+    # Per-request objects are thin; connections live in the shared clients
+    language_model = OpenAIRAGLanguageModel(api_key=settings.OPEN_AI_API_KEY, client=clients.openai)
+    embedding_service = OpenAIEmbeddingService(api_key=settings.OPEN_AI_API_KEY, client=clients.openai)
 
     rag_service = RAGService(
-        vector_repo=pinecone_repo,
+        vector_repo=vector_repo,
         language_model=language_model,
     )
 
-    memory = RedisMemoryService(client=redis_client)
+    memory = RedisMemoryService(
+        client=redis_client,
+        summarizer=(
+            OpenAIConversationSummarizer(api_key=settings.OPEN_AI_API_KEY, client=clients.openai)
+            if settings.CHAT_MEMORY_SUMMARIZE else None
+        ),
+        token_budget=settings.CHAT_HISTORY_TOKEN_BUDGET,
+    )
 
     return ChatbotService(
         rag_service=rag_service,
         embedding_service=embedding_service,
         memory=memory,
+        answer_cache=semantic_answer_cache,
     )
\ No newline at end of file
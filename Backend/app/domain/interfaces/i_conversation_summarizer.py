@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+
+class IConversationSummarizer(ABC):
+    """
+    Domain interface for condensing older chat turns into a rolling summary.
+
+    SRP: Only responsible for folding messages into a summary.
+    DIP: The memory layer depends on this abstraction, not on a concrete LLM.
+    """
+
+    @abstractmethod
+    async def summarize(self, previous_summary: str, messages: list[dict]) -> str:
+        """
+        Fold `messages` into `previous_summary`.
+
+        Args:
+            previous_summary: The current summary of earlier turns ("" if none).
+            messages:         The oldest {role, content} messages leaving the window.
+
+        Returns:
+            A short summary covering both the previous summary and the messages.
+        """
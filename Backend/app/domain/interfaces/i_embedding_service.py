@@ -20,4 +20,13 @@ class IEmbeddingService(ABC):
         Returns:
             A list of floats representing the embedding vector.
         """
-        ...
\ No newline at end of file
+        ...
+
+    async def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts, in input order.
+
+        Backends that accept multiple inputs per request should override
+        this; the default embeds one text at a time.
+        """
+        return [await self.generate(text) for text in texts]
@@ -1,4 +1,18 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+
+
+class LanguageModelError(Exception):
+    """
+    The model could not produce an answer (timeout, rate limit, API error).
+
+    `user_message` is safe to show the resident; it is not an answer and
+    must never be cached or stored as a conversation turn.
+    """
+
+    def __init__(self, user_message: str):
+        super().__init__(user_message)
+        self.user_message = user_message
 
 
 class IRAGLanguageModel(ABC):
@@ -25,6 +39,9 @@ class IRAGLanguageModel(ABC):
 
         Returns:
             A natural-language answer grounded in the provided context.
+
+        Raises:
+            LanguageModelError: when no answer could be generated.
         """
 
     @abstractmethod
@@ -38,4 +55,56 @@ class IRAGLanguageModel(ABC):
         Returns:
             A natural-language response informing the resident no information
             was found, and directing them to their barangay or munisipyo.
-        """
\ No newline at end of file
+        """
+
+
+class IStreamingRAGLanguageModel(IRAGLanguageModel):
+    """
+    Streaming variant of IRAGLanguageModel.
+
+    Yields the answer as text fragments while the model generates it, so the
+    caller can forward the first tokens before the completion is finished.
+    Concatenating every fragment gives the same answer generate_answer would.
+    """
+
+    @abstractmethod
+    def stream_answer(
+        self,
+        question: str,
+        context: list[str],
+        history: Optional[List[dict]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Streams an answer to `question` grounded in the provided `context` chunks.
+
+        Args:
+            question: The natural-language question from the user.
+            context:  List of retrieved document chunks to use as grounding context.
+            history:  Prior conversation turns from the memory layer.
+
+        Yields:
+            Fragments of the answer, in order.
+
+        Raises:
+            LanguageModelError: when the model fails before the first fragment.
+        """
+
+    @abstractmethod
+    def stream_no_context_answer(
+        self,
+        question: str,
+        history: Optional[List[dict]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Streams the fallback answer used when no relevant chunks were retrieved.
+
+        Args:
+            question: The natural-language question from the user.
+            history:  Prior conversation turns from the memory layer.
+
+        Yields:
+            Fragments of the answer, in order.
+
+        Raises:
+            LanguageModelError: when the model fails before the first fragment.
+        """
@@ -39,14 +39,17 @@ class IRAGVectorRepository(ABC):
         embedding: List[float],
         top_k: int = 5,
         filters: dict | None = None,
+        query_text: str | None = None,
     ) -> List[RAGRetrievalResult]:
         """
         Find the most semantically similar chunks to the query embedding.
 
         Args:
-            embedding: The query vector derived from the user's question.
-            top_k:     Number of nearest neighbors to return.
-            filters:   Optional metadata filters (e.g. {"category": "ordinance"}).
+            embedding:  The query vector derived from the user's question.
+            top_k:      Number of nearest neighbors to return.
+            filters:    Optional metadata filters (e.g. {"category": "ordinance"}).
+            query_text: The question itself, for implementations that also
+                        match keywords. Pure vector stores ignore it.
 
         Returns:
             List of RAGRetrievalResult ordered by similarity score descending.
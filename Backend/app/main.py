@@ -1,24 +1,29 @@
 from fastapi import FastAPI, status
-from fastapi.requests import Request
 from contextlib import asynccontextmanager
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from slowapi.errors import RateLimitExceeded
 from sqlalchemy import select
 from app.utils.logger import logger
 from app.utils.attachments import AttachmentSizeLimitMiddleware
-from app.routers import user_auth_routes, user_routes, barangay_routes,chatbot_routes, complaint_routes, incident_routes, lgu_routes, notification_routes, department_routes, announcement_routes, report_routes, app_feedback_routes, event_routes, sms_routes, categories_routes
+from app.routers import user_auth_routes, user_routes, barangay_routes,chatbot_routes, complaint_routes, incident_routes, lgu_routes, notification_routes, department_routes, announcement_routes, report_routes, app_feedback_routes, event_routes, sms_routes, categories_routes, metrics_routes
 from app.admin import _super_admin_routes as _super_admin
 from app.database.database import AsyncSessionLocal
-from app.core.redis import redis_client
+from app.database.read_replica import ReadYourWritesMiddleware, start_replica_monitor, stop_replica_monitor
+from app.dependencies.rate_limiter import RateLimitHeadersMiddleware
+from app.core.clients import clients
+from app.core.redis import ping_redis
 scheduler = AsyncIOScheduler()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    clients.start()
+    start_replica_monitor()
     logger.info("Application startup complete.")
     yield
+    await stop_replica_monitor()
+    await clients.aclose()
     logger.info("Application shutdown complete.")
 
 app = FastAPI(lifespan=lifespan)
@@ -46,7 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With", "X-Request-ID"],
-    expose_headers=["X-Request-ID"],
+    expose_headers=["X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After"],
 )
 
 @app.get("/healthz")
@@ -59,7 +64,8 @@ async def readyz():
     try:
         async with AsyncSessionLocal() as db:
             await db.execute(select(1))
-        await redis_client.ping()
+        if not await ping_redis():
+            raise RuntimeError("Redis ping failed")
         return {"status": "ready"}
     except Exception:
         logger.exception("Readiness check failed")
@@ -68,17 +74,12 @@ async def readyz():
             content={"status": "not ready"},
         )
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
-        status_code=429,
-        content={"detail": "Rate limit exceeded. Please Atry again later."},
-)
 
 logger.info("FastAPI application initialized.")
 
-app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
 app.add_middleware(AttachmentSizeLimitMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RateLimitHeadersMiddleware)
 
 app.include_router(categories_routes.router, prefix="/api/v1/categories", tags=["Categories"])
 app.include_router(sms_routes.router, prefix="/api/v1/sms", tags=["SMS"])
@@ -96,3 +97,4 @@ app.include_router(report_routes.router, prefix="/api/v1/reports", tags=["Report
 app.include_router(app_feedback_routes.router, prefix="/api/v1/app-feedback", tags=["App Feedback"])
 app.include_router(event_routes.router, prefix="/api/v1/events", tags=["Events"])
 app.include_router(chatbot_routes.router, prefix="/api/v1/chatbot", tags=["Chatbot"])
+app.include_router(metrics_routes.router, prefix="/metrics", tags=["Metrics"])
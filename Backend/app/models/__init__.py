@@ -24,4 +24,6 @@ from .evacuation_centers import EvacuationCenter
 from .post_incident_feedback import PostIncidentFeedback
 from .response_attachments import ResponseAttachments
 from .complaint_logs import ComplaintLogs
-from .rejection_categories import RejectionCategory
\ No newline at end of file
+from .rejection_categories import RejectionCategory
+from .complaint_daily_rollup import ComplaintDailyRollup
+from .outbox_event import OutboxEvent
\ No newline at end of file
@@ -50,4 +50,9 @@ class Complaint(Base):
         "IncidentComplaintModel",
         back_populates="complaint",
         cascade="all, delete-orphan"
-    )
\ No newline at end of file
+    )
+
+    __table_args__ = (
+        # Keyset pagination: "newest complaints in this barangay, after cursor"
+        Index("ix_complaint_barangay_created_id", "barangay_id", "created_at", "id"),
+    )
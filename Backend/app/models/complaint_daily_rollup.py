@@ -0,0 +1,37 @@
+from app.database.database import Base
+from sqlalchemy import Column, Date, Integer, String, Index
+
+
+class ComplaintDailyRollup(Base):
+    """
+    Pre-aggregated complaint counts per (day, barangay, category, department, status).
+
+    `day` is the local date the complaint was filed. Rows with kind="current"
+    count complaints currently in `status`; rows with kind="reached" count
+    complaints that have ever entered a milestone status (e.g. forwarded_to_lgu),
+    which keeps dashboard buckets sticky after the complaint moves on.
+
+    Maintained incrementally by the write paths through DailyRollupHelper and
+    rebuilt nightly by the rollup reconciliation task. An empty table is
+    backfilled when a Celery worker starts (backfill_complaint_rollup_task).
+    """
+    __tablename__ = "complaint_daily_rollup"
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False)
+    barangay_id = Column(Integer, nullable=False)
+    category_id = Column(Integer, nullable=False)
+    # 0 when the complaint is not assigned to a department; kept non-null so it can be part of the upsert key
+    department_account_id = Column(Integer, nullable=False, default=0)
+    kind = Column(String(10), nullable=False, default="current")
+    status = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "ix_unique_complaint_daily_rollup",
+            "day", "barangay_id", "category_id", "department_account_id", "kind", "status",
+            unique=True,
+        ),
+        Index("ix_complaint_daily_rollup_kind_day", "kind", "day"),
+    )
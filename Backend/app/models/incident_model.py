@@ -77,4 +77,6 @@ class IncidentModel(Base):
         # Composite index for the most common query pattern:
         # "Find active incidents in this barangay + category"
         Index("ix_incident_barangay_category_status", "barangay_id", "category_id", "status"),
+        # Keyset pagination: "newest incidents in this barangay, after cursor"
+        Index("ix_incident_barangay_first_reported_id", "barangay_id", "first_reported_at", "id"),
     )
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 
 from app.database.database import Base
-from sqlalchemy import Column, DateTime, Integer, String, Boolean, Date, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, Boolean, Date, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 class Notification(Base):
@@ -20,4 +20,10 @@ class Notification(Base):
 
     user = relationship("User", back_populates="notifications")
     complaint = relationship("Complaint", back_populates="notifications")
-    incident = relationship("IncidentModel", back_populates="notifications")
\ No newline at end of file
+    incident = relationship("IncidentModel", back_populates="notifications")
+
+    __table_args__ = (
+        # Inbox keyset pagination and the unread recount
+        Index("ix_notification_user_sent_id", "user_id", "sent_at", "id"),
+        Index("ix_notification_user_unread", "user_id", postgresql_where=text("is_read = false")),
+    )
@@ -0,0 +1,31 @@
+from app.database.database import Base
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class OutboxEvent(Base):
+    """
+    A Celery task recorded in the same transaction as the domain change that triggers it.
+
+    Nothing talks to the broker inside the request: the outbox relay
+    (app/tasks/outbox_relay.py) drains pending rows in batches and stamps
+    `dispatched_at` once the broker has accepted them, giving at-least-once
+    delivery. `dedupe_key` is unique, so retried producers (e.g. a Celery task
+    that runs twice) record an event only once.
+    """
+    __tablename__ = "outbox_event"
+
+    id = Column(BigInteger, primary_key=True)
+    task_name = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    queue = Column(String, nullable=True)
+    dedupe_key = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_unique_outbox_event_dedupe_key", "dedupe_key", unique=True),
+        Index("ix_outbox_event_pending", "id", postgresql_where=text("dispatched_at IS NULL")),
+    )
@@ -5,8 +5,7 @@ from app.dependencies.db_dependency import get_async_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.auth_dependency import get_current_user
 from app.models.user import User
-from app.dependencies.rate_limiter import limiter, rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
+from app.dependencies.rate_limiter import limiter
 from app.utils.logger import logger
 
 router = APIRouter()
@@ -1,14 +1,18 @@
 # app/api/v1/routes/chatbot.py
-from fastapi import APIRouter, Depends
+import json
+from fastapi import APIRouter, Depends, Request, status
 from pydantic import BaseModel
-from app.services.rag_services import _upsert_chunks, _embed, _chunk_text, _extract_text
-from fastapi import UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.schemas.chatbot_schema import ChatRequest, ChatResponse
-from app.dependencies.auth_dependency import get_current_user
+from app.schemas.chatbot_schema import ChatRequest, ChatResponse, PdfIngestJob
+from app.dependencies.auth_dependency import get_current_user, get_current_user_for_stream
 from app.models.user import User
 from app.core.redis import redis_client 
+from app.dependencies.rate_limiter import ASK_COST, OPENAI_BUDGET, OPENAI_SCOPE, limiter
+from app.services.rag_ingest_service import create_ingest_job, get_ingest_job
+from app.services.sse_hub import encode_event
+from app.utils.logger import logger
 
 
 router = APIRouter()
@@ -19,7 +23,10 @@ from app.domain.infrastracture.service.chatbot_service import create_chatbot_ser
 
 
 @router.post("/ask", response_model=ChatResponse)
+@limiter.limit("10/minute")
+@limiter.limit(OPENAI_BUDGET, cost=ASK_COST, scope=OPENAI_SCOPE)
 async def ask(
+    request: Request,
     body: ChatRequest,
     chatbot: ChatbotService = Depends(create_chatbot_service),
     user=Depends(get_current_user),
@@ -30,37 +37,61 @@ async def ask(
         user_id=str(user.id),
     )
     return ChatResponse(answer=result.answer, is_grounded=result.is_grounded)
- 
 
 
-@router.post("/upload-pdf", summary="Upload a PDF to index into Pinecone")
-async def upload_pdf(file: UploadFile = File(...)):
+
+@router.post("/ask/stream", summary="Ask the chatbot and stream the answer as server-sent events")
+@limiter.limit("10/minute")
+@limiter.limit(OPENAI_BUDGET, cost=ASK_COST, scope=OPENAI_SCOPE)
+async def ask_stream(
+    request: Request,
+    body: ChatRequest,
+    chatbot: ChatbotService = Depends(create_chatbot_service),
+    user=Depends(get_current_user_for_stream),
+):
     """
-    Accepts a PDF file, extracts text, chunks it by section headings,
-    embeds each chunk via openAI, and upserts into Pinecone.
+    Same as /ask, but answer fragments are sent as `token` events while the
+    model generates them, followed by a `done` event once the turn is saved.
+    If the model cannot answer, or fails mid-answer, the stream ends with an
+    `error` event instead of `done`.
     """
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+    user_id = str(user.id)
 
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+    async def event_generator():
+        try:
+            async for event, data in chatbot.ask_stream(
+                question=body.question,
+                session_id=body.session_id,
+                user_id=user_id,
+            ):
+                yield encode_event(event, json.dumps(data))
+        except Exception as e:
+            logger.exception(f"Chatbot stream failed. user_id={user_id}: {e}")
+            yield encode_event("error", json.dumps({"detail": "Something went wrong. Please try again."}))
 
-    # Pipeline: extract → chunk → embed → upsert
-    raw_text  = _extract_text(file_bytes)
-    if not raw_text.strip():
-        raise HTTPException(status_code=422, detail="Could not extract text from PDF (image-only PDF?).")
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+ 
 
-    chunks     = _chunk_text(raw_text)
-    if not chunks:
-        raise HTTPException(status_code=422, detail="No recognizable section headings found in the PDF.")
 
-    embeddings = await _embed([c["content"] for c in chunks])
-    count      = _upsert_chunks(chunks, embeddings)
+@router.post(
+    "/upload-pdf",
+    response_model=PdfIngestJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a PDF for indexing into Pinecone",
+)
+async def upload_pdf(file: UploadFile = File(...)):
+    """
+    Accepts a PDF file and queues it for background ingestion: page ranges are
+    extracted in parallel, chunked by section headings, embedded and upserted
+    into Pinecone in batches. Poll GET /upload-pdf/{job_id} for progress.
+    """
+    return await create_ingest_job(file)
 
-    return JSONResponse({
-        "message": f"Successfully indexed {count} chunks from '{file.filename}'.",
-        "chunks_indexed": count,
-        "chunk_titles": [c["title"] for c in chunks],
-    })
 
+@router.get("/upload-pdf/{job_id}", response_model=PdfIngestJob, summary="PDF ingestion progress")
+async def upload_pdf_status(job_id: str):
+    return await get_ingest_job(job_id)
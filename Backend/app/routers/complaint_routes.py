@@ -1,12 +1,14 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, status, Form, UploadFile, File
 from typing import List
-from app.dependencies.db_dependency import get_async_db
+from app.dependencies.db_dependency import get_async_db, get_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.complaint_schema import ComplaintCreateData
-from app.dependencies.rate_limiter import limiter
-from app.services.complaint_services import submit_complaint, get_my_complaints, get_all_complaints, get_complaint_by_id, user_complaints_statistics, get_weekly_stats, get_monthly_stats, get_yearly_stats, get_geometric_location_details
+from app.dependencies.rate_limiter import COMPLAINT_SUBMIT_COST, OPENAI_BUDGET, OPENAI_SCOPE, limiter
+from app.services.complaint_services import submit_complaint, get_my_complaints, get_all_complaints, get_complaints_page, get_complaint_by_id, user_complaints_statistics, get_weekly_stats, get_monthly_stats, get_yearly_stats, get_geometric_location_details
 from app.dependencies.auth_dependency import get_current_user
+from app.dependencies.pagination_dependency import get_keyset_pagination, get_listing_filters
+from app.utils.query_optimization import KeysetPagination, ListingFilters
 from app.services.attachment_services import upload_attachments
 from app.models.user import User
 from fastapi.requests import Request
@@ -19,9 +21,20 @@ async def list_all_complaints(request: Request, db: AsyncSession = Depends(get_a
     
     return await get_all_complaints(db, barangay_id=current_user.barangay_account.barangay_id)
 
+@router.get("/paginated", status_code=status.HTTP_200_OK)
+@limiter.limit("50/minute")
+async def list_complaints_paginated(
+    request: Request,
+    pagination: KeysetPagination = Depends(get_keyset_pagination),
+    filters: ListingFilters = Depends(get_listing_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await get_complaints_page(db, pagination, filters, barangay_id=current_user.barangay_account.barangay_id)
+
 @router.get("/weekly", status_code=status.HTTP_200_OK)
 @limiter.limit("50/minute")
-async def weekly_complaint_stats(request: Request, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def weekly_complaint_stats(request: Request, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return await get_weekly_stats(current_user.barangay_account.barangay_id, db)
 
 
@@ -33,12 +46,12 @@ async def get_location_details(request: Request, latitude: float, longitude: flo
 
 @router.get("/monthly/{year}/{month}", status_code=status.HTTP_200_OK)
 @limiter.limit("50/minute")
-async def monthly_complaint_stats(request: Request, year: int, month: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def monthly_complaint_stats(request: Request, year: int, month: int, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return await get_monthly_stats(current_user.barangay_account.barangay_id, year, month, db)
 
 @router.get("/yearly/{year}", status_code=status.HTTP_200_OK)
 @limiter.limit("50/minute")
-async def yearly_complaint_stats(request: Request, year: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def yearly_complaint_stats(request: Request, year: int, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return await get_yearly_stats(current_user.barangay_account.barangay_id, year, db)
 
 @router.get("/my-complaints", status_code=status.HTTP_200_OK)
@@ -58,6 +71,7 @@ async def get_complaint(request: Request, complaint_id: int, db: AsyncSession =
     
 @router.post("/submit-complaint", status_code=status.HTTP_201_CREATED)
 @limiter.limit("10/minute")
+@limiter.limit(OPENAI_BUDGET, cost=COMPLAINT_SUBMIT_COST, scope=OPENAI_SCOPE)
 async def create_complaint(request: Request, data: str = Form(...), attachments: List[UploadFile] = File(default=[]), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     complaint_data = ComplaintCreateData.parse_raw(data)
     complaint = await submit_complaint(complaint_data, current_user.id, db)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.auth_dependency import get_current_user
-from app.dependencies.db_dependency import get_async_db
+from app.dependencies.db_dependency import get_async_db, get_read_db
 from app.services.department_services import get_all_departments, get_department_forwarded_incidents, forwarded_dept_incident_by_barangay, weekly_forwarded_incidents_stats
 from app.schemas.department_schema import DepartmentWithUserData
 from app.schemas.incident_schema import IncidentData
@@ -18,7 +18,7 @@ async def get_departments(db: AsyncSession = Depends(get_async_db), current_user
 @router.get("/forwarded-incidents", status_code=status.HTTP_200_OK)
 async def get_forwarded_incidents_for_department(
     current_user: DepartmentWithUserData = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[IncidentData]:
     return await get_department_forwarded_incidents(current_user.department_account.id, db)
   
@@ -26,13 +26,13 @@ async def get_forwarded_incidents_for_department(
 async def get_forwarded_incidents_for_barangay(
     barangay_id: int,
     current_user: DepartmentWithUserData = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[IncidentData]:
     return await forwarded_dept_incident_by_barangay(current_user.department_account.id, barangay_id, db)
   
 @router.get("/weekly-stats", status_code=status.HTTP_200_OK)
 async def get_weekly_forwarded_incidents_stats(
     current_user: DepartmentWithUserData = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     return await weekly_forwarded_incidents_stats(current_user.department_account.id, db)
\ No newline at end of file
@@ -4,14 +4,16 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Form, Up
 from datetime import datetime
 from app.dependencies.rate_limiter import limiter
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services.incidents_services import get_incidents_by_barangay, get_incident_by_id, mark_incident_as_viewed, get_all_incidents
+from app.services.incidents_services import get_incidents_by_barangay, get_incident_by_id, mark_incident_as_viewed, get_all_incidents, get_incidents_page_by_barangay, get_archived_incidents_page
 from app.dependencies.auth_dependency import get_current_user
+from app.dependencies.pagination_dependency import get_keyset_pagination, get_listing_filters
+from app.utils.query_optimization import KeysetPagination, ListingFilters
 from app.services.complaint_services import get_complaints_by_incident, notify_user_for_hearing
 from app.services.incidents_services import forward_incident_to_lgu
 from app.services.complaint_actions_services import resolve_complaints_by_incident, review_complaints_by_incident, reject_complaints_by_incident, reject_incident
 from app.services.lgu_services import assign_incident_to_department
 from app.services.department_services import get_incidents_forwarded_to_department
-from app.dependencies.db_dependency import get_async_db
+from app.dependencies.db_dependency import get_async_db, get_read_db
 from app.constants.roles import UserRole
 from app.schemas.response_schema import ResponseCreateSchema, RejectComplaintSchema
 from app.models.user import User
@@ -66,13 +68,39 @@ async def get_incidents(db: AsyncSession = Depends(get_async_db), current_user:
 @router.get("/all/", status_code=status.HTTP_200_OK)
 @router.get("/archive", status_code=status.HTTP_200_OK)
 @router.get("/archive/", status_code=status.HTTP_200_OK)
-async def get_all_incidents_endpoint(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def get_all_incidents_endpoint(db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     if current_user.role not in [UserRole.BARANGAY_OFFICIAL, UserRole.LGU_OFFICIAL, UserRole.DEPARTMENT_STAFF]:
         logger.warning(f"Unauthorized access attempt by user ID: {current_user.id} with role: {current_user.role}")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this resource.")
 
     return await get_all_incidents(current_user, db)
 
+@router.get("/archive/paginated", status_code=status.HTTP_200_OK)
+async def get_archived_incidents_paginated(
+    pagination: KeysetPagination = Depends(get_keyset_pagination),
+    filters: ListingFilters = Depends(get_listing_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.BARANGAY_OFFICIAL, UserRole.LGU_OFFICIAL, UserRole.DEPARTMENT_STAFF]:
+        logger.warning(f"Unauthorized access attempt by user ID: {current_user.id} with role: {current_user.role}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this resource.")
+
+    return await get_archived_incidents_page(current_user, pagination, filters, db)
+
+@router.get("/barangay/paginated", status_code=status.HTTP_200_OK)
+async def get_barangay_incidents_paginated(
+    pagination: KeysetPagination = Depends(get_keyset_pagination),
+    filters: ListingFilters = Depends(get_listing_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != UserRole.BARANGAY_OFFICIAL:
+        logger.warning(f"Unauthorized access attempt by user ID: {current_user.id} with role: {current_user.role}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this resource.")
+
+    return await get_incidents_page_by_barangay(current_user.barangay_account.barangay_id, pagination, filters, db)
+
 @router.get("/department", status_code=status.HTTP_200_OK)
 async def get_department_incidents(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     
@@ -2,28 +2,28 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.lgu_services import get_forwarded_incidents_by_barangay, get_all_forwarded_incidents, weekly_forwarded_incidents_stats, complaint_counts_by_barangay_category
 from app.dependencies.auth_dependency import get_current_user
-from app.dependencies.db_dependency import get_async_db
+from app.dependencies.db_dependency import get_read_db
 from app.models.user import User
 
 router = APIRouter()
 
 
 @router.get("/forwarded-incidents", status_code=status.HTTP_200_OK)
-async def get_all_forwarded_incidents_route(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def get_all_forwarded_incidents_route(db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     
     return await get_all_forwarded_incidents(db)
 
 @router.get("/forwarded-incidents/{barangay_id}", status_code=status.HTTP_200_OK)
-async def get_forwarded_incidents_route(barangay_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def get_forwarded_incidents_route(barangay_id: int, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     
     return await get_forwarded_incidents_by_barangay(barangay_id, db)
 
 @router.get("/stats/weekly-forwarded-incidents", status_code=status.HTTP_200_OK)
-async def weekly_forwarded_incidents_stats_route(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def weekly_forwarded_incidents_stats_route(db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     
     return await weekly_forwarded_incidents_stats(db)
 
 
 @router.get("/stats/complaints-by-barangay-category", status_code=status.HTTP_200_OK)
-async def complaints_by_barangay_category_stats_route(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+async def complaints_by_barangay_category_stats_route(db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return await complaint_counts_by_barangay_category(db)
\ No newline at end of file
@@ -0,0 +1,45 @@
+import os
+from fastapi import APIRouter, Depends
+from app.core.auth_cache import auth_cache
+from app.core.config import settings
+from app.core.redis import ping_redis, redis_pool_stats
+from app.core.security import get_password_hasher
+from app.database.pool_metrics import get_pool_metrics
+from app.database.read_replica import replica_status
+from app.dependencies.auth_dependency import get_current_superadmin
+from app.domain.infrastracture.service.chatbot_service import get_hybrid_rag_repository
+from app.services.sse_manager import sse_manager
+
+# Per-process internals (hostnames, pids, pool sizes), so superadmins only
+router = APIRouter(dependencies=[Depends(get_current_superadmin)])
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    metrics = get_pool_metrics()
+    if metrics is None:
+        return {"status": "engine not initialized", "replicas": replica_status()}
+    return {**metrics.snapshot(), "replicas": replica_status()}
+
+@router.get("/redis")
+async def redis_metrics():
+    await ping_redis()
+    return {"pid": os.getpid(), **redis_pool_stats()}
+
+@router.get("/password-hashing")
+async def password_hashing_metrics():
+    return {"pid": os.getpid(), **get_password_hasher().stats()}
+
+@router.get("/auth")
+async def auth_metrics():
+    return {"pid": os.getpid(), **auth_cache.stats()}
+
+@router.get("/sse")
+async def sse_metrics():
+    return {"pid": os.getpid(), **sse_manager.stats()}
+
+@router.get("/rag-retrieval")
+async def rag_retrieval_metrics():
+    if not settings.RAG_HYBRID_RETRIEVAL:
+        return {"pid": os.getpid(), "status": "disabled"}
+    return {"pid": os.getpid(), **get_hybrid_rag_repository().stats()}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from  app.services.sse_manager import sse_manager
-from app.dependencies.auth_dependency import get_current_user
-from app.services.notification_services import get_user_notifications, mark_notification_as_read, mark_all_notifications_as_read
+from app.dependencies.auth_dependency import get_current_user, get_current_user_for_stream
+from app.services.notification_services import get_user_notifications, get_notifications_page, get_unread_count, mark_notification_as_read, mark_all_notifications_as_read
+from app.dependencies.pagination_dependency import get_keyset_pagination
+from app.utils.query_optimization import KeysetPagination
 from app.models.user import User
 from app.dependencies.db_dependency import get_async_db
 from fastapi import APIRouter, Depends, status
@@ -19,6 +22,18 @@ router = APIRouter()
 async def get_notifications(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return await get_user_notifications(current_user.id, db)
 
+@router.get("/paginated", status_code=status.HTTP_200_OK)
+async def get_notifications_paginated(
+    pagination: KeysetPagination = Depends(get_keyset_pagination),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await get_notifications_page(current_user.id, pagination, db)
+
+@router.get("/unread-count", status_code=status.HTTP_200_OK)
+async def get_notifications_unread_count(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await get_unread_count(current_user.id, db)
+
 @router.post("/{notification_id}/read", status_code=status.HTTP_200_OK)
 async def mark_as_read(notification_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return await mark_notification_as_read(notification_id, current_user.id, db)
@@ -28,5 +43,8 @@ async def mark_all_as_read(current_user: User = Depends(get_current_user), db: A
     return await mark_all_notifications_as_read(current_user.id, db)
 
 @router.get("/stream")
-async def notifications_stream(current_user: User = Depends(get_current_user), db = Depends(get_async_db)):
-   return await sse_manager.stream(current_user.id)
\ No newline at end of file
+async def notifications_stream(
+    current_user: User = Depends(get_current_user_for_stream),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+   return await sse_manager.stream(current_user.id, last_event_id)
\ No newline at end of file
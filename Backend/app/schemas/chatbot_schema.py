@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -10,3 +11,20 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     answer: str
     is_grounded: bool
+
+
+class PdfIngestJob(BaseModel):
+    job_id: str
+    filename: str
+    status: str  # queued | extracting | indexing | completed | failed
+    pages_total: int
+    pages_extracted: int
+    chunks_total: int
+    chunks_unchanged: int = 0
+    chunks_embedded: int
+    chunks_indexed: int
+    chunks_deleted: int = 0
+    chunk_titles: List[str]
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
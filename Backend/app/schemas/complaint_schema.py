@@ -95,4 +95,9 @@ class ComplaintWithUserData(ComplaintBaseModel):
     incident_links: Optional[List[IncidentLinkData]] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ComplaintPage(BaseModel):
+    items: List[ComplaintWithUserData]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -45,3 +45,9 @@ class IncidentData(IncidentBaseModel):
     responses: Optional[List[ResponseSchema]] = None
     class Config:
         from_attributes = True
+
+
+class IncidentPage(BaseModel):
+    items: List[IncidentData]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 from datetime import datetime
@@ -26,4 +26,14 @@ class NotificationData(BaseModel):
     is_read: bool
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationData]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+class UnreadCount(BaseModel):
+    unread: int
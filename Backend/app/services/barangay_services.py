@@ -5,7 +5,7 @@ from app.models.incident_model import IncidentModel
 from app.models.incident_complaint import IncidentComplaintModel
 from app.schemas.response_schema import ResponseCreateSchema
 from app.utils.cache_invalidator_optimized import invalidate_cache
-from app.tasks.notification_tasks import send_notifications_task
+from app.tasks.notification_tasks import send_bulk_notifications_task
 from app.tasks.response_tasks import save_response_task
 from fastapi.responses import JSONResponse
 from app.models.barangay import Barangay
@@ -18,6 +18,8 @@ from sqlalchemy import select, func, update
 from sqlalchemy.orm import selectinload
 from app.utils.caching import set_cache, get_cache
 from app.utils.logger import logger
+from app.utils.query_optimization import DailyRollupHelper
+from app.services.complaint_services import log_status_change
 import asyncio
 from typing import List, Optional, Dict
 from datetime import datetime, timezone
@@ -254,6 +256,9 @@ async def assign_incident_to_department(response_data: ResponseCreateSchema, inc
         if not complaint_ids:
             return {"message": "No complaints found for this incident"}
         
+        await DailyRollupHelper.apply_transition(
+            db, complaint_ids, ComplaintStatus.FORWARDED_TO_DEPARTMENT.value, department_account_id=department_account_id
+        )
         await db.execute(
             update(Complaint)
             .where(Complaint.id.in_(complaint_ids))
@@ -264,20 +269,30 @@ async def assign_incident_to_department(response_data: ResponseCreateSchema, inc
             .where(IncidentModel.id == incident_id)
             .values(department_account_id=department_account_id)
         )
+        # The nightly rollup rebuild counts the forwarded milestone from these logs
+        await log_status_change(
+            complaint_ids=complaint_ids,
+            new_status=ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
+            changed_by_user_id=responder_id,
+            db=db,
+            commit=False,
+        )
         await db.commit()
         
         complaints_result = await db.execute(select(Complaint).where(Complaint.id.in_(complaint_ids)))
         complaints = complaints_result.scalars().all()
 
-        for complaint in complaints:
-            send_notifications_task.delay(
-                user_id=complaint.user_id,
-                incident_id=incident_id,
-                title="Complaint Forwarded to Department",
-                message="Your complaint has been forwarded to the department for further processing.",
-                complaint_id=complaint.id,
-                notification_type="update"
-            )
+        notifications = [
+            {
+                "user_id": complaint.user_id,
+                "incident_id": incident_id,
+                "title": "Complaint Forwarded to Department",
+                "message": "Your complaint has been forwarded to the department for further processing.",
+                "complaint_id": complaint.id,
+                "notification_type": "update",
+            }
+            for complaint in complaints
+        ]
                 
         save_response_task.delay(
             incident_id=incident_id,
@@ -292,14 +307,16 @@ async def assign_incident_to_department(response_data: ResponseCreateSchema, inc
         )
         incident = result.scalars().first()
         if incident and incident.department_account and incident.department_account.user:
-            send_notifications_task.delay(
-                user_id=incident.department_account.user.id,
-                title="New Incident Assigned",
-                message=f"A new incident with ID {incident.id} has been forwarded to your department.",
-                incident_id=incident_id,
-                complaint_id=None,
-                notification_type="update"
-            )
+            notifications.append({
+                "user_id": incident.department_account.user.id,
+                "title": "New Incident Assigned",
+                "message": f"A new incident with ID {incident.id} has been forwarded to your department.",
+                "incident_id": incident_id,
+                "complaint_id": None,
+                "notification_type": "update",
+            })
+        # One task for every recipient instead of one per complaint
+        send_bulk_notifications_task.delay(notifications=notifications)
             
         await invalidate_cache(
             complaint_ids=complaint_ids,
@@ -7,25 +7,158 @@ from app.schemas.response_schema import ResponseCreateSchema, RejectComplaintSch
 from app.models.rejection_categories import RejectionCategory as RejectionCategoryModel
 from app.models.incident_model import IncidentModel
 from app.models.complaint import Complaint
+from app.models.complaint_logs import ComplaintLogs
 from app.models.incident_complaint import IncidentComplaintModel
 from app.models.barangay_account import BarangayAccount
+from app.models.notification import Notification
 from app.models.user import User
 from app.constants.complaint_status import ComplaintStatus
 from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
 from app.utils.cache_invalidator_optimized import invalidate_cache
-from app.tasks.notification_tasks import send_notifications_task, send_push_notification_task
+from app.tasks.notification_tasks import fan_out_notifications_task
 from app.models.response import Response
 from app.services.attachment_services import enqueue_response_attachments
-from app.services.complaint_services import log_status_change
+from app.utils.outbox import enqueue_task
 from fastapi.responses import JSONResponse
 from app.utils.logger import logger
 from app.constants.roles import UserRole
 from datetime import datetime, timezone
-from app.utils.query_optimization import BatchLoader,RejectCounterHelper, AccountSuspensionHelper, RestrictSubmissionHelper
+from app.utils.query_optimization import BatchLoader,RejectCounterHelper, AccountSuspensionHelper, RestrictSubmissionHelper, DailyRollupHelper
 from app.constants.reject_category import RejectionCategory as RejectionCategoryEnum
 
+
+def _notification(user_id: int, title: str, message: str, incident_id: int, complaint_id: int = None, notification_type: str = "info", event: str = None) -> dict:
+    return {
+        "user_id": user_id,
+        "title": title,
+        "message": message,
+        "incident_id": incident_id,
+        "complaint_id": complaint_id,
+        "notification_type": notification_type,
+        "event": event,
+    }
+
+
+def _push(user: User, title: str, body: str, data: dict) -> Optional[dict]:
+    # Disabled or token-less users would be skipped by the push sender anyway
+    if not user.push_notifications_enabled or not user.push_token:
+        return None
+    return {"token": user.push_token, "enabled": True, "title": title, "body": body, "data": data}
+
+
+async def _commit_incident_action(
+    db: AsyncSession,
+    incident_id: int,
+    complaint_ids: List[int],
+    actor_id: int,
+    new_status: str,
+    actions_taken: Optional[str],
+    notifications: List[dict],
+    pushes: List[Optional[dict]],
+    complaint_values: Optional[dict] = None,
+) -> Response:
+    """Apply an incident-wide action in a single transaction, then fan out once.
+
+    The status update, status logs, response row and notification rows are
+    flushed together and committed once (along with anything the caller staged
+    on the session beforehand). Delivery of every notification and push is
+    recorded as one outbox event for fan_out_notifications_task, so the number
+    of commits and broker messages does not grow with the incident's
+    complaint count.
+    """
+    now = datetime.now(timezone.utc)
+
+    await DailyRollupHelper.apply_transition(db, complaint_ids, new_status)
+    await db.execute(
+        update(Complaint)
+        .where(Complaint.id.in_(complaint_ids))
+        .values(status=new_status, **(complaint_values or {}))
+    )
+
+    db.add_all([
+        ComplaintLogs(complaint_id=complaint_id, new_status=new_status, updated_by=actor_id, timestamp=now)
+        for complaint_id in complaint_ids
+    ])
+
+    response = Response(
+        incident_id=incident_id,
+        responder_id=actor_id,
+        actions_taken=actions_taken,
+        response_date=now,
+    )
+    db.add(response)
+
+    notifications = [notification for notification in notifications if notification["user_id"]]
+    db.add_all([
+        Notification(
+            user_id=notification["user_id"],
+            complaint_id=notification["complaint_id"],
+            incident_id=notification["incident_id"],
+            title=notification["title"],
+            message=notification["message"],
+            notification_type=notification["notification_type"],
+            channel="sse",
+            is_read=False,
+            sent_at=now,
+        )
+        for notification in notifications
+    ])
+
+    pushes = [push for push in pushes if push]
+    if notifications or pushes:
+        sent_at = now.isoformat()
+        await enqueue_task(db, fan_out_notifications_task, {
+            "notifications": [{**notification, "sent_at": sent_at} for notification in notifications],
+            "pushes": pushes,
+        })
+
+    await db.commit()
+    logger.info(f"Incident {incident_id}: {len(complaint_ids)} complaints moved to '{new_status}' by user ID: {actor_id}")
+
+    return response
+
+
+async def _stage_rejection(rejector: User, complaints: List[Complaint], incident_id: int, notification_type: str, lgu_status: str, barangay_values: dict, db: AsyncSession):
+    """Pick the status a rejection moves complaints to, plus the notice for the official who gets them back."""
+    if rejector.role == UserRole.LGU_OFFICIAL:
+        first = complaints[0] if complaints else None
+        notifications = [_notification(
+            user_id=first.barangay_account.user_id if first and first.barangay_account and first.barangay_account.user_id else None,
+            title="The LGU has rejected the complaints under this incident",
+            message=f"The LGU has rejected the complaints under the incident you forwarded '{first.title if first else 'N/A'}'.",
+            incident_id=incident_id,
+            complaint_id=first.id if first else None,
+            notification_type=notification_type,
+            event="reject",
+        )]
+        return lgu_status, {"is_rejected_by_lgu": True}, notifications
+
+    if rejector.role == UserRole.DEPARTMENT_STAFF:
+        lgu = await db.execute(
+            select(User).where(User.role == UserRole.LGU_OFFICIAL)
+            )
+        lgu = lgu.scalars().first()
+        logger.info(f"LGU user found for notification: {lgu.id if lgu else 'No LGU user found'}")
+        notifications = [_notification(
+            user_id=lgu.id if lgu else None,
+            title="The department has rejected the complaints under this incident",
+            message=f"The department has rejected the complaints under the incident '{complaints[0].title if complaints else 'N/A'}' and forwarded it back to the LGU.",
+            incident_id=incident_id,
+            complaint_id=complaints[0].id if complaints else None,
+            notification_type=notification_type,
+            event="reject",
+        )]
+        return (
+            ComplaintStatus.FORWARDED_TO_LGU.value,
+            {"is_rejected_by_department": True, "forwarded_at": datetime.now(timezone.utc)},
+            notifications,
+        )
+
+    return ComplaintStatus.REJECTED.value, barangay_values, []
+
+
 async def review_complaints_by_incident(response_data: ResponseCreateSchema, incident_id: int, responder_id: int, attachments: Optional[List[UploadFile]], db: AsyncSession):
     try:
         result = await db.execute(
@@ -52,64 +185,46 @@ async def review_complaints_by_incident(response_data: ResponseCreateSchema, inc
                     detail="This incident is already under review"
                 )
 
-        await db.execute(
-            update(Complaint)
-            .where(Complaint.id.in_(complaint_ids))
-            .values(status=ComplaintStatus.REVIEWED_BY_BARANGAY.value if reviewer.role == UserRole.BARANGAY_OFFICIAL else ComplaintStatus.REVIEWED_BY_DEPARTMENT.value if reviewer.role == UserRole.DEPARTMENT_STAFF else ComplaintStatus.REVIEWED_BY_LGU.value)
-        )
-        
-        await log_status_change(
-            complaint_ids=complaint_ids,
-            new_status=ComplaintStatus.REVIEWED_BY_BARANGAY.value if reviewer.role == UserRole.BARANGAY_OFFICIAL else ComplaintStatus.REVIEWED_BY_DEPARTMENT.value if reviewer.role == UserRole.DEPARTMENT_STAFF else ComplaintStatus.REVIEWED_BY_LGU.value,
-            changed_by_user_id=responder_id,
-            db=db
-        )
-
-        await db.commit()
-        
-        response = Response(
-            incident_id=incident_id,
-            responder_id=responder_id,
-            actions_taken=response_data.actions_taken,
-            response_date=datetime.now(timezone.utc),
-        )
-        db.add(response)
-        await db.commit()
-        await db.refresh(response)
-
-        if attachments:
-            await enqueue_response_attachments(attachments, response.id, responder_id)
+        new_status = ComplaintStatus.REVIEWED_BY_BARANGAY.value if reviewer.role == UserRole.BARANGAY_OFFICIAL else ComplaintStatus.REVIEWED_BY_DEPARTMENT.value if reviewer.role == UserRole.DEPARTMENT_STAFF else ComplaintStatus.REVIEWED_BY_LGU.value
 
-        first_complaint = complaints[0] if complaints else None
-        barangay_id = first_complaint.barangay_id if first_complaint else None
-        department_account_id = first_complaint.department_account_id if first_complaint else None
-        
         # Batch load all users to avoid N+1 queries
         user_ids = [c.user_id for c in complaints]
         users_dict = await BatchLoader.fetch_users_by_ids(db, user_ids)
-        
+
+        notifications, pushes = [], []
         for complaint in complaints:
             complaint_user = users_dict.get(complaint.user_id)
             if complaint_user:
-                send_notifications_task.delay(
+                notifications.append(_notification(
                     user_id=complaint.user_id,
                     title=complaint.title,
                     incident_id=incident_id,
                     message=f"Your complaint about '{complaint.title}' is now under review",
                     complaint_id=complaint.id,
                     notification_type="complaint_under_review"
-                )
-                send_push_notification_task.delay(
-                    token=complaint_user.push_token,
-                    enabled=complaint_user.push_notifications_enabled,
+                ))
+                pushes.append(_push(
+                    complaint_user,
                     title=complaint.title,
                     body=f"Your complaint about '{complaint.title}' is now under review",
                     data={"complaint_id": complaint.id, "notification_type": "complaint_under_review"},
-                )
+                ))
+
+        first_complaint = complaints[0] if complaints else None
+        barangay_id = first_complaint.barangay_id if first_complaint else None
+        department_account_id = first_complaint.department_account_id if first_complaint else None
+
+        response = await _commit_incident_action(
+            db, incident_id, complaint_ids, responder_id, new_status,
+            response_data.actions_taken, notifications, pushes,
+        )
+
+        if attachments:
+            await enqueue_response_attachments(attachments, response.id, responder_id)
                 
         await invalidate_cache(
             complaint_ids=complaint_ids,
-            user_ids=[complaint.user_id for complaint in complaints],
+            user_ids=user_ids,
             barangay_id=barangay_id,
             incident_ids=[incident_id],
             department_account_id=department_account_id,
@@ -161,65 +276,47 @@ async def resolve_complaints_by_incident(response_data: ResponseCreateSchema, in
             .values(resolver_id=responder_id)
         )
 
-        await db.execute(
-            update(Complaint)
-            .where(Complaint.id.in_(complaint_ids))
-            .values(status=ComplaintStatus.RESOLVED_BY_BARANGAY.value if resolver.role == UserRole.BARANGAY_OFFICIAL else ComplaintStatus.RESOLVED_BY_DEPARTMENT.value if resolver.role == UserRole.DEPARTMENT_STAFF else ComplaintStatus.RESOLVED_BY_LGU.value, resolved_at=datetime.now(timezone.utc))
-        )
-        
-        await log_status_change(
-            complaint_ids=complaint_ids,
-            new_status=ComplaintStatus.RESOLVED_BY_BARANGAY.value if resolver.role == UserRole.BARANGAY_OFFICIAL else ComplaintStatus.RESOLVED_BY_DEPARTMENT.value if resolver.role == UserRole.DEPARTMENT_STAFF else ComplaintStatus.RESOLVED_BY_LGU.value,
-            changed_by_user_id=responder_id,
-            db=db
-        )
-            
-        await db.commit()
-    
-        response = Response(
-            incident_id=incident_id,
-            responder_id=responder_id,
-            actions_taken=response_data.actions_taken,
-            response_date=datetime.now(timezone.utc),
-        )
-        db.add(response)
-        await db.commit()
-        await db.refresh(response)
-
-        if attachments:
-            await enqueue_response_attachments(attachments, response.id, responder_id)
+        new_status = ComplaintStatus.RESOLVED_BY_BARANGAY.value if resolver.role == UserRole.BARANGAY_OFFICIAL else ComplaintStatus.RESOLVED_BY_DEPARTMENT.value if resolver.role == UserRole.DEPARTMENT_STAFF else ComplaintStatus.RESOLVED_BY_LGU.value
 
-        first_complaint = complaints[0] if complaints else None
-        barangay_id = first_complaint.barangay_id if first_complaint else None
-        department_account_id = first_complaint.department_account_id if first_complaint else None
-        
         # Batch load all users to avoid N+1 queries
         user_ids = [c.user_id for c in complaints]
         users_dict = await BatchLoader.fetch_users_by_ids(db, user_ids)
-        
+
+        notifications, pushes = [], []
         for complaint in complaints:
             complaint_user = users_dict.get(complaint.user_id)
             if complaint_user:
-                send_notifications_task.delay(
+                notifications.append(_notification(
                     user_id=complaint.user_id,
                     title=complaint.title,
                     incident_id=incident_id,
                     message=f"Your complaint '{complaint.title}' has been resolved",
                     complaint_id=complaint.id,
                     notification_type="success"
-                )
-                send_push_notification_task.delay(
-                    token=complaint_user.push_token,
-                    enabled=complaint_user.push_notifications_enabled,
+                ))
+                pushes.append(_push(
+                    complaint_user,
                     title="Complaint Resolved",
                     body=f"Your complaint regarding on '{complaint.title}' has been resolved.",
                     data={"complaint_id": complaint.id}
-                )
+                ))
 
+        first_complaint = complaints[0] if complaints else None
+        barangay_id = first_complaint.barangay_id if first_complaint else None
+        department_account_id = first_complaint.department_account_id if first_complaint else None
+
+        response = await _commit_incident_action(
+            db, incident_id, complaint_ids, responder_id, new_status,
+            response_data.actions_taken, notifications, pushes,
+            complaint_values={"resolved_at": datetime.now(timezone.utc)},
+        )
+
+        if attachments:
+            await enqueue_response_attachments(attachments, response.id, responder_id)
                 
         await invalidate_cache(
             complaint_ids=complaint_ids,
-            user_ids=[complaint.user_id for complaint in complaints],
+            user_ids=user_ids,
             barangay_id=barangay_id,
             incident_ids=[incident_id],
             department_account_id=department_account_id,
@@ -293,83 +390,13 @@ async def reject_complaints_by_incident(incident_id: int, rejector_id: int, resp
                 if complaint.is_rejected_by_department:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This incident has already been rejected by the department")
 
-        if rejector.role == UserRole.LGU_OFFICIAL:
-            await db.execute(
-                update(Complaint)
-                .where(Complaint.id.in_(complaint_ids))
-                .values(is_rejected_by_lgu=True, status=ComplaintStatus.SUBMITTED.value)
-            )
-            await log_status_change(
-                complaint_ids=complaint_ids,
-                new_status=ComplaintStatus.SUBMITTED.value,
-                changed_by_user_id=rejector_id,
-                db=db
-            )
-            send_notifications_task.delay(
-                user_id=complaints[0].barangay_account.user_id if complaints and complaints[0].barangay_account and complaints[0].barangay_account.user_id else None,
-                title="The LGU has rejected the complaints under this incident",
-                message=f"The LGU has rejected the complaints under the incident you forwarded '{complaints[0].title if complaints else 'N/A'}'.",
-                incident_id=incident_id,
-                complaint_id=complaints[0].id if complaints else None,
-                notification_type=notification_type,
-                event="reject"
-            )
-        elif rejector.role == UserRole.DEPARTMENT_STAFF:
-            await db.execute(
-                update(Complaint)
-                .where(Complaint.id.in_(complaint_ids))
-                .values(
-                    is_rejected_by_department=True,
-                    status=ComplaintStatus.FORWARDED_TO_LGU.value,
-                    forwarded_at=datetime.now(timezone.utc)
-                )
-            )
-            await log_status_change(
-                complaint_ids=complaint_ids,
-                new_status=ComplaintStatus.FORWARDED_TO_LGU.value,
-                changed_by_user_id=rejector_id,
-                db=db
-            )
-            lgu = await db.execute(
-                select(User).where(User.role == UserRole.LGU_OFFICIAL)
-                )
-            lgu = lgu.scalars().first()
-            logger.info(f"LGU user found for notification: {lgu.id if lgu else 'No LGU user found'}")
-            send_notifications_task.delay(
-                user_id=lgu.id if lgu else None,
-                title="The department has rejected the complaints under this incident",
-                message=f"The department has rejected the complaints under the incident '{complaints[0].title if complaints else 'N/A'}' and forwarded it back to the LGU.",
-                incident_id=incident_id,
-                complaint_id=complaints[0].id if complaints else None,
-                notification_type=notification_type,
-                event="reject"
-            )
-            
-        else:
-            await db.execute(
-                update(Complaint)
-                .where(Complaint.id.in_(complaint_ids))
-                .values(status=ComplaintStatus.REJECTED.value, rejection_category_id=response_data.rejection_category_id)
-            )
-            await log_status_change(
-                complaint_ids=complaint_ids,
-                new_status=ComplaintStatus.REJECTED.value,
-                changed_by_user_id=rejector_id,
-                db=db
-            )
-        
-        response = Response(
-            incident_id=incident_id,
-            responder_id=rejector_id,
-            actions_taken=response_data.actions_taken,
-            response_date=datetime.now(timezone.utc),
+        new_status, complaint_values, notifications = await _stage_rejection(
+            rejector, complaints, incident_id, notification_type,
+            lgu_status=ComplaintStatus.SUBMITTED.value,
+            barangay_values={"rejection_category_id": response_data.rejection_category_id},
+            db=db,
         )
-        db.add(response)
-        await db.commit()
-        await db.refresh(response)
-
-        if attachments:
-            await enqueue_response_attachments(attachments, response.id, rejector_id)
+        pushes = []
         
         first_complaint = complaint_snapshots[0] if complaint_snapshots else None
         barangay_id = first_complaint["barangay_id"] if first_complaint else None
@@ -378,12 +405,12 @@ async def reject_complaints_by_incident(incident_id: int, rejector_id: int, resp
         # Batch load all users to avoid N+1 queries
         user_ids = [c["user_id"] for c in complaint_snapshots]
         users_dict = await BatchLoader.fetch_users_by_ids(db, user_ids)
-        complaint_ids = [c["id"] for c in complaint_snapshots]
         user_complaint_counts = Counter(user_ids)
 
+        # Counter and restriction updates are staged on the session and committed with the action
         reject_counters = {}
         if rejection_category.name in [RejectionCategoryEnum.SPAM.value, RejectionCategoryEnum.FALSE_REPORT.value]:
-            await RejectCounterHelper.increment_reject_counter(db, user_ids)
+            await RejectCounterHelper.increment_reject_counter(db, user_ids, commit=False)
             reject_counters = await RejectCounterHelper.get_reject_counters(db, user_ids)
 
         restricted_users = set()
@@ -419,25 +446,24 @@ async def reject_complaints_by_incident(incident_id: int, rejector_id: int, resp
                         message = None
 
                     if message:
-                        send_notifications_task.delay(
+                        notifications.append(_notification(
                             user_id=complaint["user_id"],
                             title=complaint["title"],
                             message=message,
                             complaint_id=complaint["id"],
                             incident_id=incident_id,
                             notification_type=notification_type
-                        )
+                        ))
                         
                     if current_reject_counter >= 3:
                         restricted_users.add(complaint["user_id"])
                         
-                send_push_notification_task.delay(
-                    token=complaint_user.push_token,
-                    enabled=complaint_user.push_notifications_enabled,
+                pushes.append(_push(
+                    complaint_user,
                     title="Complaint Rejected",
                     body=f"Your complaint regarding '{complaint['title']}' has been rejected by the {rejected_by}.",
                     data={"complaint_id": complaint["id"]}
-                )
+                ))
 
         if (
             rejector.role != UserRole.BARANGAY_OFFICIAL
@@ -483,22 +509,31 @@ async def reject_complaints_by_incident(incident_id: int, rejector_id: int, resp
                     message = None
 
                 if message:
-                    send_notifications_task.delay(
+                    notifications.append(_notification(
                         user_id=user_id,
                         title=complaint["title"],
                         message=message,
                         complaint_id=complaint["id"],
                         incident_id=incident_id,
                         notification_type=notification_type,
-                    )
+                    ))
                 notified_users.add(user_id)
 
         if restricted_users:
-            await RestrictSubmissionHelper.restrict_user_submissions(db, list(restricted_users))
+            await RestrictSubmissionHelper.restrict_user_submissions(db, list(restricted_users), commit=False)
+
+        response = await _commit_incident_action(
+            db, incident_id, complaint_ids, rejector_id, new_status,
+            response_data.actions_taken, notifications, pushes,
+            complaint_values=complaint_values,
+        )
+
+        if attachments:
+            await enqueue_response_attachments(attachments, response.id, rejector_id)
 
         await invalidate_cache(
             complaint_ids=complaint_ids,
-            user_ids=[complaint["user_id"] for complaint in complaint_snapshots],
+            user_ids=user_ids,
             barangay_id=barangay_id,
             incident_ids=[incident_id],
             department_account_id=department_account_id,
@@ -579,83 +614,12 @@ async def reject_incident(incident_id: int, rejector_id: int, response_data: Res
                 if complaint.is_rejected_by_department:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This incident has already been rejected by the department")
 
-        if rejector.role == UserRole.LGU_OFFICIAL:
-            await db.execute(
-                update(Complaint)
-                .where(Complaint.id.in_(complaint_ids))
-                .values(is_rejected_by_lgu=True, status=ComplaintStatus.REVIEWED_BY_BARANGAY.value)
-            )
-            await log_status_change(
-                complaint_ids=complaint_ids,
-                new_status=ComplaintStatus.REVIEWED_BY_BARANGAY.value,
-                changed_by_user_id=rejector_id,
-                db=db
-            )
-            send_notifications_task.delay(
-                user_id=complaints[0].barangay_account.user_id if complaints and complaints[0].barangay_account and complaints[0].barangay_account.user_id else None,
-                title="The LGU has rejected the complaints under this incident",
-                message=f"The LGU has rejected the complaints under the incident you forwarded '{complaints[0].title if complaints else 'N/A'}'.",
-                incident_id=incident_id,
-                complaint_id=complaints[0].id if complaints else None,
-                notification_type=notification_type,
-                event="reject"
-            )
-        elif rejector.role == UserRole.DEPARTMENT_STAFF:
-            await db.execute(
-                update(Complaint)
-                .where(Complaint.id.in_(complaint_ids))
-                .values(
-                    is_rejected_by_department=True,
-                    status=ComplaintStatus.FORWARDED_TO_LGU.value,
-                    forwarded_at=datetime.now(timezone.utc)
-                )
-            )
-            await log_status_change(
-                complaint_ids=complaint_ids,
-                new_status=ComplaintStatus.FORWARDED_TO_LGU.value,
-                changed_by_user_id=rejector_id,
-                db=db
-            )
-            lgu = await db.execute(
-                select(User).where(User.role == UserRole.LGU_OFFICIAL)
-                )
-            lgu = lgu.scalars().first()
-            logger.info(f"LGU user found for notification: {lgu.id if lgu else 'No LGU user found'}")
-            send_notifications_task.delay(
-                user_id=lgu.id if lgu else None,
-                title="The department has rejected the complaints under this incident",
-                message=f"The department has rejected the complaints under the incident '{complaints[0].title if complaints else 'N/A'}' and forwarded it back to the LGU.",
-                incident_id=incident_id,
-                complaint_id=complaints[0].id if complaints else None,
-                notification_type=notification_type,
-                event="reject"
-            )
-            
-        else:
-            await db.execute(
-                update(Complaint)
-                .where(Complaint.id.in_(complaint_ids))
-                .values(status=ComplaintStatus.REJECTED.value)
-            )
-            await log_status_change(
-                complaint_ids=complaint_ids,
-                new_status=ComplaintStatus.REJECTED.value,
-                changed_by_user_id=rejector_id,
-                db=db
-            )
-        
-        response = Response(
-            incident_id=incident_id,
-            responder_id=rejector_id,
-            actions_taken=response_data.actions_taken,
-            response_date=datetime.now(timezone.utc),
+        new_status, complaint_values, notifications = await _stage_rejection(
+            rejector, complaints, incident_id, notification_type,
+            lgu_status=ComplaintStatus.REVIEWED_BY_BARANGAY.value,
+            barangay_values={},
+            db=db,
         )
-        db.add(response)
-        await db.commit()
-        await db.refresh(response)
-
-        if attachments:
-            await enqueue_response_attachments(attachments, response.id, rejector_id)
         
         first_complaint = complaint_snapshots[0] if complaint_snapshots else None
         barangay_id = first_complaint["barangay_id"] if first_complaint else None
@@ -664,22 +628,30 @@ async def reject_incident(incident_id: int, rejector_id: int, response_data: Res
         # Batch load all users to avoid N+1 queries
         user_ids = [c["user_id"] for c in complaint_snapshots]
         users_dict = await BatchLoader.fetch_users_by_ids(db, user_ids)
-        complaint_ids = [c["id"] for c in complaint_snapshots]
         
+        pushes = []
         for complaint in complaint_snapshots:
             complaint_user = users_dict.get(complaint["user_id"])
             if complaint_user:
-                send_push_notification_task.delay(
-                    token=complaint_user.push_token,
-                    enabled=complaint_user.push_notifications_enabled,
+                pushes.append(_push(
+                    complaint_user,
                     title="Complaint Rejected",
                     body=f"Your complaint regarding '{complaint['title']}' has been rejected by the {rejected_by}.",
                     data={"complaint_id": complaint["id"]}
-                )
+                ))
+
+        response = await _commit_incident_action(
+            db, incident_id, complaint_ids, rejector_id, new_status,
+            response_data.actions_taken, notifications, pushes,
+            complaint_values=complaint_values,
+        )
+
+        if attachments:
+            await enqueue_response_attachments(attachments, response.id, rejector_id)
 
         await invalidate_cache(
             complaint_ids=complaint_ids,
-            user_ids=[complaint["user_id"] for complaint in complaint_snapshots],
+            user_ids=user_ids,
             barangay_id=barangay_id,
             incident_ids=[incident_id],
             department_account_id=department_account_id,
@@ -706,4 +678,3 @@ async def reject_incident(incident_id: int, rejector_id: int, response_data: Res
         await db.rollback()
         logger.error(f"Error in reject_complaints_by_incident: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
-    
\ No newline at end of file
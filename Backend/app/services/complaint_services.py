@@ -14,20 +14,21 @@ from app.models.complaint import Complaint
 from app.models.incident_complaint import IncidentComplaintModel
 from app.models.barangay_account import BarangayAccount
 from sqlalchemy import select, update, func
-from app.schemas.complaint_schema import ComplaintCreateData, ComplaintWithUserData,MyComplaintData
+from app.schemas.complaint_schema import ComplaintCreateData, ComplaintWithUserData,MyComplaintData, ComplaintPage
 from datetime import datetime
 from app.utils.logger import logger
 from app.constants.complaint_status import ComplaintStatus
 from fastapi.responses import JSONResponse
-from app.utils.caching import set_cache, get_cache
+from app.utils.caching import set_cache, get_cache, get_cache_version, page_cache_key
 from app.domain.application.use_cases.cluster_complaint import ClusterComplaintInput
 from app.domain.repository.incident_repository import IncidentRepository
 from app.tasks.incident_tasks import cluster_complaint_task
 from app.tasks.notification_tasks import send_notifications_task
 from app.tasks.email_tasks import notify_user_for_hearing_task
 from app.utils.reverse_geocoding import reverse_geocode
-from app.utils.query_optimization import QueryOptions, BatchLoader, StatisticsHelper, RestrictSubmissionHelper
+from app.utils.query_optimization import QueryOptions, BatchLoader, StatisticsHelper, RestrictSubmissionHelper, KeysetPagination, ListingFilters, DailyRollupHelper
 from app.utils.cache_invalidator_optimized import CacheInvalidator
+from app.utils.outbox import enqueue_task
 
 
 def _empty_status_counts():
@@ -114,7 +115,53 @@ async def get_all_complaints(db: AsyncSession, barangay_id: int = None):
     except Exception as e:
         logger.exception(f"Error in get_all_complaints: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
-    
+
+
+async def get_complaints_page(db: AsyncSession, pagination: KeysetPagination, filters: ListingFilters, barangay_id: int = None):
+    try:
+        namespace = f"complaints_page:barangay:{barangay_id}" if barangay_id else "complaints_page:all"
+        version = await get_cache_version(namespace)
+        cache_key = page_cache_key(namespace, version, pagination.cache_token(), filters.cache_token())
+        cached = await get_cache(cache_key)
+        if cached is not None:
+            logger.info(f"Cache hit for complaints page (barangay_id: {barangay_id or 'all'})")
+            return ComplaintPage.model_validate(cached)
+
+        query = select(Complaint).options(*QueryOptions.complaint_full())
+
+        if barangay_id is not None:
+            query = query.where(Complaint.barangay_id == barangay_id)
+        if filters.status:
+            query = query.where(Complaint.status == filters.status)
+        if filters.category_id:
+            query = query.where(Complaint.category_id == filters.category_id)
+        if filters.start_date:
+            query = query.where(Complaint.created_at >= filters.start_date)
+        if filters.end_date:
+            query = query.where(Complaint.created_at <= filters.end_date)
+
+        query = pagination.apply_to_query(query, Complaint.created_at, Complaint.id)
+
+        result = await db.execute(query)
+        complaints, next_cursor = pagination.build_page(result.scalars().all(), "created_at")
+
+        page = ComplaintPage(
+            items=[ComplaintWithUserData.model_validate(c, from_attributes=True) for c in complaints],
+            next_cursor=next_cursor,
+            limit=pagination.limit,
+        )
+        logger.info(f"Fetched complaints page: {len(page.items)} complaints (barangay_id: {barangay_id or 'all'})")
+
+        await set_cache(cache_key, page.model_dump(mode="json"), expiration=3600)
+        return page
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.exception(f"Error in get_complaints_page: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
     
 async def get_complaints_by_incident(incident_id: int, db: AsyncSession):
     try:
@@ -150,15 +197,16 @@ async def get_complaints_by_incident(incident_id: int, db: AsyncSession):
     
 async def user_complaints_statistics(user_id: int, db: AsyncSession):
     try:
+        resolved_statuses = [ComplaintStatus.RESOLVED_BY_BARANGAY.value, ComplaintStatus.RESOLVED_BY_DEPARTMENT.value]
         result = await db.execute(
-            select(Complaint)
+            select(
+                func.count(Complaint.id),
+                func.count(Complaint.id).filter(Complaint.status.in_(resolved_statuses)),
+            )
             .where(Complaint.user_id == user_id)
         )
-        complaints = result.scalars().all()
-
-        total_complaints = len(complaints)
-        resolved_complaints = sum(1 for c in complaints if c.status in [ComplaintStatus.RESOLVED_BY_BARANGAY.value, ComplaintStatus.RESOLVED_BY_DEPARTMENT.value])
-        pending_complaints = sum(1 for c in complaints if c.status not in [ComplaintStatus.RESOLVED_BY_BARANGAY.value, ComplaintStatus.RESOLVED_BY_DEPARTMENT.value])
+        total_complaints, resolved_complaints = result.one()
+        pending_complaints = total_complaints - resolved_complaints
 
         return {
             "total_complaints": total_complaints,
@@ -202,21 +250,18 @@ async def get_weekly_stats(barangay_id: int, db: AsyncSession):
         }
         daily_by_category[day] = {cat: 0 for cat in total_by_category.keys()}
 
-    # Get daily breakdown for categories (still need to load minimal data)
-    complaints = (await db.execute(
-        select(Complaint)
-        .options(*QueryOptions.complaint_for_stats())
-        .where(
-            Complaint.barangay_id == barangay_id,
-            Complaint.created_at >= since
-        )
-    )).scalars().all()
+    # Get daily breakdown for categories from database aggregation
+    category_rows = await StatisticsHelper.get_category_counts_by_period(
+        db, barangay_id, since, granularity="day"
+    )
+    total_complaints = 0
 
-    # Populate daily category counts from loaded complaints
-    for c in complaints:
-        day = c.created_at.strftime("%Y-%m-%d")
-        if day in daily_by_category and c.category:
-            daily_by_category[day][c.category.category_name] += 1
+    # Populate daily category counts
+    for date_val, category_name, count in category_rows:
+        total_complaints += count
+        day = date_val.strftime("%Y-%m-%d") if hasattr(date_val, 'strftime') else str(date_val)
+        if day in daily_by_category:
+            daily_by_category[day][category_name] = daily_by_category[day].get(category_name, 0) + count
 
     # Populate daily status counts
     for date_val, status_val, count in date_status_rows:
@@ -233,7 +278,7 @@ async def get_weekly_stats(barangay_id: int, db: AsyncSession):
 
     stats = {
         "period": "weekly",
-        "total_complaints": len(complaints),
+        "total_complaints": total_complaints,
         "total_submitted": status_totals["submitted"],
         "total_resolved": status_totals["resolved"],
         "total_forwarded": status_totals["forwarded"],
@@ -274,22 +319,18 @@ async def get_monthly_stats(barangay_id: int, year: int, month: int, db: AsyncSe
         daily_counts[day] = {"submitted": 0, "resolved": 0, "forwarded": 0, "under_review": 0}
         daily_by_category[day] = {cat: 0 for cat in total_by_category.keys()}
 
-    # Get daily breakdown for categories
-    complaints = (await db.execute(
-        select(Complaint)
-        .options(*QueryOptions.complaint_for_stats())
-        .where(
-            Complaint.barangay_id == barangay_id,
-            Complaint.created_at >= start,
-            Complaint.created_at <= end
-        )
-    )).scalars().all()
+    # Get daily breakdown for categories from database aggregation
+    category_rows = await StatisticsHelper.get_category_counts_by_period(
+        db, barangay_id, start, end, granularity="day"
+    )
+    total_complaints = 0
 
     # Populate daily category counts
-    for c in complaints:
-        day = c.created_at.strftime("%Y-%m-%d")
-        if day in daily_by_category and c.category:
-            daily_by_category[day][c.category.category_name] += 1
+    for date_val, category_name, count in category_rows:
+        total_complaints += count
+        day = date_val.strftime("%Y-%m-%d") if hasattr(date_val, 'strftime') else str(date_val)
+        if day in daily_by_category:
+            daily_by_category[day][category_name] = daily_by_category[day].get(category_name, 0) + count
 
     # Populate daily status counts
     for date_val, status_val, count in date_status_rows:
@@ -308,7 +349,7 @@ async def get_monthly_stats(barangay_id: int, year: int, month: int, db: AsyncSe
         "period": "monthly",
         "year": year,
         "month": month,
-        "total_complaints": len(complaints),
+        "total_complaints": total_complaints,
         "total_submitted": status_totals["submitted"],
         "total_resolved": status_totals["resolved"],
         "total_forwarded": status_totals["forwarded"],
@@ -350,22 +391,17 @@ async def get_yearly_stats(barangay_id: int, year: int, db: AsyncSession):
         for m in MONTHS
     }
 
-    # Get monthly breakdown for categories
-    complaints = (await db.execute(
-        select(Complaint)
-        .options(*QueryOptions.complaint_for_stats())
-        .where(
-            Complaint.barangay_id == barangay_id,
-            Complaint.created_at >= start,
-            Complaint.created_at <= end
-        )
-    )).scalars().all()
+    # Get monthly breakdown for categories from database aggregation
+    category_rows = await StatisticsHelper.get_category_counts_by_period(
+        db, barangay_id, start, end, granularity="month"
+    )
+    total_complaints = 0
 
     # Populate monthly category counts
-    for c in complaints:
-        label = MONTHS[c.created_at.month - 1]
-        if c.category:
-            monthly_by_category[label][c.category.category_name] += 1
+    for month_val, category_name, count in category_rows:
+        total_complaints += count
+        label = MONTHS[int(month_val) - 1]
+        monthly_by_category[label][category_name] = monthly_by_category[label].get(category_name, 0) + count
 
     # Populate monthly status counts
     for date_val, status_val, count in date_status_rows:
@@ -383,7 +419,7 @@ async def get_yearly_stats(barangay_id: int, year: int, db: AsyncSession):
     stats = {
         "period": "yearly",
         "year": year,
-        "total_complaints": len(complaints),
+        "total_complaints": total_complaints,
         "total_submitted": status_totals["submitted"],
         "total_resolved": status_totals["resolved"],
         "total_forwarded": status_totals["forwarded"],
@@ -452,22 +488,19 @@ async def submit_complaint(complaint_data: ComplaintCreateData, user_id: int, db
 
         db.add(new_complaint)
         await db.flush()
+        await DailyRollupHelper.record_created(db, [new_complaint.id])
 
         await log_status_change(
             complaint_ids=[new_complaint.id],
             new_status=ComplaintStatus.SUBMITTED.value,
             changed_by_user_id=user_id,
-            db=db
+            db=db,
+            commit=False
         )
 
-        await db.commit()
-        await db.refresh(new_complaint)
-        logger.info(f"Step 1 complete — complaint saved: id={new_complaint.id}")
-        
-
         incident_repo = IncidentRepository(db)
         category_config = await incident_repo.get_category_config(complaint_data.category_id)
-        logger.info(f"Step 2 complete — category config retrieved for category_id={complaint_data.category_id}")
+        logger.info(f"Category config retrieved for category_id={complaint_data.category_id}")
         logger.info(f"Category Config: {category_config}")
 
         input_dto = ClusterComplaintInput(
@@ -487,8 +520,17 @@ async def submit_complaint(complaint_data: ComplaintCreateData, user_id: int, db
         )
         
         cluster_data = ClusterComplaintSchema.model_validate(input_dto.__dict__)
-        
-        cluster = cluster_complaint_task.delay(complaint_data=cluster_data.model_dump())
+
+        # Clustering is dispatched by the outbox relay once this transaction commits
+        await enqueue_task(
+            db,
+            cluster_complaint_task,
+            {"complaint_data": cluster_data.model_dump(mode="json")},
+            dedupe_key=f"cluster:{new_complaint.id}",
+        )
+
+        await db.commit()
+        logger.info(f"Complaint saved and clustering queued: id={new_complaint.id}")
 
         result = await db.execute(
             select(Complaint)
@@ -668,7 +710,7 @@ async def notify_user_for_hearing(incident_id: int, hearing_date: datetime, db:
             detail=str(e))
         
         
-async def log_status_change(complaint_ids: List[int], new_status: str, changed_by_user_id: int, db: AsyncSession):
+async def log_status_change(complaint_ids: List[int], new_status: str, changed_by_user_id: int, db: AsyncSession, commit: bool = True):
     try:
         now = datetime.now(timezone.utc)
         logs = [
@@ -681,7 +723,8 @@ async def log_status_change(complaint_ids: List[int], new_status: str, changed_b
             for complaint_id in complaint_ids
         ]
         db.add_all(logs)
-        await db.commit()
+        if commit:
+            await db.commit()
         logger.info(f"Logged status change to '{new_status}' for complaints: {complaint_ids} by user ID: {changed_by_user_id}")
         
         
@@ -8,14 +8,14 @@ from app.models.department import Department
 from app.models.department_account import DepartmentAccount
 from app.models.incident_model import IncidentModel
 from app.schemas.department_schema import DepartmentWithUserData
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from app.utils.logger import logger
 from datetime import datetime, timedelta
 from app.utils.caching import set_cache, get_cache
 from app.services.complaint_services import log_status_change
 from app.models.response import Response
-from app.models.complaint_logs import ComplaintLogs
+from app.utils.query_optimization import DailyRollupHelper
 
 
 async def get_all_departments(db: AsyncSession):
@@ -159,70 +159,44 @@ async def weekly_forwarded_incidents_stats(department_account_id: int, db: Async
         today = datetime.now().date()
         week_ago = today - timedelta(days=6)
         
-        result = await db.execute(
-            select(
-                func.date(Complaint.created_at).label('date'),
-                Complaint.status,
-                func.count(Complaint.id).label('count')
-            )
-            .join(IncidentComplaintModel, IncidentComplaintModel.complaint_id == Complaint.id)
-            .join(IncidentModel, IncidentModel.id == IncidentComplaintModel.incident_id)
-            .where(
-                func.date(Complaint.created_at) >= week_ago,
-                IncidentModel.department_account_id == department_account_id,
-                Complaint.status.in_([
-                    ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
-                    ComplaintStatus.REVIEWED_BY_DEPARTMENT.value,
-                    ComplaintStatus.RESOLVED_BY_DEPARTMENT.value
-                ])
-            )
-            .group_by(func.date(Complaint.created_at), Complaint.status)
+        stats = await DailyRollupHelper.get_status_counts_by_day(
+            db,
+            since=week_ago,
+            statuses=[
+                ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
+                ComplaintStatus.REVIEWED_BY_DEPARTMENT.value,
+                ComplaintStatus.RESOLVED_BY_DEPARTMENT.value
+            ],
+            department_account_id=department_account_id,
         )
         
-        stats = result.all()
-        
         daily_counts = {}
-        for stat in stats:
-            date_str = stat.date.isoformat()
+        for day, status_val, count in stats:
+            date_str = day.isoformat()
             if date_str not in daily_counts:
                 daily_counts[date_str] = {"forwarded": 0, "under_review": 0, "resolved": 0}
             
-            if stat.status == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value:
-                daily_counts[date_str]["forwarded"] = stat.count
-            elif stat.status == ComplaintStatus.REVIEWED_BY_DEPARTMENT.value:
-                daily_counts[date_str]["under_review"] = stat.count
-            elif stat.status == ComplaintStatus.RESOLVED_BY_DEPARTMENT.value:
-                daily_counts[date_str]["resolved"] = stat.count
+            if status_val == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value:
+                daily_counts[date_str]["forwarded"] = count
+            elif status_val == ComplaintStatus.REVIEWED_BY_DEPARTMENT.value:
+                daily_counts[date_str]["under_review"] = count
+            elif status_val == ComplaintStatus.RESOLVED_BY_DEPARTMENT.value:
+                daily_counts[date_str]["resolved"] = count
 
-        # Keep forwarded bucket sticky using complaint logs.
-        forwarded_ids_by_day = {}
-        forwarded_logs = await db.execute(
-            select(
-                ComplaintLogs.complaint_id,
-                func.date(Complaint.created_at).label('date')
-            )
-            .join(Complaint, Complaint.id == ComplaintLogs.complaint_id)
-            .join(IncidentComplaintModel, IncidentComplaintModel.complaint_id == Complaint.id)
-            .join(IncidentModel, IncidentModel.id == IncidentComplaintModel.incident_id)
-            .where(
-                func.date(Complaint.created_at) >= week_ago,
-                IncidentModel.department_account_id == department_account_id,
-                ComplaintLogs.new_status == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
-            )
+        # Keep forwarded bucket sticky using the rollup's "reached" rows.
+        reached = await DailyRollupHelper.get_status_counts_by_day(
+            db,
+            since=week_ago,
+            statuses=[ComplaintStatus.FORWARDED_TO_DEPARTMENT.value],
+            kind=DailyRollupHelper.KIND_REACHED,
+            department_account_id=department_account_id,
         )
 
-        for row in forwarded_logs.all():
-            if not row.date:
-                continue
-            date_str = row.date.isoformat()
-            if date_str not in forwarded_ids_by_day:
-                forwarded_ids_by_day[date_str] = set()
-            forwarded_ids_by_day[date_str].add(row.complaint_id)
+        for day, _, count in reached:
+            date_str = day.isoformat()
             if date_str not in daily_counts:
                 daily_counts[date_str] = {"forwarded": 0, "under_review": 0, "resolved": 0}
-
-        for date_str, complaint_ids in forwarded_ids_by_day.items():
-            daily_counts[date_str]["forwarded"] = len(complaint_ids)
+            daily_counts[date_str]["forwarded"] = count
         
         return {"daily_counts": daily_counts}
     
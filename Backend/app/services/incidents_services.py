@@ -11,19 +11,20 @@ from app.constants.complaint_status import ComplaintStatus
 from app.models.incident_model import IncidentModel
 from app.models.response import Response
 from app.models.incident_complaint import IncidentComplaintModel
-from app.schemas.incident_schema import IncidentData
+from app.schemas.incident_schema import IncidentData, IncidentPage
 from app.utils.caching import delete_cache
 from app.utils.logger import logger
 from app.models.complaint import Complaint
-from app.tasks.notification_tasks import send_notifications_task
+from app.tasks.notification_tasks import send_bulk_notifications_task
 from app.models.response import Response
 from app.services.attachment_services import enqueue_response_attachments
-from app.utils.caching import set_cache, get_cache
+from app.utils.caching import set_cache, get_cache, get_cache_version, page_cache_key
 from app.models.user import User
 from app.services.complaint_services import log_status_change
 from app.constants.roles import UserRole
-from app.utils.query_optimization import QueryOptions, BatchLoader
+from app.utils.query_optimization import QueryOptions, BatchLoader, KeysetPagination, ListingFilters, DailyRollupHelper
 from app.utils.cache_invalidator_optimized import CacheInvalidator
+from app.utils.outbox import enqueue_task
 
 
 def _active_statuses_by_role(role: str) -> set[str]:
@@ -48,6 +49,64 @@ def _active_statuses_by_role(role: str) -> set[str]:
     return set()
 
 
+def _apply_incident_filters(query, filters: ListingFilters):
+    if filters.status:
+        query = query.where(
+            select(IncidentComplaintModel.incident_id)
+            .join(IncidentComplaintModel.complaint)
+            .where(
+                IncidentComplaintModel.incident_id == IncidentModel.id,
+                Complaint.status == filters.status,
+            )
+            .exists()
+        )
+    if filters.category_id:
+        query = query.where(IncidentModel.category_id == filters.category_id)
+    if filters.start_date:
+        query = query.where(IncidentModel.first_reported_at >= filters.start_date)
+    if filters.end_date:
+        query = query.where(IncidentModel.first_reported_at <= filters.end_date)
+    return query
+
+
+async def _get_incident_page(query, namespace: str, pagination: KeysetPagination, filters: ListingFilters, db: AsyncSession) -> IncidentPage:
+    """Run a filtered, keyset-paginated incident query with a per-page cache entry."""
+    version = await get_cache_version(namespace)
+    cache_key = page_cache_key(namespace, version, pagination.cache_token(), filters.cache_token())
+    cached = await get_cache(cache_key)
+    if cached is not None:
+        logger.info(f"Cache hit for incident page ({namespace})")
+        return IncidentPage.model_validate(cached)
+
+    query = _apply_incident_filters(query.options(*QueryOptions.incident_full()), filters)
+    query = pagination.apply_to_query(query, IncidentModel.first_reported_at, IncidentModel.id)
+
+    result = await db.execute(query)
+    incidents, next_cursor = pagination.build_page(result.scalars().all(), "first_reported_at")
+
+    page = IncidentPage(
+        items=[IncidentData.model_validate(incident, from_attributes=True) for incident in incidents],
+        next_cursor=next_cursor,
+        limit=pagination.limit,
+    )
+    await set_cache(cache_key, page.model_dump(mode="json"), expiration=3600)
+    return page
+
+
+def _archive_filter(role: str):
+    active_statuses = _active_statuses_by_role(role)
+    archive_statuses = [status_value.value for status_value in ComplaintStatus if status_value.value not in active_statuses]
+    return (
+        select(IncidentComplaintModel.incident_id)
+        .join(IncidentComplaintModel.complaint)
+        .where(
+            IncidentComplaintModel.incident_id == IncidentModel.id,
+            Complaint.status.in_(archive_statuses),
+        )
+        .exists()
+    )
+
+
 async def get_all_incidents_by_barangay(barangay_id: int, db: AsyncSession):
     try:
         all_incidents_cache = await get_cache(f"all_incidents: barangay_id:{barangay_id}")
@@ -178,6 +237,7 @@ async def forward_incident_to_lgu(response_data: ResponseCreateSchema, incident_
         if complaints[0].is_rejected_by_lgu:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot forward incident. You cannot forward an incident that has been rejected by the LGU.")
         
+        await DailyRollupHelper.apply_transition(db, complaint_ids, ComplaintStatus.FORWARDED_TO_LGU.value)
         await db.execute(
             update(Complaint)   
             .where(Complaint.id.in_(complaint_ids))
@@ -192,7 +252,8 @@ async def forward_incident_to_lgu(response_data: ResponseCreateSchema, incident_
             complaint_ids=complaint_ids,
             new_status=ComplaintStatus.FORWARDED_TO_LGU.value,
             changed_by_user_id=responder_id,
-            db=db
+            db=db,
+            commit=False
         )
         logger.info(f"Updated {len(complaint_ids)} complaints to FORWARDED_TO_LGU status for incident ID: {incident_id}")
         incident.new_complaint_count = len(complaint_ids)
@@ -200,24 +261,19 @@ async def forward_incident_to_lgu(response_data: ResponseCreateSchema, incident_
         incident.updated_at = datetime.now(timezone.utc)
         if incident.hearing_date:
             incident.hearing_date = None
-        await db.commit()
-        
-        # OPTIMIZED: Batch fetch all complaints at once instead of in loop
-        complaints_dict = await BatchLoader.fetch_complaints_by_ids(db, complaint_ids, minimal=True)
-        
-        # Send notifications using cached complaints
-        for complaint_id in complaint_ids:
-            complaint = complaints_dict.get(complaint_id)
-            if complaint:
-                send_notifications_task.delay(
-                    user_id=complaint.user_id,
-                    title="Complaint Forwarded to LGU",
-                    incident_id=incident_id,
-                    message="Your complaint has been forwarded to the LGU for further processing.",
-                    complaint_id=complaint.id,
-                    notification_type="update",
-                    event="info"
-                )
+
+        notifications = [
+            {
+                "user_id": complaint.user_id,
+                "title": "Complaint Forwarded to LGU",
+                "incident_id": incident_id,
+                "message": "Your complaint has been forwarded to the LGU for further processing.",
+                "complaint_id": complaint.id,
+                "notification_type": "update",
+                "event": "info",
+            }
+            for complaint in complaints
+        ]
                 
         response = Response(
             incident_id=incident_id,
@@ -226,29 +282,33 @@ async def forward_incident_to_lgu(response_data: ResponseCreateSchema, incident_
             response_date=datetime.now(timezone.utc),
         )
         db.add(response)
-        await db.commit()
-        await db.refresh(response)
-
-        if attachments:
-            await enqueue_response_attachments(attachments, response.id, responder_id)
         
         result = await db.execute(
             select(User).where(User.role == "lgu_official")
         )
         lgu_officials = result.scalars().all()
-        for official in lgu_officials:
-            send_notifications_task.delay(
-                user_id=official.id,
-                title="New Incident Forwarded to LGU",
-                message=f"A new incident with ID {incident.id} has been forwarded to the LGU.",
-                complaint_id=None,
-                incident_id=incident_id,
-                notification_type="info",
-                event="info"
+        notifications.extend(
+            {
+                "user_id": official.id,
+                "title": "New Incident Forwarded to LGU",
+                "message": f"A new incident with ID {incident.id} has been forwarded to the LGU.",
+                "complaint_id": None,
+                "incident_id": incident_id,
+                "notification_type": "info",
+                "event": "info",
+            }
+            for official in lgu_officials
+        )
+        # Every recipient goes out in one outbox event, sent by the relay after this transaction commits
+        await enqueue_task(db, send_bulk_notifications_task, {"notifications": notifications})
+        if lgu_officials:
+            incident.lgu_account_id = lgu_officials[-1].id
 
-            )
-            incident.lgu_account_id = official.id
-            await db.commit()
+        await db.commit()
+        await db.refresh(response)
+
+        if attachments:
+            await enqueue_response_attachments(attachments, response.id, responder_id)
             
         # OPTIMIZED: Use new CacheInvalidator with pipeline
         await CacheInvalidator.invalidate_cache(
@@ -435,4 +495,52 @@ async def get_all_incidents(current_user: User, db: AsyncSession):
 
     except Exception:
         logger.exception("Error in get_all_incidents")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+async def get_incidents_page_by_barangay(barangay_id: int, pagination: KeysetPagination, filters: ListingFilters, db: AsyncSession):
+    try:
+        query = select(IncidentModel).where(IncidentModel.barangay_id == barangay_id)
+        return await _get_incident_page(query, f"incidents_page:barangay:{barangay_id}", pagination, filters, db)
+
+    except HTTPException:
+        raise
+
+    except Exception:
+        logger.exception("Error in get_incidents_page_by_barangay")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+async def get_archived_incidents_page(current_user: User, pagination: KeysetPagination, filters: ListingFilters, db: AsyncSession):
+    try:
+        role = current_user.role
+        query = select(IncidentModel).where(_archive_filter(role))
+
+        if role == UserRole.BARANGAY_OFFICIAL:
+            barangay_account = getattr(current_user, "barangay_account", None)
+            if not barangay_account:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Barangay account not found for current user")
+
+            barangay_id = barangay_account.barangay_id
+            query = query.where(IncidentModel.barangay_id == barangay_id)
+            return await _get_incident_page(query, f"incidents_page:archive:barangay:{barangay_id}", pagination, filters, db)
+
+        if role == UserRole.LGU_OFFICIAL:
+            return await _get_incident_page(query, "incidents_page:archive:lgu", pagination, filters, db)
+
+        if role == UserRole.DEPARTMENT_STAFF:
+            department_account = getattr(current_user, "department_account", None)
+            if not department_account:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Department account not found for current user")
+
+            department_account_id = department_account.id
+            query = query.where(IncidentModel.department_account_id == department_account_id)
+            return await _get_incident_page(query, f"incidents_page:archive:department:{department_account_id}", pagination, filters, db)
+
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this resource.")
+
+    except HTTPException:
+        raise
+
+    except Exception:
+        logger.exception("Error in get_archived_incidents_page")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
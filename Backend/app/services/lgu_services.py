@@ -11,7 +11,7 @@ from app.utils.logger import logger
 from app.constants.complaint_status import ComplaintStatus
 from app.utils.cache_invalidator_optimized import invalidate_cache
 from app.utils.cache_invalidator_optimized import CacheInvalidator
-from app.tasks.notification_tasks import send_notifications_task
+from app.tasks.notification_tasks import send_bulk_notifications_task
 from app.models.response import Response
 from app.services.attachment_services import enqueue_response_attachments
 from fastapi.responses import JSONResponse
@@ -20,14 +20,12 @@ from app.schemas.response_schema import ResponseCreateSchema
 from app.models.complaint import Complaint
 from app.models.barangay import Barangay
 from app.models.category import Category
-from app.models.complaint_logs import ComplaintLogs
-from sqlalchemy import select, func, update
-from sqlalchemy import func
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from app.constants.complaint_status import ComplaintStatus
 from typing import List
 from app.services.complaint_services import log_status_change
-from app.utils.query_optimization import QueryOptions, BatchLoader, StatisticsHelper
+from app.utils.query_optimization import QueryOptions, BatchLoader, StatisticsHelper, DailyRollupHelper
 
 
 async def get_forwarded_incidents_by_barangay(barangay_id: int, db: AsyncSession):
@@ -109,29 +107,20 @@ async def weekly_forwarded_incidents_stats(db: AsyncSession):
         today = datetime.now().date()
         week_ago = today - timedelta(days=6)
         
-        result = await db.execute(
-            select(
-                func.date(Complaint.created_at).label('date'),
-                Complaint.status,
-                func.count(Complaint.id).label('count')
-            )
-            .where(
-                func.date(Complaint.created_at) >= week_ago,
-                Complaint.status.in_([
-                    ComplaintStatus.FORWARDED_TO_LGU.value,
-                    ComplaintStatus.REVIEWED_BY_LGU.value,
-                    ComplaintStatus.RESOLVED_BY_LGU.value,
-                    ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
-                ])
-            )
-            .group_by(func.date(Complaint.created_at), Complaint.status)
+        stats = await DailyRollupHelper.get_status_counts_by_day(
+            db,
+            since=week_ago,
+            statuses=[
+                ComplaintStatus.FORWARDED_TO_LGU.value,
+                ComplaintStatus.REVIEWED_BY_LGU.value,
+                ComplaintStatus.RESOLVED_BY_LGU.value,
+                ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
+            ],
         )
         
-        stats = result.all()
-        
         daily_counts = {}
-        for stat in stats:
-            date_str = stat.date.isoformat()
+        for day, status_val, count in stats:
+            date_str = day.isoformat()
             if date_str not in daily_counts:
                 daily_counts[date_str] = {
                     "forwarded": 0,
@@ -140,65 +129,28 @@ async def weekly_forwarded_incidents_stats(db: AsyncSession):
                     "under_review": 0,
                 }
             
-            if stat.status == ComplaintStatus.FORWARDED_TO_LGU.value:
-                daily_counts[date_str]["forwarded"] = stat.count
-            elif stat.status == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value:
-                daily_counts[date_str]["forwarded_to_department"] = stat.count
-            elif stat.status == ComplaintStatus.RESOLVED_BY_LGU.value:
-                daily_counts[date_str]["resolved"] = stat.count
-            elif stat.status == ComplaintStatus.REVIEWED_BY_LGU.value:
-                daily_counts[date_str]["under_review"] = stat.count
-
-        # Keep forwarded buckets sticky by deriving them from status-change logs.
-        forwarded_ids_by_day = {}
-        forwarded_to_dept_ids_by_day = {}
-
-        forwarded_logs = await db.execute(
-            select(
-                ComplaintLogs.complaint_id,
-                func.date(Complaint.created_at).label('date')
-            )
-            .join(Complaint, Complaint.id == ComplaintLogs.complaint_id)
-            .where(
-                func.date(Complaint.created_at) >= week_ago,
-                ComplaintLogs.new_status == ComplaintStatus.FORWARDED_TO_LGU.value,
-            )
-        )
-
-        for row in forwarded_logs.all():
-            if not row.date:
-                continue
-            date_str = row.date.isoformat()
-            if date_str not in forwarded_ids_by_day:
-                forwarded_ids_by_day[date_str] = set()
-            forwarded_ids_by_day[date_str].add(row.complaint_id)
-            if date_str not in daily_counts:
-                daily_counts[date_str] = {
-                    "forwarded": 0,
-                    "forwarded_to_department": 0,
-                    "resolved": 0,
-                    "under_review": 0,
-                }
+            if status_val == ComplaintStatus.FORWARDED_TO_LGU.value:
+                daily_counts[date_str]["forwarded"] = count
+            elif status_val == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value:
+                daily_counts[date_str]["forwarded_to_department"] = count
+            elif status_val == ComplaintStatus.RESOLVED_BY_LGU.value:
+                daily_counts[date_str]["resolved"] = count
+            elif status_val == ComplaintStatus.REVIEWED_BY_LGU.value:
+                daily_counts[date_str]["under_review"] = count
 
-        forwarded_to_department_logs = await db.execute(
-            select(
-                ComplaintLogs.complaint_id,
-                func.date(Complaint.created_at).label('date')
-            )
-            .join(Complaint, Complaint.id == ComplaintLogs.complaint_id)
-            .where(
-                func.date(Complaint.created_at) >= week_ago,
-                ComplaintLogs.new_status == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
-            )
+        # Keep forwarded buckets sticky: "reached" rows count every complaint that was ever forwarded.
+        reached = await DailyRollupHelper.get_status_counts_by_day(
+            db,
+            since=week_ago,
+            statuses=[
+                ComplaintStatus.FORWARDED_TO_LGU.value,
+                ComplaintStatus.FORWARDED_TO_DEPARTMENT.value,
+            ],
+            kind=DailyRollupHelper.KIND_REACHED,
         )
 
-        for row in forwarded_to_department_logs.all():
-            if not row.date:
-                continue
-            date_str = row.date.isoformat()
-            if date_str not in forwarded_to_dept_ids_by_day:
-                forwarded_to_dept_ids_by_day[date_str] = set()
-            forwarded_to_dept_ids_by_day[date_str].add(row.complaint_id)
+        for day, status_val, count in reached:
+            date_str = day.isoformat()
             if date_str not in daily_counts:
                 daily_counts[date_str] = {
                     "forwarded": 0,
@@ -206,12 +158,10 @@ async def weekly_forwarded_incidents_stats(db: AsyncSession):
                     "resolved": 0,
                     "under_review": 0,
                 }
-
-        for date_str, complaint_ids in forwarded_ids_by_day.items():
-            daily_counts[date_str]["forwarded"] = len(complaint_ids)
-
-        for date_str, complaint_ids in forwarded_to_dept_ids_by_day.items():
-            daily_counts[date_str]["forwarded_to_department"] = len(complaint_ids)
+            if status_val == ComplaintStatus.FORWARDED_TO_LGU.value:
+                daily_counts[date_str]["forwarded"] = count
+            elif status_val == ComplaintStatus.FORWARDED_TO_DEPARTMENT.value:
+                daily_counts[date_str]["forwarded_to_department"] = count
 
         return {"daily_counts": daily_counts}
     
@@ -239,16 +189,7 @@ async def complaint_counts_by_barangay_category(db: AsyncSession):
             select(Category).order_by(Category.category_name.asc())
         )).scalars().all()
 
-        result = await db.execute(
-            select(
-                Complaint.barangay_id,
-                Complaint.category_id,
-                func.count(Complaint.id).label("count")
-            )
-            .group_by(Complaint.barangay_id, Complaint.category_id)
-        )
-
-        counts = {(row.barangay_id, row.category_id): row.count for row in result.all()}
+        counts = await DailyRollupHelper.get_counts_by_barangay_category(db)
 
         data = []
         for barangay in barangays:
@@ -298,6 +239,9 @@ async def assign_incident_to_department(response_data: ResponseCreateSchema, inc
         if not complaint_ids:
             return {"message": "No complaints found for this incident"}
         
+        await DailyRollupHelper.apply_transition(
+            db, complaint_ids, ComplaintStatus.FORWARDED_TO_DEPARTMENT.value, department_account_id=department_account_id
+        )
         await db.execute(
             update(Complaint)
             .where(Complaint.id.in_(complaint_ids))
@@ -320,15 +264,17 @@ async def assign_incident_to_department(response_data: ResponseCreateSchema, inc
         complaints_result = await db.execute(select(Complaint).where(Complaint.id.in_(complaint_ids)))
         complaints = complaints_result.scalars().all()
 
-        for complaint in complaints:
-            send_notifications_task.delay(
-                user_id=complaint.user_id,
-                title="Complaint Forwarded to Department",
-                message="Your complaint has been forwarded to the department for further processing.",
-                complaint_id=complaint.id,
-                incident_id=incident_id,
-                notification_type="info",
-            )
+        notifications = [
+            {
+                "user_id": complaint.user_id,
+                "title": "Complaint Forwarded to Department",
+                "message": "Your complaint has been forwarded to the department for further processing.",
+                "complaint_id": complaint.id,
+                "incident_id": incident_id,
+                "notification_type": "info",
+            }
+            for complaint in complaints
+        ]
                 
         response = Response(
             incident_id=incident_id,
@@ -351,14 +297,16 @@ async def assign_incident_to_department(response_data: ResponseCreateSchema, inc
         )
         incident = result.scalars().first()
         if incident and incident.department_account and incident.department_account.user:
-            send_notifications_task.delay(
-                user_id=incident.department_account.user.id,
-                title="New Incident Assigned",
-                message=f"A new incident with ID {incident.id} has been forwarded to your department.",
-                complaint_id=None,
-                incident_id=incident_id,
-                notification_type="info",
-            )
+            notifications.append({
+                "user_id": incident.department_account.user.id,
+                "title": "New Incident Assigned",
+                "message": f"A new incident with ID {incident.id} has been forwarded to your department.",
+                "complaint_id": None,
+                "incident_id": incident_id,
+                "notification_type": "info",
+            })
+        # One task for every recipient instead of one per complaint
+        send_bulk_notifications_task.delay(notifications=notifications)
             
         await invalidate_cache(
             complaint_ids=complaint_ids,
@@ -1,11 +1,133 @@
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.notification import Notification
-from app.schemas.notification_schema import NotificationCreateData, NotificationData
-from sqlalchemy import select
+from app.schemas.notification_schema import NotificationCreateData, NotificationData, NotificationPage, UnreadCount
+from sqlalchemy import func, insert, select, update
+from collections import Counter
+from typing import Dict, List
+from app.core.redis import redis_client
 from app.utils.logger import logger
 from datetime import datetime, timezone
-from app.utils.caching import get_cache, set_cache, delete_cache
+from app.utils.caching import get_cache, set_cache, delete_cache, delete_cache_many
+from app.utils.query_optimization import KeysetPagination
+from app.utils.redis_pub import publish_user_sse_events
+
+UNREAD_KEY_PREFIX = "notif_unread"
+# Counters are recounted from the database after this long, bounding any drift
+UNREAD_TTL_SECONDS = 3600
+
+# Adjust a counter only while it exists; a missing counter is recounted on the next read.
+_ADJUST_UNREAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+    if value < 0 then
+        redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+        return 0
+    end
+    return value
+end
+return nil
+"""
+
+# Rows per INSERT statement; keeps bind parameters well under Postgres' limit
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _unread_key(user_id: int) -> str:
+    return f"{UNREAD_KEY_PREFIX}:{user_id}"
+
+
+async def adjust_unread_counts(deltas: Dict[int, int]) -> None:
+    """Apply {user_id: delta} to the cached unread counters in one pipeline."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id, delta in deltas.items():
+            pipe.eval(_ADJUST_UNREAD_SCRIPT, 1, _unread_key(user_id), delta)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to adjust unread counters for {len(deltas)} users: {e}")
+        # A partially applied pipeline leaves counters unreliable; make the next read recount
+        await delete_cache_many(_unread_key(user_id) for user_id in deltas)
+
+
+async def reset_unread_count(user_id: int) -> None:
+    await delete_cache(_unread_key(user_id))
+
+
+def _sse_event(notification: dict) -> dict:
+    return {
+        "target": str(notification["user_id"]),
+        "event": notification.get("event") or notification.get("notification_type", "info"),
+        "data": {
+            "title": notification["title"],
+            "message": notification["message"],
+            "sent_at": notification["sent_at"],
+            "complaint_id": notification.get("complaint_id"),
+            "incident_id": notification.get("incident_id"),
+            "notification_type": notification.get("notification_type", "info"),
+            "channel": notification.get("channel", "in_app"),
+        },
+    }
+
+
+async def deliver_notifications(notifications: List[dict]) -> None:
+    """Invalidate inbox caches, bump unread counters and publish SSE events for stored notifications.
+
+    One pipeline each for the cache deletes, the counters and the publishes,
+    whatever the number of recipients. Failures are logged, not raised: the rows are already
+    committed and clients recover them on their next inbox fetch.
+    """
+    if not notifications:
+        return
+
+    await delete_cache_many(f"user_notifications:{n['user_id']}" for n in notifications)
+    await adjust_unread_counts(Counter(n["user_id"] for n in notifications))
+    try:
+        await publish_user_sse_events([_sse_event(n) for n in notifications])
+    except Exception as e:
+        logger.warning(f"Failed to publish {len(notifications)} SSE notification events: {e}")
+
+
+async def send_bulk_notifications(notifications: List[dict], db: AsyncSession) -> int:
+    """Store and deliver in-app notifications for many recipients at once.
+
+    Each dict needs user_id, title and message, and may carry complaint_id,
+    incident_id, notification_type, channel (SSE payload only) and event (SSE
+    event name). Rows go in with multi-row INSERTs and are committed together
+    with anything already staged on `db`. Returns the number of notifications
+    sent; entries without a user_id are skipped.
+    """
+    notifications = [n for n in notifications if n.get("user_id")]
+    if not notifications:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": n["user_id"],
+            "complaint_id": n.get("complaint_id"),
+            "incident_id": n.get("incident_id"),
+            "title": n["title"],
+            "message": n["message"],
+            "notification_type": n.get("notification_type", "info"),
+            "channel": "sse",
+            "is_read": False,
+            "sent_at": now,
+        }
+        for n in notifications
+    ]
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        await db.execute(insert(Notification).values(rows[start:start + BULK_INSERT_CHUNK_SIZE]))
+    await db.commit()
+    logger.info(f"Saved {len(rows)} notifications for {len({row['user_id'] for row in rows})} users")
+
+    sent_at = now.isoformat()
+    await deliver_notifications([{**n, "sent_at": sent_at} for n in notifications])
+    return len(rows)
+
 
 async def create_notification(notification_data: NotificationCreateData, db: AsyncSession):
     try:
@@ -24,6 +146,8 @@ async def create_notification(notification_data: NotificationCreateData, db: Asy
         await db.refresh(new_notification)
         logger.info(f"Created notification for user ID {notification_data.user_id}: {notification_data.message}")
         await delete_cache(f"user_notifications:{notification_data.user_id}")
+        if not new_notification.is_read:
+            await adjust_unread_counts({notification_data.user_id: 1})
         return NotificationData.model_validate(new_notification, from_attributes=True)
       
     except HTTPException:
@@ -57,6 +181,56 @@ async def get_user_notifications(user_id: int, db: AsyncSession):
         logger.exception(f"Error in get_user_notifications: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
       
+async def get_notifications_page(user_id: int, pagination: KeysetPagination, db: AsyncSession) -> NotificationPage:
+    try:
+        query = pagination.apply_to_query(
+            select(Notification).where(Notification.user_id == user_id),
+            Notification.sent_at,
+            Notification.id,
+        )
+        result = await db.execute(query)
+        notifications, next_cursor = pagination.build_page(result.scalars().all(), "sent_at")
+        return NotificationPage(
+            items=[NotificationData.model_validate(n, from_attributes=True) for n in notifications],
+            next_cursor=next_cursor,
+            limit=pagination.limit,
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.exception(f"Error in get_notifications_page: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+async def get_unread_count(user_id: int, db: AsyncSession) -> UnreadCount:
+    try:
+        try:
+            cached = await redis_client.get(_unread_key(user_id))
+            if cached is not None:
+                return UnreadCount(unread=int(cached))
+        except Exception as e:
+            logger.warning(f"Failed to read unread counter for user ID {user_id}: {e}")
+
+        result = await db.execute(
+            select(func.count(Notification.id))
+            .where(Notification.user_id == user_id, Notification.is_read == False)
+        )
+        unread = result.scalar_one()
+        try:
+            # nx: don't clobber a counter another request seeded meanwhile
+            await redis_client.set(_unread_key(user_id), unread, ex=UNREAD_TTL_SECONDS, nx=True)
+        except Exception as e:
+            logger.warning(f"Failed to seed unread counter for user ID {user_id}: {e}")
+        return UnreadCount(unread=unread)
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.exception(f"Error in get_unread_count: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+      
 async def mark_notification_as_read(notification_id: int, user_id: int, db: AsyncSession):
     try:
         result = await db.execute(
@@ -67,10 +241,13 @@ async def mark_notification_as_read(notification_id: int, user_id: int, db: Asyn
         if not notification:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
         
+        was_unread = not notification.is_read
         notification.is_read = True
         await db.commit()
         logger.info(f"Marked notification ID {notification_id} as read for user ID {user_id}")
         await delete_cache(f"user_notifications:{user_id}")
+        if was_unread:
+            await adjust_unread_counts({user_id: -1})
         return {"message": "Notification marked as read"}
       
     except HTTPException:
@@ -83,17 +260,18 @@ async def mark_notification_as_read(notification_id: int, user_id: int, db: Asyn
 
 async def mark_all_notifications_as_read(user_id: int, db: AsyncSession):
     try:
-        result = await db.execute(
-            select(Notification).where(Notification.user_id == user_id, Notification.is_read == False)
+        await db.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read == False)
+            .values(is_read=True)
         )
-        notifications = result.scalars().all()
-        
-        for notification in notifications:
-            notification.is_read = True
-        
         await db.commit()
         logger.info(f"Marked all notifications as read for user ID {user_id}")
         await delete_cache(f"user_notifications:{user_id}")
+        try:
+            await redis_client.set(_unread_key(user_id), 0, ex=UNREAD_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to reset unread counter for user ID {user_id}: {e}")
         return {"message": "All notifications marked as read"}
       
     except HTTPException:
@@ -0,0 +1,68 @@
+"""Concurrent PDF text extraction.
+
+Large PDFs are split into page ranges that are extracted on worker threads,
+a few at a time. Threads rather than processes: ingestion runs inside a
+Celery prefork child, which is daemonic and may not start processes of its
+own. Each range opens the file by path so no parsed state is shared.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import pdfplumber
+
+
+def count_pages(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """Text of pages [start, end) as (page number, text); runs on a worker thread."""
+    pages = []
+    with pdfplumber.open(file_path) as pdf:
+        for page_number in range(start, end):
+            page = pdf.pages[page_number]
+            text = page.extract_text()
+            if text:
+                pages.append((page_number, text))
+            # Drop the parsed layout so memory stays flat across long ranges
+            page.flush_cache()
+    return pages
+
+
+def page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+
+async def extract_text_parallel(
+    file_path: str,
+    page_count: int,
+    workers: int,
+    pages_per_task: int,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> str:
+    """Extract the text of all page_count pages of the PDF at file_path.
+
+    on_progress is awaited with the number of pages in each finished range.
+    """
+    ranges = page_ranges(page_count, pages_per_task)
+    if not ranges:
+        return ""
+
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def extract(start: int, end: int) -> List[Tuple[int, str]]:
+        async with semaphore:
+            pages = await asyncio.to_thread(extract_page_range, file_path, start, end)
+        if on_progress is not None:
+            await on_progress(end - start)
+        return pages
+
+    results = await asyncio.gather(*(extract(start, end) for start, end in ranges))
+
+    # Ranges are returned in order, so pages are already in document order
+    return "\n".join(text for pages in results for _, text in pages)
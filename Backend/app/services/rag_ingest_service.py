@@ -0,0 +1,150 @@
+"""
+rag_ingest_service.py
+─────────────────────────────────────────────────────────────────────────────
+Background ingestion of PDFs into the chatbot's RAG corpus.
+
+The upload request only validates the file, writes it to the shared upload
+directory (TMPDIR, a volume mounted by both the API and the Celery worker),
+records a job and enqueues ingest_pdf_task. Extraction, embedding and
+upserting run on the worker, which reports progress into the job hash that
+GET /chatbot/upload-pdf/{job_id} reads.
+
+Key schema
+──────────
+rag_ingest:{job_id}   →  hash {job_id, filename, status, pages_total, pages_extracted,
+                              chunks_total, chunks_unchanged, chunks_embedded,
+                              chunks_indexed, chunks_deleted, chunk_titles (JSON),
+                              error, created_at, updated_at}
+
+The filename is the source of the chunks: re-uploading a revised file with the
+same name embeds only new or changed chunks and deletes the ones that are gone.
+
+status goes queued → extracting → indexing → completed, or failed at any step.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.utils.logger import logger
+
+INGEST_JOB_PREFIX = "rag_ingest"
+_INT_FIELDS = (
+    "pages_total", "pages_extracted", "chunks_total", "chunks_unchanged",
+    "chunks_embedded", "chunks_indexed", "chunks_deleted",
+)
+
+
+def ingest_job_key(job_id: str) -> str:
+    return f"{INGEST_JOB_PREFIX}:{job_id}"
+
+
+class IngestError(Exception):
+    """A problem with the uploaded document itself, reported to the uploader as-is."""
+
+
+# ── Progress (written by the worker) ─────────────────────────────────────────
+
+async def update_ingest_job(job_id: str, **fields) -> None:
+    await redis_client.hset(ingest_job_key(job_id), mapping={**fields, "updated_at": time.time()})
+
+
+async def advance_ingest_job(job_id: str, field: str, amount: int) -> None:
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hincrby(ingest_job_key(job_id), field, amount)
+    pipe.hset(ingest_job_key(job_id), "updated_at", time.time())
+    await pipe.execute()
+
+
+# ── API side ─────────────────────────────────────────────────────────────────
+
+def _write_upload(file_bytes: bytes) -> str:
+    with tempfile.NamedTemporaryFile(prefix="rag_ingest_", suffix=".pdf", delete=False) as handle:
+        handle.write(file_bytes)
+        return handle.name
+
+
+async def create_ingest_job(file: UploadFile) -> dict:
+    # Imported here: the task module imports the progress helpers above
+    from app.tasks.rag_tasks import ingest_pdf_task
+
+    file_path = None
+    try:
+        if not file.filename or not file.filename.lower().endswith(".pdf"):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are accepted.")
+
+        file_bytes = await file.read()
+        if not file_bytes:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty.")
+        if len(file_bytes) > settings.RAG_INGEST_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"PDF exceeds the {settings.RAG_INGEST_MAX_BYTES // (1024 * 1024)} MB limit.",
+            )
+        if not file_bytes.startswith(b"%PDF-"):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is not a valid PDF.")
+
+        job_id = uuid.uuid4().hex
+        file_path = await asyncio.to_thread(_write_upload, file_bytes)
+        now = time.time()
+        job = {
+            "job_id": job_id,
+            "filename": file.filename,
+            "status": "queued",
+            **{field: 0 for field in _INT_FIELDS},
+            "chunk_titles": "[]",
+            "error": "",
+            "created_at": now,
+            "updated_at": now,
+        }
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.hset(ingest_job_key(job_id), mapping=job)
+        pipe.expire(ingest_job_key(job_id), settings.RAG_INGEST_JOB_TTL_SECONDS)
+        await pipe.execute()
+
+        ingest_pdf_task.delay(job_id=job_id, file_path=file_path, source=file.filename)
+        logger.info(f"Queued RAG ingestion job {job_id} for '{file.filename}' ({len(file_bytes)} bytes)")
+        return _to_status(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error queuing PDF ingestion: {e}")
+        if file_path:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _to_status(job: dict) -> dict:
+    result = dict(job)
+    for field in _INT_FIELDS:
+        result[field] = int(result.get(field) or 0)
+    for field in ("created_at", "updated_at"):
+        result[field] = float(result.get(field) or 0)
+    result["chunk_titles"] = json.loads(result.get("chunk_titles") or "[]")
+    result["error"] = result.get("error") or None
+    return result
+
+
+async def get_ingest_job(job_id: str) -> dict:
+    try:
+        job = await redis_client.hgetall(ingest_job_key(job_id))
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found.")
+        return _to_status(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error reading ingestion job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
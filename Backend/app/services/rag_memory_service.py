@@ -5,23 +5,28 @@ Enterprise-grade Redis memory service for an FAQ chatbot.
 
 Design decisions
 ────────────────
-1. SLIDING WINDOW — only the last MAX_TURNS exchanges are kept.
-   For an FAQ bot, users rarely need context older than 3–5 turns.
-   Older turns are discarded BEFORE writing back to Redis.
+1. APPEND-ONLY LOG — each session is a Redis list of JSON messages.
+   A turn is one RPUSH (question + answer together) plus an LTRIM that
+   keeps the list bounded, so per-turn Redis I/O is constant no matter
+   how long the conversation runs. Nothing is ever read back and
+   rewritten.
 
-2. TOKEN BUDGET — even within the window, if the total estimated
-   character length exceeds TOKEN_CHAR_BUDGET, the oldest turns
-   are dropped until it fits. This prevents runaway costs on
-   verbose answers.
+2. SLIDING WINDOW — only the last MAX_TURNS exchanges are kept verbatim.
+   For an FAQ bot, users rarely need context older than 3–5 turns.
 
-3. SINGLE ROUND-TRIP on read — handle_session + get_history are
-   merged into one pipelined call (2 Redis GETs → 1 network round trip).
+3. TOKEN BUDGET ON READ — load_session reads the bounded log and then
+   selects the newest pairs that fit HISTORY_TOKEN_BUDGET, so the prompt
+   stays bounded even when individual answers are verbose.
 
-4. NO DOUBLE-FETCH — ChatbotService fetches history once and passes
-   it into append_turn. append_turn never calls get_history internally.
+4. ROLLING SUMMARY (optional) — with a summarizer configured, turns
+   leaving the window are folded into a short per-session summary instead
+   of being forgotten. Summarization runs in the background after the
+   answer is sent, SUMMARY_BATCH_TURNS at a time; the summary is handed
+   to the LLM as a system message ahead of the recent turns.
 
-5. ATOMIC WRITE — append_turn uses a pipeline to SET history + SET
-   active session key in one round trip.
+5. SINGLE ROUND-TRIP on read and on write — the active-session pointer,
+   the window and the summary are read in one pipeline; the append, trim,
+   TTL refresh and pointer update are written in another.
 
 6. FAQ-SPECIFIC BEHAVIOR — FAQ bots answer factual questions that
    rarely need deep multi-turn context. MAX_TURNS = 6 (3 exchanges)
@@ -31,6 +36,7 @@ Design decisions
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from dataclasses import dataclass, field
@@ -38,16 +44,43 @@ from typing import Optional
 
 import redis.asyncio as aioredis
 
+from app.domain.interfaces.i_conversation_summarizer import IConversationSummarizer
+
 logger = logging.getLogger(__name__)
 
 
 HISTORY_TTL: int = 3_600          # seconds — 1 hour idle expiry
-MAX_TURNS: int = 6                 # max exchanges kept (1 turn = 1 Q + 1 A)
-# Rough char budget for history sent to the LLM.
-# ~4 chars ≈ 1 token; 6 000 chars ≈ 1 500 tokens — safe headroom for gpt-4o-mini.
-TOKEN_CHAR_BUDGET: int = 6_000
+MAX_TURNS: int = 6                 # max exchanges kept verbatim (1 turn = 1 Q + 1 A)
+# Token budget for history sent to the LLM.
+# ~4 chars ≈ 1 token; 1 500 tokens ≈ 6 000 chars — safe headroom for gpt-4o-mini.
+HISTORY_TOKEN_BUDGET: int = 1_500
+# Turns folded into the summary per summarization call
+SUMMARY_BATCH_TURNS: int = 2
+
+_WINDOW_MESSAGES = MAX_TURNS * 2
+# With summarization the list may briefly exceed the window; this hard cap
+# only matters if summarization keeps failing.
+_MAX_STORED_MESSAGES = _WINDOW_MESSAGES + SUMMARY_BATCH_TURNS * 2 * 4
+
+# Summaries in flight; the event loop only keeps weak references to tasks
+_background_tasks: set[asyncio.Task] = set()
+
+# Drops the summarized messages only if they are still at the head of the
+# list, then stores the new summary.
+_COMMIT_SUMMARY_SCRIPT = """
+local count = tonumber(ARGV[1])
+if redis.call('LINDEX', KEYS[1], count - 1) == ARGV[2] then
+    redis.call('LTRIM', KEYS[1], count, -1)
+end
+redis.call('SET', KEYS[2], ARGV[3], 'EX', tonumber(ARGV[4]))
+return 1
+"""
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token) plus per-message overhead."""
+    return len(text) // 4 + 4
+
 
 @dataclass(frozen=True, slots=True)
 class ChatMessage:
@@ -65,6 +98,7 @@ class ChatMessage:
 class SessionContext:
     history: list[dict]          # ready to pass straight to OpenAI messages[]
     is_new_session: bool         # True when the session_id changed
+    summary: str = ""            # rolling summary of turns older than the window
 
 
 class RedisMemoryService:
@@ -73,18 +107,32 @@ class RedisMemoryService:
 
     Key schema
     ──────────
-    chat:{user_id}:{session_id}   →  JSON list of {role, content} dicts
-    chat:active:{user_id}         →  current session_id string
+    chat:log:{user_id}:{session_id}       →  list of JSON {role, content} messages
+    chat:summary:{user_id}:{session_id}   →  rolling summary of older turns
+    chat:active:{user_id}                 →  current session_id string
     """
 
-    _HISTORY_PREFIX = "chat"
+    _LOG_PREFIX     = "chat:log"
+    _SUMMARY_PREFIX = "chat:summary"
     _ACTIVE_PREFIX  = "chat:active"
 
-    def __init__(self, client: aioredis.Redis) -> None:
+    def __init__(
+        self,
+        client: aioredis.Redis,
+        summarizer: IConversationSummarizer | None = None,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+    ) -> None:
         self._redis = client
+        self._summarizer = summarizer
+        self._token_budget = token_budget
+        # Messages kept in the log; unsummarized overflow stays readable until folded in
+        self._keep = _MAX_STORED_MESSAGES if summarizer else _WINDOW_MESSAGES
 
     def _history_key(self, user_id: str, session_id: str) -> str:
-        return f"{self._HISTORY_PREFIX}:{user_id}:{session_id}"
+        return f"{self._LOG_PREFIX}:{user_id}:{session_id}"
+
+    def _summary_key(self, user_id: str, session_id: str) -> str:
+        return f"{self._SUMMARY_PREFIX}:{user_id}:{session_id}"
 
     def _active_key(self, user_id: str) -> str:
         return f"{self._ACTIVE_PREFIX}:{user_id}"
@@ -101,64 +149,63 @@ class RedisMemoryService:
         return value if isinstance(value, str) else value.decode()
 
     @staticmethod
-    def _trim(messages: list[ChatMessage]) -> list[ChatMessage]:
+    def _select_history(messages: list[ChatMessage], summary: str, token_budget: int) -> list[dict]:
         """
-        Apply both the turn-count window AND the token-char budget.
-
-        Order of operations:
-          1. Trim to MAX_TURNS exchanges (most recent kept).
-          2. Trim further if total chars exceed TOKEN_CHAR_BUDGET
-             (drop oldest pairs first to preserve the most recent context).
+        Newest user+assistant pairs that fit the token budget, oldest first,
+        preceded by the rolling summary when there is one.
 
-        Pairs are always dropped together (user + assistant) so the
-        history stays well-formed for the OpenAI messages array.
+        Pairs are always kept or dropped together so the history stays
+        well-formed for the OpenAI messages array.
         """
-        # Step 1 — sliding window
-        max_msgs = MAX_TURNS * 2
-        if len(messages) > max_msgs:
-            messages = messages[-max_msgs:]
-
-        # Step 2 — token budget (drop oldest pairs until under budget)
-        while messages:
-            total_chars = sum(len(m.content) for m in messages)
-            if total_chars <= TOKEN_CHAR_BUDGET:
+        budget = token_budget
+        prefix: list[dict] = []
+        if summary:
+            summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {summary}"}
+            budget -= estimate_tokens(summary_message["content"])
+            prefix.append(summary_message)
+
+        selected: list[ChatMessage] = []
+        for end in range(len(messages), 1, -2):
+            pair = messages[end - 2:end]
+            cost = sum(estimate_tokens(m.content) for m in pair)
+            if cost > budget:
                 break
-            # Drop the oldest user+assistant pair (first 2 items)
-            messages = messages[2:]
+            budget -= cost
+            selected[:0] = pair
 
-        return messages
+        return prefix + [m.to_dict() for m in selected]
 
     async def load_session(self, user_id: str, session_id: str) -> SessionContext:
         """
         Single pipelined round-trip that:
           • reads the active session key
-          • reads the history for the requested session_id
+          • reads the window of recent messages and the rolling summary
           • deletes stale history if the session changed
           • refreshes the active session TTL
 
-        Returns a SessionContext with ready-to-use history dicts.
+        Returns a SessionContext with ready-to-use, budget-bounded history dicts.
         Call this ONCE per request, at the start of ChatbotService.ask().
         """
         active_key  = self._active_key(user_id)
         history_key = self._history_key(user_id, session_id)
+        summary_key = self._summary_key(user_id, session_id)
 
         try:
-            # One pipeline → two GETs in a single round trip
             async with self._redis.pipeline(transaction=False) as pipe:
                 pipe.get(active_key)
-                pipe.get(history_key)
-                current_session_raw, history_raw = await pipe.execute()
+                pipe.lrange(history_key, -self._keep, -1)
+                pipe.get(summary_key)
+                current_session_raw, history_raw, summary_raw = await pipe.execute()
 
-            # Fix: use _decode() to handle both str (decode_responses=True)
-            # and bytes (decode_responses=False) returned by Redis
             current_session = self._decode(current_session_raw)
             is_new_session  = current_session is not None and current_session != session_id
 
             if is_new_session:
-                old_history_key = self._history_key(user_id, current_session)
-                # Fire-and-forget delete; don't block the response on it
-                await self._redis.delete(old_history_key)
-                history_raw = None   # new session → start fresh
+                await self._redis.delete(
+                    self._history_key(user_id, current_session),
+                    self._summary_key(user_id, current_session),
+                )
+                history_raw, summary_raw = [], None   # new session → start fresh
                 logger.info(
                     "[Memory] Session switched | user=%s | %s → %s",
                     user_id, current_session, session_id,
@@ -167,12 +214,13 @@ class RedisMemoryService:
             # Refresh active-session pointer (non-blocking, best-effort)
             await self._redis.set(active_key, session_id, ex=HISTORY_TTL)
 
-            raw_list: list[dict] = json.loads(history_raw) if history_raw else []
-            messages = [ChatMessage.from_dict(d) for d in raw_list]
+            messages = [ChatMessage.from_dict(json.loads(self._decode(raw))) for raw in history_raw or []]
+            summary = self._decode(summary_raw) or ""
 
             return SessionContext(
-                history=[m.to_dict() for m in messages],
+                history=self._select_history(messages, summary, self._token_budget),
                 is_new_session=is_new_session,
+                summary=summary,
             )
 
         except Exception:
@@ -185,45 +233,79 @@ class RedisMemoryService:
         session_id: str,
         question: str,
         answer: str,
-        current_history: list[dict],
     ) -> None:
         """
-        Appends the new Q&A pair, applies trimming, then writes back to Redis.
+        Appends the new Q&A pair to the session log in one pipelined round trip.
 
-        Uses a pipeline so history + TTL refresh happen in one round trip.
-        Never calls get_history internally — caller passes current_history in.
+        Cost is independent of history length: RPUSH + LTRIM + EXPIRE + SET.
+        When older turns overflow the window and a summarizer is configured,
+        they are folded into the summary in the background.
         """
         key = self._history_key(user_id, session_id)
+        keep = self._keep
         try:
-            messages = [ChatMessage.from_dict(d) for d in current_history]
-            messages.append(ChatMessage(role="user",      content=question))
-            messages.append(ChatMessage(role="assistant", content=answer))
-
-            messages = self._trim(messages)
-
-            serialized = json.dumps([m.to_dict() for m in messages])
-
-            # Atomic pipeline: SET history + SET active key TTL together
             async with self._redis.pipeline(transaction=True) as pipe:
-                pipe.set(key, serialized, ex=HISTORY_TTL)
+                pipe.rpush(
+                    key,
+                    json.dumps(ChatMessage(role="user", content=question).to_dict()),
+                    json.dumps(ChatMessage(role="assistant", content=answer).to_dict()),
+                )
+                pipe.ltrim(key, -keep, -1)
+                pipe.expire(key, HISTORY_TTL)
+                pipe.expire(self._summary_key(user_id, session_id), HISTORY_TTL)
                 pipe.set(self._active_key(user_id), session_id, ex=HISTORY_TTL)
-                await pipe.execute()
+                length, *_ = await pipe.execute()
 
             logger.info(
-                "[Memory] save_turn | user=%s | session=%s | turns=%d | chars=%d",
-                user_id, session_id, len(messages) // 2, len(serialized),
+                "[Memory] save_turn | user=%s | session=%s | stored_messages=%d",
+                user_id, session_id, min(length, keep),
             )
 
+            if self._summarizer and length >= _WINDOW_MESSAGES + SUMMARY_BATCH_TURNS * 2:
+                task = asyncio.create_task(self._summarize_overflow(user_id, session_id))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+
         except Exception:
             logger.exception("[Memory] save_turn failed | user=%s | session=%s", user_id, session_id)
 
+    async def _summarize_overflow(self, user_id: str, session_id: str) -> None:
+        """Fold the oldest SUMMARY_BATCH_TURNS turns of the log into the rolling summary."""
+        key = self._history_key(user_id, session_id)
+        summary_key = self._summary_key(user_id, session_id)
+        count = SUMMARY_BATCH_TURNS * 2
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.lrange(key, 0, count - 1)
+                pipe.get(summary_key)
+                oldest_raw, summary_raw = await pipe.execute()
+            if len(oldest_raw) < count:
+                return
+
+            oldest = [json.loads(self._decode(raw)) for raw in oldest_raw]
+            summary = await self._summarizer.summarize(self._decode(summary_raw) or "", oldest)
+
+            await self._redis.eval(
+                _COMMIT_SUMMARY_SCRIPT, 2, key, summary_key,
+                count, self._decode(oldest_raw[-1]), summary, HISTORY_TTL,
+            )
+            logger.info(
+                "[Memory] summarized | user=%s | session=%s | messages=%d | summary_len=%d",
+                user_id, session_id, count, len(summary),
+            )
+
+        except Exception:
+            logger.exception("[Memory] summarize failed | user=%s | session=%s", user_id, session_id)
+
     async def clear_session(self, user_id: str, session_id: str) -> None:
         """
         Explicitly wipe a session (e.g. user clicks 'New Chat').
         """
-        key = self._history_key(user_id, session_id)
         try:
-            await self._redis.delete(key)
+            await self._redis.delete(
+                self._history_key(user_id, session_id),
+                self._summary_key(user_id, session_id),
+            )
             logger.info("[Memory] clear_session | user=%s | session=%s", user_id, session_id)
         except Exception:
             logger.exception("[Memory] clear_session failed | user=%s | session=%s", user_id, session_id)
@@ -239,4 +321,4 @@ class RedisMemoryService:
             return self._decode(raw)
         except Exception:
             logger.exception("[Memory] get_session_meta failed | user=%s", user_id)
-            return None
\ No newline at end of file
+            return None
@@ -1,13 +1,16 @@
 import re
-import io
-import pdfplumber
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from pinecone import Pinecone, ServerlessSpec
+from pinecone import ServerlessSpec
 from app.tasks.incident_tasks import get_openai_embedding_service
+from app.core.clients import clients
+from app.core.config import settings
+from app.utils.logger import logger
+from typing import Awaitable, Callable, Optional
 import os
 import asyncio
+import hashlib
 
 
 
@@ -15,7 +18,14 @@ PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_INDEX   = os.getenv("PINECONE_RAG_INDEX_NAME")
 PINECONE_REGION  = "us-east-1"
 
-pinecone_client = Pinecone(api_key=PINECONE_API_KEY)
+# Keeps one embeddings request well under the API's per-request token limit
+EMBED_BATCH_MAX_CHARS = 200_000
+
+# Chunk vector ids are "{source key}#{content hash}", so a source's stored
+# chunks can be listed by prefix and an unchanged chunk keeps its id
+CHUNK_ID_SEPARATOR = "#"
+# Ordinal ids ("chunk_<n>") written before content-addressed ids
+LEGACY_CHUNK_ID_PREFIX = "chunk_"
 
 
 class QueryRequest(BaseModel):
@@ -23,17 +33,6 @@ class QueryRequest(BaseModel):
     top_k: int = 3
 
 
-def _extract_text(file_bytes: bytes) -> str:
-    """Extract all text from PDF bytes using pdfplumber."""
-    pages = []
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                pages.append(text)
-    return "\n".join(pages)
-
-
 def _is_section_title(line: str) -> bool:
     """Detect headings by ALL CAPS convention."""
     stripped = line.strip()
@@ -50,9 +49,6 @@ def _is_section_title(line: str) -> bool:
     no_end_punct = not stripped.endswith(('.', '?', '!'))
     word_count = 1 <= len(stripped.split()) <= 10
 
-    # Debug every line being checked
-    print(f"  checking | caps={is_all_caps} short={is_short} punct={no_end_punct} words={word_count} | '{stripped}'")
-
     return is_all_caps and is_short and no_end_punct and word_count
 
 
@@ -62,16 +58,8 @@ def _chunk_text(text: str) -> list[dict]:
     lines = text.splitlines()
     chunks, current_title, current_content = [], None, []
 
-    print("\n" + "="*60)
-    print("📄 RAW EXTRACTED LINES:")
-    print("="*60)
-    for i, line in enumerate(lines):
-        print(f"  [{i:03}] {repr(line)}")
-    print("="*60 + "\n")
-
     for line in lines:
         if _is_section_title(line):
-            print(f"✅ HEADING DETECTED: '{line.strip()}'")
             if current_title is not None:
                 chunks.append(_build_chunk(len(chunks) + 1, current_title, current_content))
             current_title = line.strip()
@@ -82,14 +70,7 @@ def _chunk_text(text: str) -> list[dict]:
     if current_title is not None and current_content:
         chunks.append(_build_chunk(len(chunks) + 1, current_title, current_content))
 
-    # Debug summary
-    print(f"\n{'='*60}")
-    print(f"📦 TOTAL CHUNKS CREATED: {len(chunks)}")
-    print(f"{'='*60}")
-    for chunk in chunks:
-        print(f"\n🔹 Chunk {chunk['chunk_id']}: '{chunk['title']}'")
-        print(f"   Content preview: {chunk['content'][:120].strip()}...")
-    print(f"{'='*60}\n")
+    logger.debug(f"Chunked {len(lines)} lines into {len(chunks)} sections")
 
     return chunks
 
@@ -102,38 +83,134 @@ def _build_chunk(chunk_id: int, title: str, content_lines: list[str]) -> dict:
     }
 
 
-async def _embed(texts: list[str]) -> list[list[float]]:
+def _embedding_batches(texts: list[str]) -> list[tuple[int, list[str]]]:
+    """Group texts into (offset, batch) pairs bounded by item count and size."""
+    batches, current, current_chars, offset = [], [], 0, 0
+    for text in texts:
+        if current and (
+            len(current) >= settings.RAG_EMBED_BATCH_SIZE
+            or current_chars + len(text) > EMBED_BATCH_MAX_CHARS
+        ):
+            batches.append((offset, current))
+            offset += len(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+    if current:
+        batches.append((offset, current))
+    return batches
+
+
+async def _embed(
+    texts: list[str],
+    on_batch: Optional[Callable[[int, list[list[float]]], Awaitable[None]]] = None,
+) -> list[list[float]]:
+    """Embed texts with one request per batch, a few batches in flight at once.
+
+    on_batch is awaited with (offset, embeddings) as each batch completes.
+    """
     embedding_service = get_openai_embedding_service()
-    return await asyncio.gather(*[embedding_service.generate(text) for text in texts])
+    semaphore = asyncio.Semaphore(settings.RAG_EMBED_CONCURRENCY)
+    embeddings: list = [None] * len(texts)
+
+    async def embed_batch(offset: int, batch: list[str]) -> None:
+        async with semaphore:
+            vectors = await embedding_service.generate_batch(batch)
+        embeddings[offset:offset + len(vectors)] = vectors
+        if on_batch is not None:
+            await on_batch(offset, vectors)
+
+    await asyncio.gather(*(embed_batch(offset, batch) for offset, batch in _embedding_batches(texts)))
+    return embeddings
 
 
 def _get_or_create_index():
     """Return the Pinecone index, creating it if it doesn't exist."""
-    existing = [i.name for i in pinecone_client.list_indexes()]
+    existing = [i.name for i in clients.pinecone.list_indexes()]
     if PINECONE_INDEX not in existing:
-        pinecone_client.create_index(
+        clients.pinecone.create_index(
             name=PINECONE_INDEX,
             dimension=1024,
             metric="cosine",
             spec=ServerlessSpec(cloud="aws", region=PINECONE_REGION),
         )
-    return pinecone_client.Index(PINECONE_INDEX)
+    return clients.pinecone_index(PINECONE_INDEX)
+
+
+def _source_key(source: str) -> str:
+    """Stable, id-safe key for a source document (e.g. its filename)."""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return re.sub(r"[^a-z0-9]+", "-", stem.lower()).strip("-")[:100] or "document"
 
 
-def _upsert_chunks(chunks: list[dict], embeddings: list[list[float]]) -> int:
-    """Upsert chunk vectors into Pinecone. Returns number of vectors upserted."""
-    index = _get_or_create_index()
-    vectors = [
+def _content_hash(content: str) -> str:
+    """Hash of the chunk text with whitespace normalized, so re-extraction noise is not a change."""
+    normalized = " ".join(content.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def _assign_chunk_ids(chunks: list[dict], source: str) -> list[dict]:
+    """Give each chunk its content-addressed vector id; identical chunks collapse into one."""
+    source_key = _source_key(source)
+    unique: dict[str, dict] = {}
+    for chunk in chunks:
+        content_hash = _content_hash(chunk["content"])
+        vector_id = f"{source_key}{CHUNK_ID_SEPARATOR}{content_hash}"
+        unique.setdefault(vector_id, {**chunk, "id": vector_id, "source": source, "content_hash": content_hash})
+    return list(unique.values())
+
+
+def _list_source_chunk_ids(source: str, index=None) -> set[str]:
+    """Ids of every chunk currently stored for the source."""
+    index = index or _get_or_create_index()
+    prefix = f"{_source_key(source)}{CHUNK_ID_SEPARATOR}"
+    return {chunk_id for page in index.list(prefix=prefix) for chunk_id in page}
+
+
+def _list_legacy_chunk_ids(index=None) -> list[str]:
+    """Ids of chunks still stored under the old ordinal "chunk_<n>" scheme."""
+    index = index or _get_or_create_index()
+    return sorted(chunk_id for page in index.list(prefix=LEGACY_CHUNK_ID_PREFIX) for chunk_id in page)
+
+
+def _plan_source_sync(chunks: list[dict], stored_ids: set[str]) -> tuple[list[dict], list[str]]:
+    """(chunks to embed and upsert, stored ids to delete) for one source."""
+    current_ids = {c["id"] for c in chunks}
+    changed = [c for c in chunks if c["id"] not in stored_ids]
+    stale = sorted(stored_ids - current_ids)
+    return changed, stale
+
+
+def _delete_chunks(chunk_ids: list[str], index=None) -> int:
+    """Delete chunk vectors from Pinecone in batches. Returns number of ids deleted."""
+    index = index or _get_or_create_index()
+    batch_size = settings.RAG_UPSERT_BATCH_SIZE
+    for start in range(0, len(chunk_ids), batch_size):
+        index.delete(ids=chunk_ids[start:start + batch_size])
+    return len(chunk_ids)
+
+
+def _chunk_vectors(chunks: list[dict], embeddings: list[list[float]]) -> list[dict]:
+    return [
         {
-            "id": f"chunk_{c['chunk_id']}",
+            "id": c["id"],
             "values": emb,
             "metadata": {
-                "chunk_id": c["chunk_id"],
                 "title": c["title"],
                 "content": c["content"],
+                "source": c["source"],
+                "content_hash": c["content_hash"],
             },
         }
         for c, emb in zip(chunks, embeddings)
     ]
-    index.upsert(vectors=vectors)
-    return len(vectors)
\ No newline at end of file
+
+
+def _upsert_chunks(chunks: list[dict], embeddings: list[list[float]], index=None) -> int:
+    """Upsert chunk vectors into Pinecone in batches. Returns number of vectors upserted."""
+    index = index or _get_or_create_index()
+    vectors = _chunk_vectors(chunks, embeddings)
+    batch_size = settings.RAG_UPSERT_BATCH_SIZE
+    for start in range(0, len(vectors), batch_size):
+        index.upsert(vectors=vectors[start:start + batch_size])
+    return len(vectors)
@@ -0,0 +1,320 @@
+"""
+semantic_cache_service.py
+─────────────────────────────────────────────────────────────────────────────
+Semantic answer cache for the FAQ chatbot.
+
+Residents ask the same questions over and over in slightly different words.
+Grounded answers are cached together with their question embedding, and a new
+question whose embedding is within SEMANTIC_CACHE_THRESHOLD (cosine) of a
+cached one gets that answer without a Pinecone query or an LLM call.
+
+Design decisions
+────────────────
+1. TWO LOOKUP LEVELS — an exact match on the normalised question text is
+   checked first and skips even the embedding call; otherwise the question
+   embedding is compared against every cached entry.
+
+2. LOCAL INDEX — entries live in Redis, but each process keeps a normalised
+   float32 matrix of the cached embeddings and scores a question with one
+   matrix-vector product. A Redis version counter tells processes when to
+   sync, and only added/removed entries are transferred.
+
+3. CONTEXT-FREE ENTRIES — only grounded answers produced without chat
+   history are stored, so a cached answer never depends on someone else's
+   earlier turns.
+
+4. CHUNK INVALIDATION — every entry is indexed by the RAG chunk ids it was
+   answered from. Re-indexing a chunk drops every answer built on it.
+
+Key schema
+──────────
+semcache:entries            →  hash entry_id → JSON {question, answer, chunk_ids, created_at, vector}
+semcache:created            →  zset entry_id → created_at, for pruning oldest-first
+semcache:q:{sha1}           →  entry_id for an exact normalised question
+semcache:chunk:{chunk_id}   →  set of entry_ids answered from that chunk (expires with its entries)
+semcache:version            →  bumped on every add / removal
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.domain.chatbot.rag_service import RAGResponse
+from app.domain.value_objects.rag_retrieval_result import RAGRetrievalResult
+from app.utils.logger import logger
+
+# Keys deleted per round-trip when clearing the whole cache
+_CLEAR_BATCH = 500
+
+
+def normalize_question(question: str) -> str:
+    text = re.sub(r"\s+", " ", question.strip().lower())
+    return text.rstrip("?!. ")
+
+
+class SemanticAnswerCache:
+    _PREFIX = "semcache"
+
+    def __init__(
+        self,
+        client: aioredis.Redis,
+        threshold: float,
+        ttl_seconds: int,
+        max_entries: int,
+    ) -> None:
+        self._redis = client
+        self._threshold = threshold
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+
+        # Process-local index, synced from Redis when the version changes
+        self._version: Optional[int] = None
+        self._ids: List[str] = []
+        self._entries: Dict[str, dict] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._lock = asyncio.Lock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    # ── Keys ────────────────────────────────────────────────────────────────
+
+    @property
+    def _entries_key(self) -> str:
+        return f"{self._PREFIX}:entries"
+
+    @property
+    def _created_key(self) -> str:
+        return f"{self._PREFIX}:created"
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self._PREFIX}:version"
+
+    def _question_key(self, question: str) -> str:
+        digest = hashlib.sha1(normalize_question(question).encode("utf-8")).hexdigest()
+        return f"{self._PREFIX}:q:{digest}"
+
+    def _chunk_key(self, chunk_id: str) -> str:
+        return f"{self._PREFIX}:chunk:{chunk_id}"
+
+    # ── Helpers ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("created_at", 0) < self._ttl_seconds
+
+    @staticmethod
+    def _to_response(entry: dict, score: float) -> RAGResponse:
+        sources = [
+            RAGRetrievalResult(chunk_id=chunk_id, text="", source="semantic_cache", score=score, metadata={})
+            for chunk_id in entry.get("chunk_ids", [])
+        ]
+        return RAGResponse(answer=entry["answer"], sources=sources, is_grounded=True)
+
+    # ── Local index sync ────────────────────────────────────────────────────
+
+    async def _sync(self) -> None:
+        version = int(await self._redis.get(self._version_key) or 0)
+        if version == self._version:
+            return
+        async with self._lock:
+            if version == self._version:
+                return
+            remote_ids = set(await self._redis.hkeys(self._entries_key))
+            new_ids = [entry_id for entry_id in remote_ids if entry_id not in self._entries]
+            for entry_id in list(self._entries):
+                if entry_id not in remote_ids:
+                    del self._entries[entry_id]
+            if new_ids:
+                raw_entries = await self._redis.hmget(self._entries_key, new_ids)
+                for entry_id, raw in zip(new_ids, raw_entries):
+                    if not raw:
+                        continue
+                    entry = json.loads(raw)
+                    entry["vector"] = np.frombuffer(base64.b64decode(entry["vector"]), dtype=np.float32)
+                    self._entries[entry_id] = entry
+
+            self._ids = list(self._entries)
+            self._matrix = (
+                np.vstack([self._entries[entry_id]["vector"] for entry_id in self._ids])
+                if self._ids else np.zeros((0, 0), dtype=np.float32)
+            )
+            self._version = version
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+
+    async def get_exact(self, question: str) -> Optional[RAGResponse]:
+        """Answer for a previously seen question with the same normalised text."""
+        try:
+            entry_id = await self._redis.get(self._question_key(question))
+            if not entry_id:
+                return None
+            raw = await self._redis.hget(self._entries_key, entry_id)
+            if not raw:
+                return None
+            entry = json.loads(raw)
+            if not self._is_fresh(entry):
+                return None
+            self.exact_hits += 1
+            return self._to_response(entry, 1.0)
+        except Exception as e:
+            logger.warning(f"Semantic cache exact lookup failed: {e}")
+            return None
+
+    async def get_similar(self, embedding: List[float]) -> Optional[RAGResponse]:
+        """Answer for the closest cached question within the cosine threshold."""
+        try:
+            await self._sync()
+            if not self._ids:
+                self.misses += 1
+                return None
+            query = self._unit(embedding)
+            if query.shape[0] != self._matrix.shape[1]:
+                self.misses += 1
+                return None
+            scores = self._matrix @ query
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            entry = self._entries[self._ids[best]]
+            if score < self._threshold or not self._is_fresh(entry):
+                self.misses += 1
+                return None
+            self.semantic_hits += 1
+            logger.info(f"Semantic cache hit (score={score:.3f}) for: {entry['question'][:80]}")
+            return self._to_response(entry, score)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    # ── Write ───────────────────────────────────────────────────────────────
+
+    async def store(self, question: str, embedding: List[float], response: RAGResponse) -> None:
+        """Cache a grounded answer under its question and source chunks."""
+        if response.is_fallback or not response.is_grounded or not response.sources:
+            return
+        entry_id = uuid.uuid4().hex
+        chunk_ids = sorted({source.chunk_id for source in response.sources})
+        created_at = time.time()
+        entry = {
+            "question": question,
+            "answer": response.answer,
+            "chunk_ids": chunk_ids,
+            "created_at": created_at,
+            "vector": base64.b64encode(self._unit(embedding).tobytes()).decode("ascii"),
+        }
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.hset(self._entries_key, entry_id, json.dumps(entry))
+            pipe.zadd(self._created_key, {entry_id: created_at})
+            pipe.set(self._question_key(question), entry_id, ex=self._ttl_seconds)
+            for chunk_id in chunk_ids:
+                pipe.sadd(self._chunk_key(chunk_id), entry_id)
+                # Outlives every entry in the set, so an idle chunk's set goes away on its own
+                pipe.expire(self._chunk_key(chunk_id), self._ttl_seconds)
+            pipe.incr(self._version_key)
+            pipe.zcard(self._created_key)
+            *_, size = await pipe.execute()
+            if size > self._max_entries:
+                await self._prune()
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
+
+    async def _prune(self) -> None:
+        """Drop expired entries, then the oldest ones, until under max_entries."""
+        cutoff = time.time() - self._ttl_seconds
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zcount(self._created_key, "-inf", cutoff)
+        pipe.zcard(self._created_key)
+        expired, size = await pipe.execute()
+        # Expired entries have the lowest scores, so the oldest `count` covers them too
+        count = max(expired, size - self._max_entries)
+        if count <= 0:
+            return
+        stale = await self._redis.zrange(self._created_key, 0, count - 1)
+        await self._remove(stale)
+
+    async def _remove(self, entry_ids: Iterable[str]) -> int:
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return 0
+        raw_entries = await self._redis.hmget(self._entries_key, entry_ids)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hdel(self._entries_key, *entry_ids)
+        pipe.zrem(self._created_key, *entry_ids)
+        for entry_id, raw in zip(entry_ids, raw_entries):
+            for chunk_id in json.loads(raw).get("chunk_ids", []) if raw else []:
+                pipe.srem(self._chunk_key(chunk_id), entry_id)
+        pipe.incr(self._version_key)
+        await pipe.execute()
+        # Question keys pointing at removed ids are treated as misses and expire on their own
+        return len(entry_ids)
+
+    async def invalidate_chunks(self, chunk_ids: Iterable[str]) -> int:
+        """Drop every cached answer built from any of these chunks."""
+        keys = [self._chunk_key(chunk_id) for chunk_id in chunk_ids]
+        if not keys:
+            return 0
+        try:
+            entry_ids = await self._redis.sunion(keys)
+            removed = await self._remove(entry_ids)
+            await self._redis.delete(*keys)
+            if removed:
+                logger.info(f"Semantic cache invalidated {removed} answers for {len(keys)} re-indexed chunks")
+            return removed
+        except Exception as e:
+            logger.warning(f"Semantic cache invalidation failed: {e}")
+            return 0
+
+    async def clear(self) -> int:
+        """Drop every cached answer, e.g. after the whole corpus was purged."""
+        removed = 0
+        keys = []
+        async for key in self._redis.scan_iter(match=f"{self._PREFIX}:*", count=_CLEAR_BATCH):
+            # The version survives so every process notices the clear and resyncs
+            if key != self._version_key:
+                keys.append(key)
+            if len(keys) >= _CLEAR_BATCH:
+                removed += await self._redis.delete(*keys)
+                keys = []
+        if keys:
+            removed += await self._redis.delete(*keys)
+        await self._redis.incr(self._version_key)
+        logger.info(f"Semantic cache cleared. keys={removed}")
+        return removed
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._ids),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+semantic_answer_cache = SemanticAnswerCache(
+    client=redis_client,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+)
@@ -1,4 +1,5 @@
 import httpx
+from app.core.clients import clients
 from app.core.config import settings
 from app.schemas.sms_schema import SendSMSRequest
 from datetime import datetime, timedelta
@@ -18,8 +19,7 @@ async def send_sms(sms_data: SendSMSRequest) -> dict:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post(settings.PHILSMS_API_URL, json=payload, headers=headers)
+        response = await clients.http.post(settings.PHILSMS_API_URL, json=payload, headers=headers)
 
         try:
             data = response.json()
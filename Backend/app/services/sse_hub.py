@@ -0,0 +1,173 @@
+"""In-process SSE connection hub.
+
+Holds the live SSE streams of one API process and fans frames out to them.
+Frames are encoded to bytes once and the same object is handed to every
+subscriber queue. Connection counts are maintained incrementally, fan-out
+never copies the subscriber sets, and keepalives for all streams come from a
+single shared timer instead of a timeout per connection. Redis transport
+lives in SSEManager; this module has no I/O of its own.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+from app.utils.logger import logger
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+# Queue sentinel used to force-close a stream.
+CLOSE_STREAM = None
+
+# Queue items are (stream id or None, encoded frame).
+Message = Tuple[Optional[Tuple[int, int]], bytes]
+
+
+def encode_event(event: str, data: str, event_id: Optional[str] = None) -> bytes:
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {event}\ndata: {data}\n\n".encode()
+
+
+# Tells the client it may have missed events and should refetch its inbox.
+RESYNC_OVERFLOW = encode_event("resync", json.dumps({"reason": "overflow"}))
+RESYNC_GAP = encode_event("resync", json.dumps({"reason": "gap"}))
+
+
+class SSEHub:
+    def __init__(self, queue_size: int = 100, keepalive_seconds: float = 30):
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self._users: Dict[str, Set[asyncio.Queue]] = {}
+        self._connection_count = 0
+        self._overflows = 0
+        self._keepalive_task: asyncio.Task | None = None
+
+    @property
+    def connection_count(self) -> int:
+        return self._connection_count
+
+    @property
+    def user_count(self) -> int:
+        return len(self._users)
+
+    def user_ids(self) -> Iterable[str]:
+        return self._users.keys()
+
+    def stats(self) -> dict:
+        return {
+            "connections": self._connection_count,
+            "users": len(self._users),
+            "overflows": self._overflows,
+        }
+
+    def register(self, user_id: str) -> Tuple[asyncio.Queue, bool]:
+        """Add a stream for user_id; returns its queue and whether it is the user's first."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        queues = self._users.get(user_id)
+        first = queues is None
+        if first:
+            queues = self._users[user_id] = set()
+        queues.add(queue)
+        self._connection_count += 1
+        self._ensure_keepalive()
+        return queue, first
+
+    def unregister(self, user_id: str, queue: asyncio.Queue) -> bool:
+        """Remove a stream; returns True when it was the user's last one."""
+        queues = self._users.get(user_id)
+        if queues is None or queue not in queues:
+            return False
+        queues.discard(queue)
+        self._connection_count -= 1
+        if queues:
+            return False
+        del self._users[user_id]
+        return True
+
+    def offer(self, queue: asyncio.Queue, message: Message | None) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client is not keeping up; replace the backlog with a resync
+            # (or the close request) rather than silently dropping events.
+            while not queue.empty():
+                queue.get_nowait()
+            if message is CLOSE_STREAM:
+                queue.put_nowait(CLOSE_STREAM)
+            else:
+                queue.put_nowait((None, RESYNC_OVERFLOW))
+                self._overflows += 1
+
+    # Fan-out is synchronous: nothing awaits while iterating, so the sets
+    # cannot change underneath and need neither a lock nor a copy.
+    def publish_user(self, user_id: str, message: Message) -> int:
+        queues = self._users.get(user_id)
+        if not queues:
+            return 0
+        for queue in queues:
+            self.offer(queue, message)
+        return len(queues)
+
+    def publish_all(self, message: Message) -> int:
+        for queues in self._users.values():
+            for queue in queues:
+                self.offer(queue, message)
+        return self._connection_count
+
+    def close_user(self, user_id: str) -> int:
+        queues = self._users.get(user_id, ())
+        for queue in queues:
+            self.offer(queue, CLOSE_STREAM)
+        return len(queues)
+
+    def send_keepalives(self) -> int:
+        """Queue a keepalive on every idle stream; busy streams already have traffic."""
+        sent = 0
+        for queues in self._users.values():
+            for queue in queues:
+                if queue.empty():
+                    queue.put_nowait((None, KEEPALIVE_FRAME))
+                    sent += 1
+        return sent
+
+    def _ensure_keepalive(self) -> None:
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.keepalive_seconds)
+                try:
+                    self.send_keepalives()
+                except Exception as e:
+                    logger.exception(f"SSE keepalive tick failed: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self) -> None:
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    async def frames(
+        self,
+        queue: asyncio.Queue,
+        replay: Iterable[bytes] = (),
+        replayed_until: Optional[Tuple[int, int]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield replayed frames, then live frames until the stream is closed.
+
+        Live events whose stream id is not newer than replayed_until were
+        already sent as part of the replay and are skipped.
+        """
+        for frame in replay:
+            yield frame
+        while True:
+            message = await queue.get()
+            if message is CLOSE_STREAM:
+                return
+            event_id, frame = message
+            if event_id is not None and replayed_until is not None and event_id <= replayed_until:
+                continue
+            yield frame
@@ -1,64 +1,93 @@
 import asyncio
 import json
-from typing import Any, Dict, Set
+import re
+import time
+from typing import Any, List, Optional, Tuple
 from fastapi.responses import StreamingResponse
-import redis.asyncio as aioredis
 from app.core.config import settings
+from app.core.redis import pubsub_client, redis_client
 from app.utils.logger import logger
+from app.services.sse_hub import RESYNC_GAP, SSEHub, encode_event
+from app.utils.redis_pub import (
+    BROADCAST_CHANNEL,
+    USER_CHANNEL_PREFIX,
+    publish_user_sse_event,
+    user_channel,
+    user_stream,
+)
+
+STREAM_ID_PATTERN = re.compile(r"^(\d+)-(\d+)$")
+
+
+def _parse_stream_id(value) -> Optional[Tuple[int, int]]:
+    if isinstance(value, bytes):
+        value = value.decode()
+    match = STREAM_ID_PATTERN.match(value or "")
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
 
 
 class SSEManager:
-    def __init__(self, redis_url: str = settings.REDIS_URL):
-        self.redis_url = redis_url
-        self._redis: aioredis.Redis | None = None
-        self._connections: Dict[str, Set[asyncio.Queue]] = {}
+    """Relays Redis-published events to the SSE streams held by this process.
+
+    Each user's events go to their own channel, and a process only subscribes
+    to the channels of users it currently streams to: the first stream for a
+    user subscribes, the last one to close unsubscribes. Processes therefore
+    never receive or decode events for users connected elsewhere.
+
+    User events are also appended to a capped per-user Redis Stream whose entry
+    IDs double as SSE ids, so a reconnecting client sending Last-Event-ID is
+    replayed what it missed. Broadcasts carry no id and are not replayed.
+
+    Local streams and fan-out are handled by SSEHub.
+    """
+
+    def __init__(self):
+        self._redis = redis_client
+        self._hub = SSEHub(queue_size=settings.SSE_QUEUE_SIZE)
         self._listener_task: asyncio.Task | None = None
         self._pubsub = None
         self._lock = asyncio.Lock()
 
-    # Queue sentinel used to force-close a single user's active streams.
-    _CLOSE_STREAM = None
-
     async def connect_redis(self):
-        if not self._redis:
-            self._redis = await aioredis.from_url(self.redis_url)
-        else:
-            try:
-                await self._redis.ping()
-            except Exception:
-                self._redis = await aioredis.from_url(self.redis_url)
-                
-        if not self._redis:
-            logger.info(f"SSE Redis connect attempt. redis_url={self.redis_url}")
-            self._redis = await aioredis.from_url(self.redis_url)
-            logger.info("Connected to Redis for SSEManager.")
+        # Connections come from the shared pools; only the listener needs starting
         if not self._listener_task:
+            await self._start_listener()
+
+    async def _start_listener(self):
+        """Open the pubsub connection, subscribe to every channel this process needs and start listening."""
+        async with self._lock:
+            if self._listener_task:
+                return
+            self._pubsub = pubsub_client.pubsub()
+            channels = [BROADCAST_CHANNEL] + [user_channel(user_id) for user_id in self._hub.user_ids()]
+            await self._pubsub.subscribe(*channels)
             self._listener_task = asyncio.create_task(self._redis_listener())
-            logger.info("Started Redis listener task for SSEManager.")
+        logger.info(f"Started Redis listener task for SSEManager. channels={len(channels)}")
 
     async def _redis_listener(self):
         try:
-            redis = self._redis
-            self._pubsub = redis.pubsub()
-            await self._pubsub.subscribe("sse:user", "sse:broadcast")
-            logger.info("Subscribed to Redis channels for SSEManager.")
             async for message in self._pubsub.listen():
                 if message["type"] != "message":
                     continue
                 try:
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
                     payload = json.loads(message["data"])
-                    target = payload.get("target")
                     event = payload.get("event", "message")
-                    data = payload.get("data", {})
-                    logger.info(
-                        "SSE Redis message received. "
-                        f"channel={message.get('channel')} target={target} event={event}"
-                    )
-                    formatted = f"event: {event}\ndata: {json.dumps(data)}\n\n"
-                    if target == "broadcast":
-                        await self._fan_out_all(formatted)
-                    else:
-                        await self._fan_out_user(str(target), formatted)
+                    # Encoded once; every subscriber queue shares the same bytes object
+                    if channel == BROADCAST_CHANNEL:
+                        frame = encode_event(event, json.dumps(payload.get("data", {})))
+                        self._hub.publish_all((None, frame))
+                    elif channel.startswith(USER_CHANNEL_PREFIX):
+                        # User events arrive with their stream ID and data already JSON-encoded
+                        event_id = payload.get("id")
+                        frame = encode_event(event, payload.get("data", "{}"), event_id)
+                        self._hub.publish_user(
+                            channel[len(USER_CHANNEL_PREFIX):],
+                            (_parse_stream_id(event_id), frame),
+                        )
                 except Exception as e:
                     logger.exception(f"Error processing SSE message: {e}")
                     continue
@@ -68,95 +97,124 @@ class SSEManager:
             logger.exception(f"Error in SSE listener: {e}")
             await asyncio.sleep(1)
             logger.info("Restarting SSE Redis listener task after failure.")
-            self._listener_task = asyncio.create_task(self._redis_listener())
+            try:
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._listener_task = None
+            try:
+                await self._start_listener()
+            except Exception as reconnect_error:
+                # The next stream() call retries through connect_redis
+                logger.exception(f"Failed to restart SSE listener: {reconnect_error}")
+
+    async def _subscribe_user(self, user_id: str):
+        # Called with self._lock held, so it is ordered against the matching unsubscribe
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.subscribe(user_channel(user_id))
+        except Exception as e:
+            logger.warning(f"SSE subscribe failed. user_id={user_id}: {e}")
 
-    async def _fan_out_user(self, user_id: str, message: str):
-        async with self._lock:
-            queues = self._connections.get(user_id, set()).copy()
-        logger.info(f"SSE fan-out to user. user_id={user_id} subscribers={len(queues)}")
-        for queue in queues:
-            await self._safe_put(queue, message)
+    async def _unsubscribe_user(self, user_id: str):
+        # Called with self._lock held
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(user_channel(user_id))
+        except Exception as e:
+            logger.warning(f"SSE unsubscribe failed. user_id={user_id}: {e}")
 
-    async def _fan_out_all(self, message: str):
-        async with self._lock:
-            all_queues = [queue for queues in self._connections.values() for queue in queues]
-        logger.info(f"SSE broadcast fan-out. subscribers={len(all_queues)}")
-        for queue in all_queues:
-            await self._safe_put(queue, message)
+    async def _replay(self, user_id: str, last_event_id: Optional[str]) -> Tuple[List[bytes], Optional[Tuple[int, int]]]:
+        """Frames recorded after last_event_id, and the ID of the last one replayed."""
+        if not last_event_id:
+            return [], None
+        last = _parse_stream_id(last_event_id)
+        if last is None:
+            return [RESYNC_GAP], None
 
-    async def _safe_put(self, queue: asyncio.Queue, message: str | None):
+        key = user_stream(user_id)
         try:
-            queue.put_nowait(message)
-        except asyncio.QueueFull:
-            pass
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.xlen(key)
+            pipe.xrange(key, min="-", max="+", count=1)
+            pipe.xrange(key, min=f"({last_event_id}", max="+")
+            length, oldest, entries = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"SSE replay failed. user_id={user_id}: {e}")
+            return [RESYNC_GAP], None
+
+        if not oldest:
+            # The stream expires only after SSE_REPLAY_TTL_SECONDS without events
+            if time.time() * 1000 - last[0] > settings.SSE_REPLAY_TTL_SECONDS * 1000:
+                return [RESYNC_GAP], None
+            return [], last
+
+        # Trimming keeps at least SSE_REPLAY_MAXLEN entries, so a shorter stream lost nothing
+        if _parse_stream_id(oldest[0][0]) > last and length >= settings.SSE_REPLAY_MAXLEN:
+            return [RESYNC_GAP], None
+
+        frames = []
+        replayed_until = last
+        for entry_id, fields in entries:
+            entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            fields = {
+                (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                for k, v in fields.items()
+            }
+            frames.append(encode_event(fields.get("event", "message"), fields.get("data", "{}"), entry_id))
+            replayed_until = _parse_stream_id(entry_id)
+        return frames, replayed_until
 
     async def disconnect_user(self, user_id: str | int):
         user_id = str(user_id)
-        async with self._lock:
-            queues = list(self._connections.get(user_id, set()))
+        closed = self._hub.close_user(user_id)
+        logger.info(f"SSE disconnect requested for user. user_id={user_id} subscribers={closed}")
 
-        for queue in queues:
-            await self._safe_put(queue, self._CLOSE_STREAM)
-
-        logger.info(
-            f"SSE disconnect requested for user. user_id={user_id} subscribers={len(queues)}"
-        )
+    def stats(self) -> dict:
+        return self._hub.stats()
 
     async def send(self, user_id: str | int, data: Any, event: str = "message"):
         await self.connect_redis()
-        payload = json.dumps({"target": str(user_id), "event": event, "data": data})
-        listeners = await self._redis.publish("sse:user", payload)
-        logger.info(
-            f"SSE publish user event. user_id={user_id} event={event} redis_listeners={listeners}"
-        )
+        event_id = await publish_user_sse_event(user_id, event, data, client=self._redis)
+        logger.info(f"SSE publish user event. user_id={user_id} event={event} id={event_id}")
 
     async def broadcast(self, data: Any, event: str = "message"):
         await self.connect_redis()
         payload = json.dumps({"target": "broadcast", "event": event, "data": data})
-        listeners = await self._redis.publish("sse:broadcast", payload)
+        listeners = await self._redis.publish(BROADCAST_CHANNEL, payload)
         logger.info(f"SSE publish broadcast event. event={event} redis_listeners={listeners}")
 
-    async def stream(self, user_id: str | int):
+    async def stream(self, user_id: str | int, last_event_id: Optional[str] = None):
         await self.connect_redis()
         user_id = str(user_id)
-        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
         async with self._lock:
-            if user_id not in self._connections:
-                self._connections[user_id] = set()
-            self._connections[user_id].add(queue)
-            user_subscribers = len(self._connections[user_id])
-            total_subscribers = sum(len(queues) for queues in self._connections.values())
-        logger.info(
-            "SSE stream opened. "
-            f"user_id={user_id} user_subscribers={user_subscribers} total_subscribers={total_subscribers}"
+            queue, first = self._hub.register(user_id)
+            if first:
+                await self._subscribe_user(user_id)
+        logger.debug(
+            f"SSE stream opened. user_id={user_id} total_subscribers={self._hub.connection_count}"
         )
 
+        # Subscribed before reading the replay log, so nothing falls between the two;
+        # live copies of replayed events are skipped by ID.
+        replay, replayed_until = await self._replay(user_id, last_event_id)
+        if last_event_id:
+            logger.info(f"SSE stream resumed. user_id={user_id} last_event_id={last_event_id} replayed={len(replay)}")
+
         async def event_generator():
             try:
-                while True:
-                    try:
-                        message = await asyncio.wait_for(queue.get(), timeout=30)
-                        if message is self._CLOSE_STREAM:
-                            logger.info(f"SSE stream forced close for user. user_id={user_id}")
-                            break
-                        yield message
-                    except asyncio.TimeoutError:
-                        yield ": keepalive\n\n"
+                async for frame in self._hub.frames(queue, replay, replayed_until):
+                    yield frame
             except asyncio.CancelledError:
-                logger.info(f"SSE stream cancelled by client disconnect. user_id={user_id}")
+                logger.debug(f"SSE stream cancelled by client disconnect. user_id={user_id}")
             finally:
                 async with self._lock:
-                    user_queues = self._connections.get(user_id)
-                    if user_queues is not None:
-                        user_queues.discard(queue)
-                        if not user_queues:
-                            del self._connections[user_id]
-                    remaining_user_subscribers = len(self._connections.get(user_id, set()))
-                    remaining_total_subscribers = sum(len(queues) for queues in self._connections.values())
-                logger.info(
-                    "SSE stream closed. "
-                    f"user_id={user_id} user_subscribers={remaining_user_subscribers} "
-                    f"total_subscribers={remaining_total_subscribers}"
+                    if self._hub.unregister(user_id, queue):
+                        await self._unsubscribe_user(user_id)
+                logger.debug(
+                    f"SSE stream closed. user_id={user_id} total_subscribers={self._hub.connection_count}"
                 )
 
         return StreamingResponse(
@@ -167,15 +225,12 @@ class SSEManager:
 
     async def disconnect(self):
         logger.info("SSE manager disconnect requested.")
+        self._hub.stop()
         if self._listener_task:
             self._listener_task.cancel()
         if self._pubsub:
             await self._pubsub.close()
             logger.info("SSE Redis pubsub closed.")
-        if self._redis:
-            await self._redis.close()
-            self._redis = None
-            logger.info("SSE Redis connection closed.")
 
 
 sse_manager = SSEManager()
\ No newline at end of file
@@ -6,11 +6,12 @@ from app.models.user import User
 from app.utils.logger import logger
 from app.schemas.user_auth_schema import LoginData, RegisterData, OTPVerificationData, ResendOtpData
 from sqlalchemy import select
-from app.core.security import hash_password, decrypt_password, verify_token, is_token_revoked, revoke_token_jti
+from app.core.security import hash_password_async, decrypt_password_async, verify_token, is_token_revoked, revoke_token_jti
 from datetime import datetime, timezone
 from app.utils.otp_handler import generate_otp
 from app.utils.cookies import set_cookies, clear_cookies
 from app.utils.caching import set_cache, get_cache, delete_cache
+from app.core.auth_cache import invalidate_cached_user
 from app.tasks.email_tasks import send_otp_email_task
 from fastapi.responses import JSONResponse
 from app.core.security import create_access_token, create_refresh_token
@@ -114,7 +115,7 @@ async def verify_otp_and_register(otp: str, user_data: OTPVerificationData, fron
         logger.info(f"ID images uploaded to Cloudinary for {user_data.email}: {image_urls}")
 
         
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
 
         new_user = User(
             email=user_data.email,
@@ -207,7 +208,7 @@ async def login_user(login_data: LoginData, db: AsyncSession):
             logger.warning(f"Login attempt with unregistered email: {login_data.email}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="This email is not registered. Please check your email or register for a new account.")
 
-        if not decrypt_password(login_data.password, user.hashed_password):
+        if not await decrypt_password_async(login_data.password, user.hashed_password):
             logger.warning(f"Login attempt with incorrect password for email: {login_data.email}")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
         
@@ -252,7 +253,7 @@ async def officials_login(login_data: LoginData, db: AsyncSession):
             logger.warning(f"Login attempt with unregistered email: {login_data.email}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="This email is not registered. Please check your email or register for a new account.")
 
-        if not decrypt_password(login_data.password, user.hashed_password):
+        if not await decrypt_password_async(login_data.password, user.hashed_password):
             logger.warning(f"Login attempt with incorrect password for email: {login_data.email}")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
         
@@ -317,7 +318,7 @@ async def superadmin_login(login_data: LoginData, db: AsyncSession):
             logger.warning(f"Login attempt with unregistered email: {login_data.email}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="This email is not registered. Please check your email or register for a new account.")
 
-        if not decrypt_password(login_data.password, user.hashed_password):
+        if not await decrypt_password_async(login_data.password, user.hashed_password):
             logger.warning(f"Login attempt with incorrect password for email: {login_data.email}")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
@@ -469,7 +470,7 @@ async def logout_user(request: Request):
 
         if user_id:
             await delete_cache(f"user_data:{user_id}")
-            await delete_cache(f"auth_user:{user_id}")
+            await invalidate_cached_user(user_id)
         try:
             payload = verify_token(token)
             if payload.get("token_type") == "refresh":
@@ -5,13 +5,14 @@ from app.utils.otp_handler import generate_otp
 from app.schemas.user_schema import UserPersonalData, ChangePasswordData, VerifyEmailData, UserData, VerifyResetPasswordOTPData, UserLocationData, ResetPasswordData
 from app.models.user import User
 from sqlalchemy import select, update
-from app.core.security import hash_password, decrypt_password
+from app.core.security import hash_password_async, decrypt_password_async
 from fastapi.responses import JSONResponse
 from app.tasks.email_tasks import send_otp_email_task
 from app.utils.logger import logger
 from app.utils.caching import set_cache, get_cache, delete_cache
+from app.core.auth_cache import invalidate_cached_user
+from app.core.clients import clients
 from app.core.config import settings
-import httpx
 
 async def get_user_by_id(user_id: int, db: AsyncSession) -> UserData:
     try:
@@ -77,7 +78,7 @@ async def create_new_password(password_data: ResetPasswordData, db: AsyncSession
         if password_data.new_password != password_data.confirm_new_password:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New passwords do not match")
         
-        user.hashed_password = hash_password(password_data.new_password)
+        user.hashed_password = await hash_password_async(password_data.new_password)
         
         await db.commit()
         return JSONResponse(
@@ -178,17 +179,17 @@ async def change_password(password_data: ChangePasswordData, db: AsyncSession):
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        if not decrypt_password(password_data.current_password, user.hashed_password):
+        if not await decrypt_password_async(password_data.current_password, user.hashed_password):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
         
         if password_data.new_password != password_data.confirm_new_password:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New passwords do not match")
         
-        user.hashed_password = hash_password(password_data.new_password)
+        user.hashed_password = await hash_password_async(password_data.new_password)
 
         await db.commit()
         await delete_cache(f"user_profile:{user.id}")
-        await delete_cache(f"auth_user:{user.id}")
+        await invalidate_cached_user(user.id)
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -317,16 +318,15 @@ async def send_push_notification(
             "priority": "high",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                settings.EXPO_PUSH_URL,
-                json=payload,
-                headers={
-                    "Accept": "application/json",
-                    "Accept-Encoding": "gzip, deflate",
-                    "Content-Type": "application/json",
-                },
-            )
+        response = await clients.http.post(
+            settings.EXPO_PUSH_URL,
+            json=payload,
+            headers={
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "Content-Type": "application/json",
+            },
+        )
 
         if response.status_code != 200:
             raise Exception(f"Expo push notification failed: {response.status_code} - {response.text}")
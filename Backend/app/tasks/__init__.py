@@ -2,4 +2,6 @@ import app.tasks.incident_tasks
 import app.tasks.notification_tasks
 import app.tasks.email_tasks
 import app.tasks.upload_tasks
-import app.tasks.restriction_tasks
\ No newline at end of file
+import app.tasks.restriction_tasks
+import app.tasks.rollup_tasks
+import app.tasks.rag_tasks
@@ -5,6 +5,7 @@ from sqlalchemy.orm import selectinload
 from app.models.notification import Notification
 from app.models.complaint import Complaint
 from app.models.incident_complaint import IncidentComplaintModel
+from app.models.incident_model import IncidentModel
 
 from app.database.database import AsyncSessionLocal
 
@@ -39,6 +40,7 @@ from app.tasks.notification_tasks import send_notifications_task
 from app.tasks.email_tasks import notify_user_for_hearing_task
 from app.tasks.worker_loop import run_async, get_worker_loop
 
+from app.core.clients import clients
 from app.core.config import settings
 from app.schemas.cluster_complaint_schema import ClusterComplaintSchema
 
@@ -48,7 +50,8 @@ from app.domain.infrastracture.jobs.incident_jobs import (
 from app.domain.infrastracture.jobs.incident_expiration_alert import (
     run_expiry_warning_notifications,
 )
-from app.utils.query_optimization import RejectCounterHelper, RestrictSubmissionHelper
+from app.utils.query_optimization import RejectCounterHelper, RestrictSubmissionHelper, DailyRollupHelper
+from app.utils.outbox import enqueue_task
 
 import resend
 
@@ -58,15 +61,18 @@ resend.api_key = settings.RESEND_API_KEY
 _severity_calculator = None
 
 
+# These wrappers are cheap; the pooled clients underneath are shared per worker process
 def get_openai_incident_verifier():
     return OpenAIIncidentVerifier(
-        api_key=settings.OPEN_AI_API_KEY
+        api_key=settings.OPEN_AI_API_KEY,
+        client=clients.openai,
     )
 
 
 def get_openai_embedding_service():
     return OpenAIEmbeddingService(
-        api_key=settings.OPEN_AI_API_KEY
+        api_key=settings.OPEN_AI_API_KEY,
+        client=clients.openai,
     )
 
 
@@ -74,6 +80,8 @@ def get_vector_repository():
     return PineconeVectorRepository(
         api_key=settings.PINECONE_API_KEY,
         environment=settings.PINECONE_ENVIRONMENT,
+        pc=clients.pinecone,
+        index=clients.pinecone_index(PineconeVectorRepository.INDEX_NAME),
     )
 
 
@@ -231,12 +239,12 @@ def cluster_complaint_task(self, complaint_data: dict):
                 if complaint:
                     
                     if result.existing_incident_status == "rejected":
-                        await RejectCounterHelper.increment_reject_counter(db, [complaint.user_id])
+                        await RejectCounterHelper.increment_reject_counter(db, [complaint.user_id], commit=False)
                         reject_counters = await RejectCounterHelper.get_reject_counters(db, [complaint.user_id])
                         current_reject_counter = reject_counters.get(complaint.user_id, 0)
 
                         if current_reject_counter >= 3:
-                            await RestrictSubmissionHelper.restrict_user_submissions(db, [complaint.user_id])
+                            await RestrictSubmissionHelper.restrict_user_submissions(db, [complaint.user_id], commit=False)
 
                         warning_message = None
                         if current_reject_counter == 1:
@@ -268,7 +276,21 @@ def cluster_complaint_task(self, complaint_data: dict):
                             }
 
                     if result.existing_incident_status != "submitted":
+                        # The merged complaint follows the incident to its department, if any
+                        department_account_id = await db.scalar(
+                            select(IncidentModel.department_account_id)
+                            .where(IncidentModel.id == result.incident_id)
+                        )
+                        # Merges write no complaint log, so no milestone is counted
+                        await DailyRollupHelper.apply_transition(
+                            db,
+                            [complaint.id],
+                            result.existing_incident_status,
+                            department_account_id=department_account_id,
+                            count_milestone=False,
+                        )
                         complaint.status = result.existing_incident_status
+                        complaint.department_account_id = department_account_id
                         complaint.updated_at = datetime.now(timezone.utc)
 
                         if result.existing_incident_status in [
@@ -344,6 +366,25 @@ def cluster_complaint_task(self, complaint_data: dict):
                                     "channel": "in_app",
                                 }
 
+            # Follow-up work is committed with the clustering result and shipped by the
+            # outbox relay; dedupe keys keep a retried run from sending it twice.
+            dedupe_prefix = f"cluster:{cluster_data.complaint_id}"
+            if barangay_notification_payload:
+                await enqueue_task(db, send_notifications_task, barangay_notification_payload, dedupe_key=f"{dedupe_prefix}:barangay_notice")
+            if hearing_email_payload:
+                await enqueue_task(db, notify_user_for_hearing_task, hearing_email_payload, dedupe_key=f"{dedupe_prefix}:hearing_email")
+            if hearing_notification_payload:
+                await enqueue_task(db, send_notifications_task, hearing_notification_payload, dedupe_key=f"{dedupe_prefix}:hearing_notice")
+            if rejection_warning_notification_payload:
+                await enqueue_task(db, send_notifications_task, rejection_warning_notification_payload, dedupe_key=f"{dedupe_prefix}:reject_warning")
+            await enqueue_task(
+                db,
+                recalculate_severity_task,
+                {"incident_id": result.incident_id},
+                dedupe_key=f"{dedupe_prefix}:severity",
+                queue="severity",
+            )
+
             try:
                 await db.commit()
             except Exception as e:
@@ -366,40 +407,16 @@ def cluster_complaint_task(self, complaint_data: dict):
                 f"complaint:{cluster_data.complaint_id}",
                 f"incident:{result.incident_id}",
                 f"user_notifications:{cluster_data.user_id}",
+                f"notif_unread:{cluster_data.user_id}",
             ]:
                 try:
                     await delete_cache(k)
                 except Exception as e:
                     logger.warning(f"Cache delete failed for {k}: {e}")
 
-            return {
-                "result": result,
-                "barangay_notification_payload": barangay_notification_payload,
-                "hearing_email_payload": hearing_email_payload,
-                "hearing_notification_payload": hearing_notification_payload,
-                "rejection_warning_notification_payload": rejection_warning_notification_payload,
-            }
-
-    output = run_async(_run())
-
-    result = output["result"]
+            return result
 
-    if output["barangay_notification_payload"]:
-        send_notifications_task.delay(**output["barangay_notification_payload"])
-
-    if output["hearing_email_payload"]:
-        notify_user_for_hearing_task.delay(**output["hearing_email_payload"])
-
-    if output["hearing_notification_payload"]:
-        send_notifications_task.delay(**output["hearing_notification_payload"])
-
-    if output["rejection_warning_notification_payload"]:
-        send_notifications_task.delay(**output["rejection_warning_notification_payload"])
-
-    recalculate_severity_task.apply_async(
-        args=[result.incident_id],
-        queue="severity",
-    )
+    result = run_async(_run())
 
     return {
         "incident_id": result.incident_id,
@@ -1,15 +1,37 @@
-from app.utils.push_notifications import send_push_notification
+from sqlalchemy import update
+from app.utils.push_notifications import send_push_notification, send_push_batch, check_push_receipts
 from app.utils.logger import logger
 from app.celery_worker import celery_worker
 from app.tasks.worker_loop import run_async
-from app.models.notification import Notification
 from app.database.database import AsyncSessionLocal
-from datetime import datetime, timezone
-from app.utils.caching import delete_cache
-from app.utils.redis_pub import publish_sse_event
+from app.core.config import settings
+from app.models.user import User
+from app.services.notification_services import send_bulk_notifications, deliver_notifications
 
 
 
+async def _deactivate_push_tokens(tokens: list) -> None:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(User)
+            .where(User.push_token.in_(tokens))
+            .values(push_token=None)
+        )
+        await db.commit()
+        logger.info(f"Deactivated {result.rowcount} unregistered push tokens")
+
+
+def _handle_push_outcome(summary: dict) -> None:
+    """Drop tokens Expo reported as unregistered and schedule the receipt check."""
+    if summary["unregistered"]:
+        run_async(_deactivate_push_tokens(list(set(summary["unregistered"]))))
+    if summary["tickets"]:
+        check_push_receipts_task.apply_async(
+            kwargs={"tickets": summary["tickets"]},
+            countdown=settings.PUSH_RECEIPT_DELAY_SECONDS,
+        )
+
+
 @celery_worker.task(bind=True, max_retries=3, default_retry_delay=30)
 def send_push_notification_task(
     self,
@@ -31,16 +53,42 @@ def send_push_notification_task(
             sound=sound,
             expo_token=expo_token,
         )
-        logger.info(f"Push notification task result: {result}")
         if not result["success"]:
-            logger.exception(f"Push notification failed: {result}")
+            logger.warning(f"Push notification failed: {result['error']}")
         else:
-            logger.info(f"Push notification sent successfully: {result}")
+            logger.info("Push notification sent successfully")
+        if "tickets" in result:
+            _handle_push_outcome(result)
     except Exception as e:
         logger.exception(f"Push notification task failed: {e}")
         raise self.retry(exc=e)
 
 
+@celery_worker.task(bind=True, max_retries=3, default_retry_delay=30)
+def send_push_batch_task(self, pushes: list):
+    """Send a list of pushes in 100-message Expo batches; see send_push_batch."""
+    try:
+        summary = send_push_batch(pushes)
+    except Exception as e:
+        logger.exception(f"Push batch task failed: {e}")
+        raise self.retry(exc=e)
+    logger.info(f"Push batch: {summary['sent']} sent, {summary['failed']} failed, {summary['skipped']} skipped")
+    _handle_push_outcome(summary)
+
+
+@celery_worker.task(bind=True, max_retries=3, default_retry_delay=300)
+def check_push_receipts_task(self, tickets: dict):
+    """Read Expo receipts for sent tickets and deactivate tokens of uninstalled apps."""
+    try:
+        summary = check_push_receipts(tickets)
+        if summary["unregistered"]:
+            run_async(_deactivate_push_tokens(list(set(summary["unregistered"]))))
+    except Exception as e:
+        logger.exception(f"Push receipt check failed: {e}")
+        raise self.retry(exc=e)
+    logger.info(f"Push receipts: {summary['checked']} checked, {summary['failed']} failed")
+
+
 @celery_worker.task(bind=True, max_retries=3, default_retry_delay=30)
 def send_notifications_task(
     self,
@@ -56,41 +104,61 @@ def send_notifications_task(
 
     async def _run():
         async with AsyncSessionLocal() as db:
-            notification = Notification(
-                user_id=user_id,
-                complaint_id=complaint_id,
-                incident_id=incident_id,
-                title=title,
-                message=message,
-                notification_type=notification_type,
-                channel="sse",
-                is_read=False,
-                sent_at=datetime.now(timezone.utc),
-            )
-            db.add(notification)
-            await db.commit()
+            await send_bulk_notifications([{
+                "user_id": user_id,
+                "title": title,
+                "message": message,
+                "complaint_id": complaint_id,
+                "incident_id": incident_id,
+                "notification_type": notification_type,
+                "channel": channel,
+                "event": event,
+            }], db)
             logger.info(f"Notification saved to DB for user_id={user_id}, complaint_id={complaint_id}")
 
-            await delete_cache(f"user_notifications:{user_id}")
-            await publish_sse_event(
-                "sse:user",
-                {
-                    "target": str(user_id),
-                    "event": event or notification_type,
-                    "data": {
-                        "title": title,
-                        "message": message,
-                        "sent_at": datetime.now(timezone.utc).isoformat(),
-                        "complaint_id": complaint_id,
-                        "incident_id": incident_id,
-                        "notification_type": notification_type,
-                        "channel": channel,
-                    },
-                },
-            )
-
     try:
         run_async(_run())
     except Exception as e:
         logger.exception(f"Send notification task failed: {e}")
-        raise self.retry(exc=e)
\ No newline at end of file
+        raise self.retry(exc=e)
+
+@celery_worker.task(bind=True, max_retries=3, default_retry_delay=30)
+def send_bulk_notifications_task(self, notifications: list):
+    """Store and deliver notifications for a whole recipient list; see send_bulk_notifications."""
+
+    async def _run():
+        async with AsyncSessionLocal() as db:
+            return await send_bulk_notifications(notifications, db)
+
+    try:
+        sent = run_async(_run())
+    except Exception as e:
+        logger.exception(f"Bulk notification task failed: {e}")
+        raise self.retry(exc=e)
+    logger.info(f"Bulk notification task sent {sent} notifications")
+
+
+@celery_worker.task(bind=True, max_retries=3, default_retry_delay=30)
+def fan_out_notifications_task(self, notifications: list = None, pushes: list = None):
+    """Deliver notifications that were already persisted with the action that caused them.
+
+    One task per action instead of one per recipient: invalidates the
+    recipients' notification caches and publishes the SSE events in one
+    pipeline each, then sends the pushes in Expo batches.
+    """
+
+    async def _run():
+        await deliver_notifications(notifications or [])
+
+    try:
+        run_async(_run())
+    except Exception as e:
+        logger.exception(f"Notification fan-out failed: {e}")
+        raise self.retry(exc=e)
+
+    summary = send_push_batch(pushes or [])
+    _handle_push_outcome(summary)
+    logger.info(
+        f"Fanned out {len(notifications or [])} notifications and {summary['sent']} pushes "
+        f"({summary['failed']} push failures)"
+    )
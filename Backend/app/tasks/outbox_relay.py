@@ -0,0 +1,117 @@
+"""Outbox relay.
+
+Drains pending outbox_event rows to the Celery broker in batches, reusing one
+producer connection per batch. Run as its own process:
+
+    python -m app.tasks.outbox_relay
+
+Several relays may run at once; rows are claimed with SKIP LOCKED. A row is
+marked dispatched only after the broker accepted it, so a crash between the
+two can resend an event (at-least-once). Each message carries the stable task
+id ``outbox-<event id>`` so consumers can recognise repeats.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+
+from app.celery_worker import celery_worker
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.models.outbox_event import OutboxEvent
+from app.utils.logger import logger
+
+PURGE_INTERVAL_SECONDS = 3600
+
+
+async def relay_batch(db, batch_size: int) -> int:
+    """Send up to batch_size pending events in id order; returns how many were sent."""
+    result = await db.execute(
+        select(OutboxEvent)
+        .where(OutboxEvent.dispatched_at.is_(None))
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    events = result.scalars().all()
+    if not events:
+        await db.rollback()
+        return 0
+
+    sent_ids = []
+    failed_event, failure = None, None
+    with celery_worker.producer_or_acquire() as producer:
+        for event in events:
+            try:
+                celery_worker.send_task(
+                    event.task_name,
+                    kwargs=event.payload,
+                    queue=event.queue,
+                    task_id=f"outbox-{event.id}",
+                    producer=producer,
+                )
+                sent_ids.append(event.id)
+            except Exception as e:
+                # Broker trouble: stop here and retry the rest on the next round, keeping order
+                failed_event, failure = event, e
+                break
+
+    now = datetime.now(timezone.utc)
+    if sent_ids:
+        await db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(sent_ids))
+            .values(dispatched_at=now, attempts=OutboxEvent.attempts + 1)
+        )
+    if failed_event is not None:
+        logger.warning(f"Outbox relay failed to send event {failed_event.id} ({failed_event.task_name}): {failure}")
+        await db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == failed_event.id)
+            .values(attempts=OutboxEvent.attempts + 1, last_error=str(failure)[:500])
+        )
+    await db.commit()
+    return len(sent_ids)
+
+
+async def purge_dispatched(db) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    result = await db.execute(
+        delete(OutboxEvent).where(OutboxEvent.dispatched_at < cutoff)
+    )
+    await db.commit()
+    return result.rowcount or 0
+
+
+async def run_relay():
+    logger.info(f"Outbox relay started (batch size {settings.OUTBOX_BATCH_SIZE})")
+    last_purge = 0.0
+    while True:
+        sent = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                sent = await relay_batch(db, settings.OUTBOX_BATCH_SIZE)
+                if sent:
+                    logger.info(f"Outbox relay dispatched {sent} events")
+
+                if time.monotonic() - last_purge >= PURGE_INTERVAL_SECONDS:
+                    purged = await purge_dispatched(db)
+                    last_purge = time.monotonic()
+                    if purged:
+                        logger.info(f"Outbox relay purged {purged} dispatched events")
+        except Exception:
+            logger.exception("Outbox relay iteration failed")
+
+        # A full batch means there is probably more waiting; drain it without sleeping
+        if sent < settings.OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(settings.OUTBOX_POLL_INTERVAL_SECONDS)
+
+
+def main():
+    asyncio.run(run_relay())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+
+from app.celery_worker import celery_worker
+from app.core.config import settings
+from app.domain.IEmbeddingService.vector_store.hybrid_rag_repository import record_corpus_changes
+from app.services.pdf_extraction import count_pages, extract_text_parallel
+from app.services.rag_ingest_service import (
+    IngestError,
+    advance_ingest_job,
+    ingest_job_key,
+    update_ingest_job,
+)
+from app.services.rag_services import (
+    _assign_chunk_ids,
+    _chunk_text,
+    _delete_chunks,
+    _embed,
+    _get_or_create_index,
+    _list_legacy_chunk_ids,
+    _list_source_chunk_ids,
+    _plan_source_sync,
+    _upsert_chunks,
+)
+from app.services.semantic_cache_service import semantic_answer_cache
+from app.core.redis import redis_client
+from app.tasks.worker_loop import run_async
+from app.utils.logger import logger
+
+
+async def _ingest_pdf(job_id: str, file_path: str, source: str) -> None:
+    await update_ingest_job(job_id, status="extracting")
+
+    page_count = await asyncio.to_thread(count_pages, file_path)
+    await update_ingest_job(job_id, pages_total=page_count)
+
+    text = await extract_text_parallel(
+        file_path,
+        page_count,
+        workers=settings.RAG_INGEST_WORKERS,
+        pages_per_task=settings.RAG_INGEST_PAGES_PER_TASK,
+        on_progress=lambda pages: advance_ingest_job(job_id, "pages_extracted", pages),
+    )
+    if not text.strip():
+        raise IngestError("Could not extract text from PDF (image-only PDF?).")
+
+    chunks = _chunk_text(text)
+    if not chunks:
+        raise IngestError("No recognizable section headings found in the PDF.")
+    chunks = _assign_chunk_ids(chunks, source)
+
+    # Only chunks whose content hash is not stored yet for this source are
+    # embedded; chunks that vanished from the new revision are deleted
+    index = await asyncio.to_thread(_get_or_create_index)
+    stored_ids = await asyncio.to_thread(_list_source_chunk_ids, source, index)
+    changed, stale_ids = _plan_source_sync(chunks, stored_ids)
+    await update_ingest_job(
+        job_id,
+        status="indexing",
+        chunks_total=len(chunks),
+        chunks_unchanged=len(chunks) - len(changed),
+    )
+
+    async def index_batch(offset: int, embeddings: list[list[float]]) -> None:
+        await advance_ingest_job(job_id, "chunks_embedded", len(embeddings))
+        batch = changed[offset:offset + len(embeddings)]
+        await asyncio.to_thread(_upsert_chunks, batch, embeddings, index)
+        await advance_ingest_job(job_id, "chunks_indexed", len(batch))
+
+    await _embed([c["content"] for c in changed], on_batch=index_batch)
+
+    # Deleted after the upserts so the source is never missing content mid-sync
+    if stale_ids:
+        await asyncio.to_thread(_delete_chunks, stale_ids, index)
+        await update_ingest_job(job_id, chunks_deleted=len(stale_ids))
+
+    # API processes refresh these chunks in their hybrid retrieval index
+    await record_corpus_changes([c["id"] for c in changed] + stale_ids)
+    # Cached answers built from the removed chunks are stale now; new ids have none
+    await semantic_answer_cache.invalidate_chunks(stale_ids)
+
+    await update_ingest_job(
+        job_id,
+        status="completed",
+        chunk_titles=json.dumps([c["title"] for c in chunks]),
+    )
+    await redis_client.expire(ingest_job_key(job_id), settings.RAG_INGEST_JOB_TTL_SECONDS)
+    logger.info(
+        f"RAG ingestion job {job_id} synced '{source}' from {page_count} pages: "
+        f"{len(changed)} new or changed, {len(chunks) - len(changed)} unchanged, {len(stale_ids)} deleted"
+    )
+
+
+async def _prune_legacy_chunks() -> int:
+    """Delete every chunk stored under the old ordinal ids; other sources are untouched."""
+    index = await asyncio.to_thread(_get_or_create_index)
+    legacy_ids = await asyncio.to_thread(_list_legacy_chunk_ids, index)
+    if not legacy_ids:
+        return 0
+    await asyncio.to_thread(_delete_chunks, legacy_ids, index)
+    await record_corpus_changes(legacy_ids)
+    await semantic_answer_cache.invalidate_chunks(legacy_ids)
+    logger.info(f"Pruned {len(legacy_ids)} legacy RAG chunks")
+    return len(legacy_ids)
+
+
+@celery_worker.task(bind=True)
+def ingest_pdf_task(self, job_id: str, file_path: str, source: str | None = None):
+
+    async def _run():
+        try:
+            await _ingest_pdf(job_id, file_path, source or os.path.basename(file_path))
+        except Exception as e:
+            if isinstance(e, IngestError):
+                logger.warning(f"RAG ingestion job {job_id} rejected: {e}")
+                error = str(e)
+            else:
+                logger.exception(f"RAG ingestion job {job_id} failed: {e}")
+                error = "Ingestion failed. Please try again."
+            try:
+                await update_ingest_job(job_id, status="failed", error=error)
+            except Exception:
+                logger.exception(f"Could not record failure of RAG ingestion job {job_id}")
+        finally:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+    return run_async(_run())
+
+
+@celery_worker.task(name="app.tasks.rag_tasks.prune_legacy_chunks_task")
+def prune_legacy_chunks_task():
+    return run_async(_prune_legacy_chunks())
+
+
+def main():
+    """One-off removal of chunk_<n> vectors: python -m app.tasks.rag_tasks"""
+    asyncio.run(_prune_legacy_chunks())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import asyncio
+from sqlalchemy import select
+from app.celery_worker import celery_worker
+from app.database.database import AsyncSessionLocal
+from app.utils.logger import logger
+from app.tasks.worker_loop import run_async
+from app.utils.query_optimization import DailyRollupHelper
+from app.models.complaint_daily_rollup import ComplaintDailyRollup
+from app.utils.cache_invalidator_optimized import invalidate_cache
+
+@celery_worker.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=300,
+    name="app.tasks.rollup_tasks.reconcile_complaint_rollup_task",
+)
+def reconcile_complaint_rollup_task(self):
+    try:
+        run_async(run_reconcile_complaint_rollup())
+        logger.info("Complaint daily rollup reconciled successfully.")
+    except Exception as e:
+        logger.exception("Complaint daily rollup reconciliation failed")
+        raise self.retry(exc=e)
+
+@celery_worker.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    name="app.tasks.rollup_tasks.backfill_complaint_rollup_task",
+)
+def backfill_complaint_rollup_task(self):
+    try:
+        run_async(run_backfill_complaint_rollup())
+    except Exception as e:
+        logger.exception("Complaint daily rollup backfill failed")
+        raise self.retry(exc=e)
+
+async def run_backfill_complaint_rollup() -> bool:
+    """Rebuild the rollup once if it has never been populated; returns whether it ran."""
+    async with AsyncSessionLocal() as db:
+        seeded = await db.scalar(select(ComplaintDailyRollup.id).limit(1))
+    if seeded is not None:
+        return False
+    logger.info("complaint_daily_rollup is empty, backfilling it now")
+    await run_reconcile_complaint_rollup()
+    return True
+
+async def run_reconcile_complaint_rollup():
+    async with AsyncSessionLocal() as db:
+        try:
+            rows_written = await DailyRollupHelper.rebuild(db)
+            await db.commit()
+            logger.info(f"Rebuilt complaint_daily_rollup with {rows_written} rows")
+        except Exception:
+            await db.rollback()
+            raise
+
+    # Dashboards cached before the rebuild may hold drifted numbers
+    await invalidate_cache(include_global=True)
+
+
+def main():
+    """One-shot rebuild: python -m app.tasks.rollup_tasks"""
+    asyncio.run(run_reconcile_complaint_rollup())
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,8 @@ class CacheInvalidator:
         This is 40%+ faster than asyncio.gather for multiple keys.
         """
         tasks: Set[str] = set()
+        # Paginated listings are versioned rather than deleted key-by-key
+        versions: Set[str] = set()
 
         # Build all cache keys to delete
         if response_id:
@@ -62,6 +64,10 @@ class CacheInvalidator:
                 "lgu:complaint_counts_by_barangay_category",
                 "archive_incidents:lgu",
             })
+            versions.update({
+                "complaints_page:all",
+                "incidents_page:archive:lgu",
+            })
             logger.info("Global caches added to invalidation list")
 
         if incident_ids:
@@ -79,6 +85,11 @@ class CacheInvalidator:
                 f"barangay_profile:{barangay_id}",
                 f"archive_incidents:barangay:{barangay_id}",
             })
+            versions.update({
+                f"complaints_page:barangay:{barangay_id}",
+                f"incidents_page:barangay:{barangay_id}",
+                f"incidents_page:archive:barangay:{barangay_id}",
+            })
             
             now = datetime.now(timezone.utc)
             current_year = now.year
@@ -104,6 +115,7 @@ class CacheInvalidator:
                 f"department_incidents:{department_account_id}",
                 f"archive_incidents:department:{department_account_id}",
             })
+            versions.add(f"incidents_page:archive:department:{department_account_id}")
             logger.info(f"Department caches added for department_account_id: {department_account_id}")
 
         if complaint_ids:
@@ -114,6 +126,7 @@ class CacheInvalidator:
                 f"barangay_{barangay_id}_complaints" if barangay_id else None,
             })
             tasks.discard(None)
+            versions.add("complaints_page:all")
             logger.info(f"Complaint caches added for complaint_ids: {complaint_ids}")
 
         if user_ids:
@@ -128,6 +141,9 @@ class CacheInvalidator:
         else:
             logger.debug("No cache keys to invalidate")
 
+        if versions:
+            await CacheInvalidator._bump_versions(list(versions))
+
     @staticmethod
     async def _batch_delete_keys(keys: List[str]) -> None:
         """Delete multiple keys using Redis pipeline (atomic & fast).
@@ -156,6 +172,21 @@ class CacheInvalidator:
             # Fallback: delete keys individually
             await CacheInvalidator._fallback_individual_delete(keys)
 
+    @staticmethod
+    async def _bump_versions(namespaces: List[str]) -> None:
+        """Increment cache generations so every page under a namespace goes stale.
+
+        Old page keys are never read again and simply expire with their TTL.
+        """
+        try:
+            pipe = redis_client.pipeline()
+            for namespace in namespaces:
+                pipe.incr(f"cache_version:{namespace}")
+            await pipe.execute()
+            logger.info(f"Cache versions bumped for namespaces: {namespaces}")
+        except Exception as e:
+            logger.exception(f"Error bumping cache versions: {e}")
+
     @staticmethod
     async def _fallback_individual_delete(keys: List[str]) -> None:
         """Fallback: delete keys individually if pipeline fails."""
@@ -1,20 +1,44 @@
+import hashlib
 import json
-from app.core.redis import redis_client  # assume redis.asyncio.Redis for async
+from contextvars import ContextVar
+from app.core.config import settings
+from app.core.redis import redis_auto, redis_client
 from app.utils.logger import logger
 
+# Set for requests whose session reads from a replica (see get_read_db). A
+# replica may not have replayed a write whose invalidation already ran, so
+# what it returns must not sit in the shared cache for the usual hour.
+_served_from_replica: ContextVar[bool] = ContextVar("served_from_replica", default=False)
+
+
+def mark_served_from_replica() -> None:
+    _served_from_replica.set(True)
+
+
 async def set_cache(key: str, value, expiration: int):
-    """Set a value in Redis cache with optional expiration (seconds)."""
+    """Set a value in Redis cache with optional expiration (seconds).
+
+    Results read from a replica are kept at most REPLICA_CACHE_TTL_SECONDS
+    (and not cached at all when that is 0).
+    """
+    if _served_from_replica.get():
+        expiration = min(expiration, settings.REPLICA_CACHE_TTL_SECONDS)
+        if expiration <= 0:
+            return
     try:
-        await redis_client.setex(key, expiration, json.dumps(value))
+        await redis_auto.setex(key, expiration, json.dumps(value))
     except Exception as e:
         logger.warning(f"Failed to set cache for {key}: {e}")
 
 import json
 
 async def get_cache(key: str):
-    """Get a value from Redis cache. Returns Python object or None."""
+    """Get a value from Redis cache. Returns Python object or None.
+
+    Reads issued together (e.g. under asyncio.gather) share one round-trip.
+    """
     try:
-        data = await redis_client.get(key)
+        data = await redis_auto.get(key)
         if not data:
             return None
         if isinstance(data, bytes):
@@ -27,6 +51,37 @@ async def get_cache(key: str):
 async def delete_cache(key: str):
     """Delete a key from Redis."""
     try:
-        await redis_client.delete(key)
+        await redis_auto.delete(key)
     except Exception as e:
         logger.warning(f"Failed to delete cache for {key}: {e}")
+
+async def delete_cache_many(keys) -> None:
+    """Delete many keys in one round-trip."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.delete(key)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to delete {len(keys)} cache keys: {e}")
+
+async def get_cache_version(namespace: str) -> int:
+    """Current generation number for a family of cache keys (e.g. list pages).
+
+    Paginated listings can't enumerate every page key they wrote, so instead
+    they embed this number in their keys; bumping it orphans all old pages.
+    """
+    try:
+        version = await redis_auto.get(f"cache_version:{namespace}")
+        return int(version) if version else 0
+    except Exception as e:
+        logger.warning(f"Failed to get cache version for {namespace}: {e}")
+        return 0
+
+def page_cache_key(namespace: str, version: int, *parts) -> str:
+    """Build a per-page cache key scoped to a namespace generation."""
+    digest = hashlib.md5(":".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:v{version}:{digest}"
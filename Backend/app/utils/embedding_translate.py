@@ -1,17 +1,16 @@
-from openai import AsyncOpenAI
 import logging
-import os
+
+from app.core.clients import clients
 
 
 logger = logging.getLogger(__name__)
-client = AsyncOpenAI(api_key=os.getenv("OPEN_AI_API_KEY"))
 
 async def translate_to_english(text: str) -> str:
     if not text or not text.strip():
         return text
 
     try:
-        response = await client.chat.completions.create(
+        response = await clients.openai.chat.completions.create(
             model="gpt-5-mini-2025-08-07",
             messages=[
                 {
@@ -1,3 +1,9 @@
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely import STRtree
 from shapely.geometry import mapping, shape, Point
 import json
 import os
@@ -5,6 +11,9 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 geojson_path = os.path.join(BASE_DIR, "data", "sta_maria_barangays.geojson")
 
+# Coordinates are rounded to this many decimals (~0.1 m) before the cache lookup
+_CACHE_PRECISION = 6
+
 with open(geojson_path) as f:
     geo_data = json.load(f)
 
@@ -12,22 +21,43 @@ barangay_polygons = []
 for feature in geo_data["features"]:
     name = feature["properties"]["ADM4_EN"]
     geom = shape(feature["geometry"])
-    
+
     if name == "Pao-o":
         geom = geom.buffer(0.0015)
-    
+
+    shapely.prepare(geom)
     barangay_polygons.append({
         "name": name,
-        "geometry": geom
+        "geometry": geom,
+        # Serialized once here instead of on every lookup
+        "geojson": mapping(geom),
     })
+
+_barangay_tree = STRtree([brgy["geometry"] for brgy in barangay_polygons])
+
+
+def _result(position: int) -> dict:
+    brgy = barangay_polygons[position]
+    return {"name": brgy["name"], "geometry": brgy["geojson"]}
+
+
+@lru_cache(maxsize=4096)
+def _lookup(lat: float, lng: float) -> Optional[int]:
+    matches = _barangay_tree.query(Point(lng, lat), predicate="within")
+    # Buffered polygons can overlap; the first one in file order wins, as before
+    return int(matches.min()) if len(matches) else None
+
+
 def get_barangay(lat: float, lng: float):
-    point = Point(lng, lat)
+    position = _lookup(round(lat, _CACHE_PRECISION), round(lng, _CACHE_PRECISION))
+    return _result(position) if position is not None else None
+
 
-    for brgy in barangay_polygons:
-        if brgy["geometry"].contains(point):
-            return {
-                "name": brgy["name"],
-                "geometry": mapping(brgy["geometry"])  # 👈 IMPORTANT
-            }
+def get_barangays_bulk(lats: Sequence[float], lngs: Sequence[float]) -> list[Optional[dict]]:
+    """Vectorized get_barangay for many points at once, e.g. back-filling old complaints."""
+    points = shapely.points(np.asarray(lngs, dtype=float), np.asarray(lats, dtype=float))
+    point_idx, tree_idx = _barangay_tree.query(points, predicate="within")
 
-    return None
\ No newline at end of file
+    positions = np.full(len(points), len(barangay_polygons), dtype=np.int64)
+    np.minimum.at(positions, point_idx, tree_idx)
+    return [_result(int(p)) if p < len(barangay_polygons) else None for p in positions]
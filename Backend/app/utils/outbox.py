@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.outbox_event import OutboxEvent
+
+
+async def enqueue_task(db: AsyncSession, task, kwargs: Optional[dict] = None, dedupe_key: Optional[str] = None, queue: Optional[str] = None) -> None:
+    """Record a Celery task in the caller's transaction; it is sent once the transaction commits.
+
+    kwargs must be JSON-serializable. Events with a dedupe_key that was
+    already recorded are dropped.
+    """
+    await enqueue_tasks(db, task, [kwargs or {}], dedupe_keys=[dedupe_key], queue=queue)
+
+
+async def enqueue_tasks(db: AsyncSession, task, kwargs_list: List[dict], dedupe_keys: Optional[List[Optional[str]]] = None, queue: Optional[str] = None) -> None:
+    """Record one task call per kwargs dict with a single multi-row insert."""
+    if not kwargs_list:
+        return
+
+    dedupe_keys = dedupe_keys or [None] * len(kwargs_list)
+    stmt = pg_insert(OutboxEvent).values([
+        {
+            "task_name": task.name,
+            "payload": kwargs,
+            "queue": queue,
+            "dedupe_key": dedupe_key,
+            "attempts": 0,
+        }
+        for kwargs, dedupe_key in zip(kwargs_list, dedupe_keys)
+    ])
+    await db.execute(stmt.on_conflict_do_nothing(index_elements=["dedupe_key"]))
@@ -1,14 +1,148 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
 from exponent_server_sdk import (
-    DeviceNotRegisteredError,
     PushClient,
     PushMessage,
     PushServerError,
-    PushTicketError,
+    PushTicket,
 )
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, HTTPError
+from app.core.config import settings
 from app.utils.logger import logger
 
+EXPO_BATCH_SIZE = 100  # Expo accepts at most 100 messages per push request
+EXPO_RECEIPT_BATCH_SIZE = 1000  # ...and at most 1000 ids per receipt request
+DEVICE_NOT_REGISTERED = "DeviceNotRegistered"
+
+_client: Optional[PushClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def _build_session(access_token: Optional[str]) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, settings.PUSH_SEND_CONCURRENCY))
+    session.mount("https://", adapter)
+    session.headers.update({
+        "accept": "application/json",
+        "accept-encoding": "gzip, deflate",
+        "content-type": "application/json",
+    })
+    if access_token:
+        session.headers["Authorization"] = f"Bearer {access_token}"
+    return session
+
+
+def get_push_client() -> PushClient:
+    """Process-wide PushClient over one pooled keep-alive session.
+
+    Rebuilt after fork so Celery prefork children don't share sockets.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = PushClient(session=_build_session(settings.EXPO_ACCESS_TOKEN))
+            _client_pid = os.getpid()
+        return _client
+
+
+def _to_message(push: dict) -> PushMessage:
+    return PushMessage(
+        to=push["token"],
+        title=push.get("title"),
+        body=push.get("body", ""),
+        data=push.get("data") or {},
+        sound=push.get("sound", "default"),
+    )
+
+
+def _publish_chunk(client: PushClient, pushes: List[dict]) -> dict:
+    outcome = {"sent": 0, "failed": 0, "tickets": {}, "unregistered": []}
+    try:
+        tickets = client.publish_multiple([_to_message(push) for push in pushes])
+    except (PushServerError, ConnectionError, HTTPError, ValueError) as exc:
+        logger.warning(f"Expo rejected a batch of {len(pushes)} push notifications: {exc}")
+        outcome["failed"] = len(pushes)
+        return outcome
+
+    for ticket in tickets:
+        token = ticket.push_message.to
+        if ticket.is_success():
+            outcome["sent"] += 1
+            if ticket.id:
+                outcome["tickets"][ticket.id] = token
+        else:
+            outcome["failed"] += 1
+            if (ticket.details or {}).get("error") == DEVICE_NOT_REGISTERED:
+                outcome["unregistered"].append(token)
+    return outcome
+
+
+def send_push_batch(pushes: Iterable[dict], client: Optional[PushClient] = None) -> dict:
+    """Send many push notifications in Expo-sized batches.
+
+    Each push is a dict with token, enabled, title, body, data and optionally
+    sound. Batches go out in parallel (PUSH_SEND_CONCURRENCY) over the pooled
+    session. Returns counts plus the ticket ids to check receipts for
+    ({ticket_id: token}) and tokens Expo already reported as unregistered.
+    """
+    pushes = list(pushes)
+    deliverable = [push for push in pushes if push.get("enabled") and push.get("token")]
+    summary = {"sent": 0, "failed": 0, "skipped": len(pushes) - len(deliverable), "tickets": {}, "unregistered": []}
+    if not deliverable:
+        return summary
+
+    client = client or get_push_client()
+    chunks = [deliverable[i:i + EXPO_BATCH_SIZE] for i in range(0, len(deliverable), EXPO_BATCH_SIZE)]
+    if len(chunks) == 1:
+        outcomes = [_publish_chunk(client, chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), max(1, settings.PUSH_SEND_CONCURRENCY))) as pool:
+            outcomes = list(pool.map(lambda chunk: _publish_chunk(client, chunk), chunks))
+
+    for outcome in outcomes:
+        summary["sent"] += outcome["sent"]
+        summary["failed"] += outcome["failed"]
+        summary["tickets"].update(outcome["tickets"])
+        summary["unregistered"].extend(outcome["unregistered"])
+    return summary
+
+
+def check_push_receipts(ticket_tokens: dict) -> dict:
+    """Fetch delivery receipts for {ticket_id: token}.
+
+    Returns the number of failed deliveries and the tokens whose devices are
+    no longer registered.
+    """
+    client = get_push_client()
+    ticket_ids = list(ticket_tokens)
+    summary = {"checked": 0, "failed": 0, "unregistered": []}
+
+    for start in range(0, len(ticket_ids), EXPO_RECEIPT_BATCH_SIZE):
+        tickets = [
+            PushTicket(push_message=None, status=PushTicket.SUCCESS_STATUS, message="", details=None, id=ticket_id)
+            for ticket_id in ticket_ids[start:start + EXPO_RECEIPT_BATCH_SIZE]
+        ]
+        try:
+            receipts = client.check_receipts_multiple(tickets)
+        except (PushServerError, ConnectionError, HTTPError) as exc:
+            logger.warning(f"Failed to fetch {len(tickets)} push receipts: {exc}")
+            continue
+
+        for receipt in receipts:
+            summary["checked"] += 1
+            if receipt.is_success():
+                continue
+            summary["failed"] += 1
+            if (receipt.details or {}).get("error") == DEVICE_NOT_REGISTERED and receipt.id in ticket_tokens:
+                summary["unregistered"].append(ticket_tokens[receipt.id])
+    return summary
+
 
 def send_push_notification(
     token: str,
@@ -25,69 +159,15 @@ def send_push_notification(
     if not token:
         return {"success": False, "error": "No push token provided"}
 
-    try:
-        session = requests.Session()
-        headers = {
-            "accept": "application/json",
-            "accept-encoding": "gzip, deflate",
-            "content-type": "application/json",
-        }
-        if expo_token:
-            headers["Authorization"] = f"Bearer {expo_token}"
-        session.headers.update(headers)
-        logger.info(f"Sending push notification with headers: {headers} and body: {{'to': {token}, 'title': {title}, 'body': {body}, 'data': {data}, 'sound': {sound}}}")
-
-        client = PushClient(session=session)
-        message = PushMessage(
-            to=token,
-            title=title,
-            body=body,
-            data=data or {},
-            sound=sound,
-        )
-        logger.info(f"Constructed PushMessage: {message.__dict__}")
-
-        response = client.publish(message)
-        response.validate_response()
-        logger.info(f"Push notification response: {response.__dict__}")
-        return {
-            "success": True,
-            "message": "Notification sent successfully",
-            "data": response.__dict__,
-        }
-        
-
-    except DeviceNotRegisteredError:
-        return {
-            "success": False,
-            "error": "Device not registered",
-            "action": "Deactivate token in DB",
-        }
-
-    except PushTicketError as exc:
-        return {
-            "success": False,
-            "error": "Push ticket error",
-            "details": exc.push_response._asdict(),
-        }
-
-    except PushServerError as exc:
-        return {
-            "success": False,
-            "error": "Expo server error",
-            "details": exc.errors,
-        }
-
-    except (ConnectionError, HTTPError) as exc:
-        return {
-            "success": False,
-            "error": "Network error",
-            "details": str(exc),
-        }
-
-    except Exception as exc:
-        return {
-            "success": False,
-            "error": "Unexpected error",
-            "details": str(exc),
-        }
\ No newline at end of file
+    # A per-call access token needs its own session; everything else shares the pooled client
+    client = PushClient(session=_build_session(expo_token)) if expo_token else None
+    summary = send_push_batch(
+        [{"token": token, "enabled": enabled, "title": title, "body": body, "data": data, "sound": sound}],
+        client=client,
+    )
+
+    if summary["sent"]:
+        return {"success": True, "message": "Notification sent successfully", **summary}
+    if summary["unregistered"]:
+        return {"success": False, "error": "Device not registered", "action": "Deactivate token in DB", **summary}
+    return {"success": False, "error": "Push delivery failed", **summary}
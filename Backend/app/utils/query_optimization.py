@@ -4,12 +4,14 @@ Provides optimized selectinload chains and pagination helpers
 to prevent N+1 queries and ensure efficient data loading.
 """
 
+import base64
+import json
 from collections import Counter
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from sqlalchemy.orm import selectinload, joinedload
-from sqlalchemy import func, select, cast, Date, update
+from sqlalchemy import func, select, cast, Date, Integer, update, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.incident_model import IncidentModel
@@ -153,6 +155,91 @@ class PaginationParams:
         }
 
 
+class ListingFilters:
+    """Optional filters shared by the paginated complaint/incident listings."""
+
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ):
+        self.status = status
+        self.category_id = category_id
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def cache_token(self) -> str:
+        """Stable string form of the filters, used in per-page cache keys."""
+        return "|".join([
+            self.status or "",
+            str(self.category_id or ""),
+            self.start_date.isoformat() if self.start_date else "",
+            self.end_date.isoformat() if self.end_date else "",
+        ])
+
+
+class KeysetPagination:
+    """Cursor (keyset) pagination on a (timestamp, id) pair, newest first.
+
+    Unlike PaginationParams this never uses OFFSET, so the cost of fetching a
+    page does not grow with how deep into the history the client has scrolled.
+    """
+
+    def __init__(self, cursor: Optional[str] = None, limit: int = 20):
+        """Initialize keyset pagination parameters.
+
+        Args:
+            cursor: Opaque cursor returned as `next_cursor` by the previous page
+            limit: Items per page
+
+        Raises:
+            ValueError: If the cursor cannot be decoded.
+        """
+        self.limit = max(1, min(limit, 100))  # Cap at 100
+        self.cursor = cursor
+        self.after = self.decode_cursor(cursor) if cursor else None
+
+    @staticmethod
+    def encode_cursor(timestamp: datetime, row_id: int) -> str:
+        raw = json.dumps({"t": timestamp.isoformat(), "id": row_id})
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return datetime.fromisoformat(data["t"]), int(data["id"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError("Invalid pagination cursor") from e
+
+    def apply_to_query(self, query, timestamp_column, id_column):
+        """Order by (timestamp, id) descending and seek past the cursor."""
+        if self.after is not None:
+            after_ts, after_id = self.after
+            query = query.where(
+                tuple_(timestamp_column, id_column) < tuple_(after_ts, after_id)
+            )
+        return (
+            query
+            .order_by(timestamp_column.desc(), id_column.desc())
+            .limit(self.limit + 1)  # One extra row tells us whether a next page exists
+        )
+
+    def build_page(self, rows: List[Any], timestamp_attr: str) -> Tuple[List[Any], Optional[str]]:
+        """Trim the look-ahead row and compute the cursor for the next page."""
+        items = list(rows[:self.limit])
+        next_cursor = None
+        if len(rows) > self.limit and items:
+            last = items[-1]
+            next_cursor = self.encode_cursor(getattr(last, timestamp_attr), last.id)
+        return items, next_cursor
+
+    def cache_token(self) -> str:
+        return f"{self.cursor or 'first'}:{self.limit}"
+
+
 class BatchLoader:
     """Batch load related objects to avoid N+1 queries."""
 
@@ -311,7 +398,7 @@ class RestrictSubmissionHelper:
         await db.commit()
 
     @staticmethod
-    async def restrict_user_submissions(db: AsyncSession, user_ids: List[int]) -> None:
+    async def restrict_user_submissions(db: AsyncSession, user_ids: List[int], commit: bool = True) -> None:
         """Restrict multiple users from submitting complaints in one query."""
         if not user_ids:
             return
@@ -324,14 +411,15 @@ class RestrictSubmissionHelper:
                 is_restricted_until=RestrictSubmissionHelper._restriction_deadline(minutes=1440), ## 1 day
             )
         )  # Example: restrict for 1 day for testing
-        await db.commit()
+        if commit:
+            await db.commit()
 
 
 class RejectCounterHelper:
     """Helper for managing complaint rejection counts."""
 
     @staticmethod
-    async def increment_reject_counter(db: AsyncSession, user_ids: List[int]) -> None:
+    async def increment_reject_counter(db: AsyncSession, user_ids: List[int], commit: bool = True) -> None:
         """Increment reject counters by occurrence count in user_ids."""
         if not user_ids:
             return
@@ -345,7 +433,8 @@ class RejectCounterHelper:
                 .where(User.id == user_id)
                 .values(reject_counter=func.coalesce(User.reject_counter, 0) + increment_by)
             )
-        await db.commit()
+        if commit:
+            await db.commit()
 
     @staticmethod
     async def get_reject_counters(db: AsyncSession, user_ids: List[int]) -> dict[int, int]:
@@ -444,3 +533,288 @@ class StatisticsHelper:
         )
         
         return {row[0]: row[1] for row in result.all() if row[0]}
+
+    @staticmethod
+    async def get_category_counts_by_period(
+        db: AsyncSession,
+        barangay_id: int,
+        start_date,
+        end_date=None,
+        granularity: str = "day",
+    ) -> List[Tuple]:
+        """Get complaint counts per (day or month, category) in one grouped query.
+
+        Returns:
+            list of (bucket, category_name, count) where bucket is a date for
+            granularity="day" and a month number (1-12) for granularity="month"
+        """
+        from sqlalchemy import and_
+
+        if granularity == "month":
+            bucket = cast(func.extract("month", Complaint.created_at), Integer)
+        else:
+            bucket = cast(Complaint.created_at, Date)
+
+        conditions = [
+            Complaint.barangay_id == barangay_id,
+            Complaint.created_at >= start_date,
+        ]
+        if end_date is not None:
+            conditions.append(Complaint.created_at <= end_date)
+
+        result = await db.execute(
+            select(
+                bucket.label("bucket"),
+                Category.category_name,
+                func.count(Complaint.id).label("count")
+            )
+            .join(Category, Complaint.category_id == Category.id)
+            .where(and_(*conditions))
+            .group_by(bucket, Category.category_name)
+        )
+
+        return result.all()
+
+
+class DailyRollupHelper:
+    """Incremental maintenance and reads of the complaint_daily_rollup table."""
+
+    KIND_CURRENT = "current"
+    KIND_REACHED = "reached"
+
+    # Statuses whose dashboard buckets stay counted after the complaint moves on
+    MILESTONE_STATUSES = {
+        "forwarded_to_lgu",
+        "forwarded_to_department",
+    }
+
+    _UNCHANGED = object()
+
+    @staticmethod
+    async def _upsert_deltas(db: AsyncSession, deltas: dict) -> None:
+        """Apply {(day, barangay_id, category_id, department_account_id, kind, status): delta} in one statement."""
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from app.models.complaint_daily_rollup import ComplaintDailyRollup
+
+        rows = [
+            {
+                "day": day,
+                "barangay_id": barangay_id,
+                "category_id": category_id,
+                "department_account_id": department_account_id,
+                "kind": kind,
+                "status": status,
+                "count": delta,
+            }
+            for (day, barangay_id, category_id, department_account_id, kind, status), delta in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return
+
+        stmt = pg_insert(ComplaintDailyRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "barangay_id", "category_id", "department_account_id", "kind", "status"],
+            set_={"count": ComplaintDailyRollup.count + stmt.excluded.count},
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    def _complaint_groups(complaint_ids: List[int]):
+        complaint_day = cast(Complaint.created_at, Date)
+        department = func.coalesce(Complaint.department_account_id, 0)
+        return (
+            select(
+                complaint_day,
+                Complaint.barangay_id,
+                Complaint.category_id,
+                department,
+                Complaint.status,
+                func.count(Complaint.id),
+            )
+            .where(Complaint.id.in_(complaint_ids))
+            .group_by(complaint_day, Complaint.barangay_id, Complaint.category_id, department, Complaint.status)
+        )
+
+    @staticmethod
+    async def record_created(db: AsyncSession, complaint_ids: List[int]) -> None:
+        """Count freshly inserted (and flushed) complaints under their initial status."""
+        if not complaint_ids:
+            return
+
+        result = await db.execute(DailyRollupHelper._complaint_groups(complaint_ids))
+        deltas: dict = {}
+        for day, barangay_id, category_id, department_id, status_val, count in result.all():
+            if status_val is None:
+                continue
+            key = (day, barangay_id, category_id, department_id, DailyRollupHelper.KIND_CURRENT, status_val)
+            deltas[key] = deltas.get(key, 0) + count
+
+        await DailyRollupHelper._upsert_deltas(db, deltas)
+
+    @staticmethod
+    async def apply_transition(
+        db: AsyncSession,
+        complaint_ids: List[int],
+        new_status: str,
+        department_account_id=_UNCHANGED,
+        count_milestone: bool = True,
+    ) -> None:
+        """Move complaints between status buckets.
+
+        Must run in the same transaction as, and before, the UPDATE that changes
+        the complaint status (and before log_status_change), since it reads the
+        old status and the existing status logs. Pass count_milestone=False for
+        transitions that write no complaint log, so the "reached" rows stay in
+        line with what the nightly rebuild derives from complaint_logs.
+        """
+        if not complaint_ids:
+            return
+
+        from app.models.complaint_logs import ComplaintLogs
+
+        result = await db.execute(DailyRollupHelper._complaint_groups(complaint_ids))
+        deltas: dict = {}
+        for day, barangay_id, category_id, department_id, status_val, count in result.all():
+            new_department_id = (
+                department_id if department_account_id is DailyRollupHelper._UNCHANGED
+                else (department_account_id or 0)
+            )
+            if status_val == new_status and new_department_id == department_id:
+                continue
+            if status_val is not None:
+                old_key = (day, barangay_id, category_id, department_id, DailyRollupHelper.KIND_CURRENT, status_val)
+                deltas[old_key] = deltas.get(old_key, 0) - count
+            new_key = (day, barangay_id, category_id, new_department_id, DailyRollupHelper.KIND_CURRENT, new_status)
+            deltas[new_key] = deltas.get(new_key, 0) + count
+
+        if count_milestone and new_status in DailyRollupHelper.MILESTONE_STATUSES:
+            # Only complaints entering this milestone for the first time
+            complaint_day = cast(Complaint.created_at, Date)
+            department = func.coalesce(Complaint.department_account_id, 0)
+            first_time = await db.execute(
+                select(
+                    complaint_day,
+                    Complaint.barangay_id,
+                    Complaint.category_id,
+                    department,
+                    func.count(Complaint.id),
+                )
+                .where(
+                    Complaint.id.in_(complaint_ids),
+                    ~select(ComplaintLogs.id)
+                    .where(
+                        ComplaintLogs.complaint_id == Complaint.id,
+                        ComplaintLogs.new_status == new_status,
+                    )
+                    .exists(),
+                )
+                .group_by(complaint_day, Complaint.barangay_id, Complaint.category_id, department)
+            )
+            for day, barangay_id, category_id, department_id, count in first_time.all():
+                if department_account_id is not DailyRollupHelper._UNCHANGED:
+                    department_id = department_account_id or 0
+                key = (day, barangay_id, category_id, department_id, DailyRollupHelper.KIND_REACHED, new_status)
+                deltas[key] = deltas.get(key, 0) + count
+
+        await DailyRollupHelper._upsert_deltas(db, deltas)
+
+    @staticmethod
+    async def rebuild(db: AsyncSession) -> int:
+        """Recompute the whole rollup from complaint and complaint_logs rows.
+
+        Runs entirely inside the database; used by the nightly reconciliation
+        job to correct any drift from writes that bypassed apply_transition.
+        Returns the number of rollup rows written. Caller commits.
+        """
+        from sqlalchemy import delete, literal, insert
+        from app.models.complaint_daily_rollup import ComplaintDailyRollup
+        from app.models.complaint_logs import ComplaintLogs
+
+        complaint_day = cast(Complaint.created_at, Date)
+        department = func.coalesce(Complaint.department_account_id, 0)
+        columns = ["day", "barangay_id", "category_id", "department_account_id", "kind", "status", "count"]
+
+        current_rows = (
+            select(
+                complaint_day,
+                Complaint.barangay_id,
+                Complaint.category_id,
+                department,
+                literal(DailyRollupHelper.KIND_CURRENT),
+                Complaint.status,
+                func.count(Complaint.id),
+            )
+            .where(Complaint.status.is_not(None))
+            .group_by(complaint_day, Complaint.barangay_id, Complaint.category_id, department, Complaint.status)
+        )
+
+        reached_rows = (
+            select(
+                complaint_day,
+                Complaint.barangay_id,
+                Complaint.category_id,
+                department,
+                literal(DailyRollupHelper.KIND_REACHED),
+                ComplaintLogs.new_status,
+                func.count(func.distinct(Complaint.id)),
+            )
+            .join(ComplaintLogs, ComplaintLogs.complaint_id == Complaint.id)
+            .where(ComplaintLogs.new_status.in_(list(DailyRollupHelper.MILESTONE_STATUSES)))
+            .group_by(complaint_day, Complaint.barangay_id, Complaint.category_id, department, ComplaintLogs.new_status)
+        )
+
+        await db.execute(delete(ComplaintDailyRollup))
+        current_result = await db.execute(
+            insert(ComplaintDailyRollup).from_select(columns, current_rows)
+        )
+        reached_result = await db.execute(
+            insert(ComplaintDailyRollup).from_select(columns, reached_rows)
+        )
+        return (current_result.rowcount or 0) + (reached_result.rowcount or 0)
+
+    @staticmethod
+    async def get_status_counts_by_day(
+        db: AsyncSession,
+        since,
+        statuses: List[str],
+        kind: str = "current",
+        department_account_id: Optional[int] = None,
+    ) -> List[Tuple]:
+        """(day, status, count) rows from the rollup for days >= since."""
+        from app.models.complaint_daily_rollup import ComplaintDailyRollup
+
+        query = (
+            select(
+                ComplaintDailyRollup.day,
+                ComplaintDailyRollup.status,
+                func.sum(ComplaintDailyRollup.count).label("count"),
+            )
+            .where(
+                ComplaintDailyRollup.kind == kind,
+                ComplaintDailyRollup.day >= since,
+                ComplaintDailyRollup.status.in_(statuses),
+            )
+            .group_by(ComplaintDailyRollup.day, ComplaintDailyRollup.status)
+        )
+        if department_account_id is not None:
+            query = query.where(ComplaintDailyRollup.department_account_id == department_account_id)
+
+        result = await db.execute(query)
+        return [(day, status_val, int(count or 0)) for day, status_val, count in result.all()]
+
+    @staticmethod
+    async def get_counts_by_barangay_category(db: AsyncSession) -> dict:
+        """{(barangay_id, category_id): total complaints} from the rollup."""
+        from app.models.complaint_daily_rollup import ComplaintDailyRollup
+
+        result = await db.execute(
+            select(
+                ComplaintDailyRollup.barangay_id,
+                ComplaintDailyRollup.category_id,
+                func.sum(ComplaintDailyRollup.count).label("count"),
+            )
+            .where(ComplaintDailyRollup.kind == DailyRollupHelper.KIND_CURRENT)
+            .group_by(ComplaintDailyRollup.barangay_id, ComplaintDailyRollup.category_id)
+        )
+        return {(row.barangay_id, row.category_id): int(row.count or 0) for row in result.all()}
@@ -1,8 +1,57 @@
 import json
-import redis.asyncio as aioredis
 from app.core.config import settings
+from app.core.redis import redis_client
 
-redis_client = aioredis.from_url(settings.REDIS_URL)
+BROADCAST_CHANNEL = "sse:broadcast"
+USER_CHANNEL_PREFIX = "sse:user:"
+USER_STREAM_PREFIX = "sse:stream:"
+
+# Append the event to the user's capped replay stream, then publish it with the
+# stream ID so live and replayed copies of an event carry the same SSE id.
+# `data` is passed and published as an already-encoded JSON string.
+PUBLISH_USER_EVENT_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[3], '*', 'event', ARGV[1], 'data', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('PUBLISH', KEYS[2], cjson.encode({id = id, event = ARGV[1], data = ARGV[2]}))
+return id
+"""
+
+
+def user_channel(user_id) -> str:
+    """Per-user SSE channel; API processes subscribe only for users they stream to."""
+    return f"{USER_CHANNEL_PREFIX}{user_id}"
+
+
+def user_stream(user_id) -> str:
+    """Per-user Redis Stream holding recent SSE events for Last-Event-ID replay."""
+    return f"{USER_STREAM_PREFIX}{user_id}"
+
+
+def _user_event_args(user_id, event: str, data) -> tuple:
+    return (
+        PUBLISH_USER_EVENT_SCRIPT,
+        2,
+        user_stream(user_id),
+        user_channel(user_id),
+        event,
+        json.dumps(data),
+        settings.SSE_REPLAY_MAXLEN,
+        settings.SSE_REPLAY_TTL_SECONDS,
+    )
+
+
+async def publish_user_sse_event(user_id, event: str, data, client=None):
+    """Record and publish one user event; returns its stream ID."""
+    return await (client or redis_client).eval(*_user_event_args(user_id, event, data))
 
 async def publish_sse_event(channel: str, payload: dict):
-    await redis_client.publish(channel, json.dumps(payload))
\ No newline at end of file
+    await redis_client.publish(channel, json.dumps(payload))
+
+async def publish_user_sse_events(payloads: list):
+    """Record and publish events to each payload's target user in one pipelined round-trip."""
+    if not payloads:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for payload in payloads:
+        pipe.eval(*_user_event_args(payload["target"], payload.get("event", "message"), payload.get("data", {})))
+    await pipe.execute()
@@ -1,6 +1,7 @@
 import logging
 from fastapi import HTTPException, Request, status
 import httpx
+from app.core.clients import clients
 from app.core.config import settings
 
 TURNSTILE_VERIFY_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
@@ -30,10 +31,9 @@ async def verify_turnstile(token: str | None, request: Request) -> None:
         payload["remoteip"] = request.client.host
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post(TURNSTILE_VERIFY_URL, data=payload)
-            response.raise_for_status()
-            result = response.json()
+        response = await clients.http.post(TURNSTILE_VERIFY_URL, data=payload)
+        response.raise_for_status()
+        result = response.json()
     except httpx.HTTPError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
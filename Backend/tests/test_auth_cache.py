@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+from app.core import auth_cache as auth_cache_module
+from app.core import security
+from app.core.auth_cache import AuthCache
+
+
+class FakePubSub:
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield
+
+    async def close(self):
+        pass
+
+
+class FakePubSubClient:
+    def pubsub(self):
+        return FakePubSub()
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    def ttl(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        return [self.redis.ttls[key] for key in self.keys]
+
+
+class FakeRedis:
+    """Denylist written before the index existed: only jwt_denylist:{jti} keys."""
+
+    def __init__(self, ttls):
+        self.ttls = dict(ttls)
+        self.index = {}
+        self.strings = {}
+
+    async def exists(self, key):
+        return int(key in self.ttls or key in self.strings)
+
+    async def set(self, key, value):
+        self.strings[key] = value
+
+    async def zrangebyscore(self, key, low, high, withscores=False):
+        return [(jti, score) for jti, score in self.index.items() if score >= low]
+
+    async def zadd(self, key, mapping):
+        self.index.update(mapping)
+
+    async def scan_iter(self, match, count):
+        prefix = match.rstrip("*")
+        for key in list(self.ttls):
+            if key.startswith(prefix):
+                yield key
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def test_full_claims_cache_evicts_least_recently_used():
+    cache = AuthCache(max_tokens=2, user_ttl_seconds=60)
+    exp = time.time() + 3600
+    cache.put_claims("a", {"exp": exp})
+    cache.put_claims("b", {"exp": exp})
+    assert cache.get_claims("a") is not None
+
+    cache.put_claims("c", {"exp": exp})
+
+    assert cache.get_claims("b") is None
+    assert cache.get_claims("a") is not None
+    assert cache.get_claims("c") is not None
+
+
+def test_full_claims_cache_sweeps_expired_entries_first():
+    cache = AuthCache(max_tokens=2, user_ttl_seconds=60)
+    cache.put_claims("stale", {"exp": time.time() - 1})
+    cache.put_claims("a", {"exp": time.time() + 3600})
+
+    cache.put_claims("b", {"exp": time.time() + 3600})
+
+    assert cache.get_claims("a") is not None
+    assert cache.get_claims("b") is not None
+    assert cache.stats()["cached_tokens"] == 2
+
+
+def test_token_revoked_before_the_index_stays_revoked(monkeypatch):
+    redis = FakeRedis({"jwt_denylist:old-refresh": 7 * 24 * 3600})
+    cache = AuthCache(max_tokens=10, user_ttl_seconds=60)
+    monkeypatch.setattr(auth_cache_module, "redis_client", redis)
+    monkeypatch.setattr(auth_cache_module, "pubsub_client", FakePubSubClient())
+    monkeypatch.setattr(security, "redis_client", redis)
+    monkeypatch.setattr(security, "auth_cache", cache)
+
+    async def run():
+        try:
+            old = await security.is_token_revoked("old-refresh")
+            # Answered from the local set, not the Redis fallback
+            assert cache.synced
+            return old, await security.is_token_revoked("fresh")
+        finally:
+            await cache.stop()
+
+    old_revoked, fresh_revoked = asyncio.run(run())
+
+    assert old_revoked is True
+    assert fresh_revoked is False
+    assert "old-refresh" in redis.index
+    assert auth_cache_module.TOKEN_DENYLIST_BACKFILLED in redis.strings
@@ -0,0 +1,142 @@
+"""ChatbotService caching and memory rules, with in-memory fakes for Redis, Pinecone and OpenAI."""
+
+import asyncio
+
+from app.domain.chatbot.rag_service import RAGResponse, RAGService
+from app.domain.infrastracture.service.chatbot_service import ChatbotService
+from app.domain.interfaces.i_rag_model import IRAGLanguageModel, IStreamingRAGLanguageModel, LanguageModelError
+from app.domain.value_objects.rag_retrieval_result import RAGRetrievalResult
+from app.services.rag_memory_service import SessionContext
+
+CHUNK = RAGRetrievalResult(chunk_id="faq#1", text="Clearance costs 50 pesos.", source="faq.pdf", score=0.9, metadata={})
+APOLOGY = "Paumanhin, mabagal ang koneksyon sa ngayon."
+
+
+class FakeVectorRepo:
+    async def retrieve_similar_chunks(self, embedding, top_k=5, filters=None, query_text=None):
+        return [CHUNK]
+
+
+class FakeModel(IRAGLanguageModel):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    async def generate_answer(self, question, context, history=None):
+        self.calls += 1
+        if self.fail:
+            raise LanguageModelError(APOLOGY)
+        return "Fifty pesos."
+
+    async def generate_no_context_answer(self, question, history=None):
+        return "Please ask your barangay."
+
+
+class FakeEmbedder:
+    async def generate(self, text):
+        return [1.0, 0.0]
+
+
+class FakeMemory:
+    def __init__(self, history=None):
+        self.history = history or []
+        self.saved = []
+
+    async def load_session(self, user_id, session_id):
+        return SessionContext(history=self.history, is_new_session=False)
+
+    async def save_turn(self, user_id, session_id, question, answer):
+        self.saved.append((question, answer))
+
+
+class FakeAnswerCache:
+    def __init__(self, cached=None):
+        self.cached = cached
+        self.lookups = 0
+        self.stored = []
+
+    async def get_exact(self, question):
+        self.lookups += 1
+        return self.cached
+
+    async def get_similar(self, embedding):
+        self.lookups += 1
+        return self.cached
+
+    async def store(self, question, embedding, response):
+        self.stored.append(response)
+
+
+def _service(model, memory, cache):
+    rag = RAGService(vector_repo=FakeVectorRepo(), language_model=model)
+    return ChatbotService(rag_service=rag, embedding_service=FakeEmbedder(), memory=memory, answer_cache=cache)
+
+
+def test_answer_is_cached_and_remembered():
+    memory, cache = FakeMemory(), FakeAnswerCache()
+    result = asyncio.run(_service(FakeModel(), memory, cache).ask("How much is clearance?", "1", "s"))
+    assert result.answer == "Fifty pesos."
+    assert len(cache.stored) == 1
+    assert memory.saved == [("How much is clearance?", "Fifty pesos.")]
+
+
+def test_model_failure_is_shown_but_never_cached_or_remembered():
+    memory, cache = FakeMemory(), FakeAnswerCache()
+    result = asyncio.run(_service(FakeModel(fail=True), memory, cache).ask("How much is clearance?", "1", "s"))
+    assert result.answer == APOLOGY
+    assert result.is_fallback
+    assert cache.stored == []
+    assert memory.saved == []
+
+
+def test_follow_up_questions_bypass_the_cache():
+    cached = RAGResponse(answer="Clearance costs 50 pesos.", sources=[CHUNK], is_grounded=True)
+    history = [{"role": "user", "content": "Need a clearance"}, {"role": "assistant", "content": "Sure."}]
+    memory, cache, model = FakeMemory(history), FakeAnswerCache(cached), FakeModel()
+    result = asyncio.run(_service(model, memory, cache).ask("magkano po yun?", "1", "s"))
+    assert cache.lookups == 0
+    assert model.calls == 1
+    assert result.answer == "Fifty pesos."
+
+
+def test_fresh_session_uses_the_cache():
+    cached = RAGResponse(answer="Clearance costs 50 pesos.", sources=[CHUNK], is_grounded=True)
+    memory, cache, model = FakeMemory(), FakeAnswerCache(cached), FakeModel()
+    result = asyncio.run(_service(model, memory, cache).ask("How much is clearance?", "1", "s"))
+    assert result is cached
+    assert model.calls == 0
+
+
+class FakeStreamingModel(FakeModel, IStreamingRAGLanguageModel):
+    async def stream_answer(self, question, context, history=None):
+        self.calls += 1
+        if self.fail:
+            raise LanguageModelError(APOLOGY)
+        for fragment in ("Fifty ", "pesos."):
+            yield fragment
+
+    async def stream_no_context_answer(self, question, history=None):
+        yield "Please ask your barangay."
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+def test_stream_failure_ends_with_error_and_is_not_cached_or_remembered():
+    memory, cache = FakeMemory(), FakeAnswerCache()
+    service = _service(FakeStreamingModel(fail=True), memory, cache)
+    events = asyncio.run(_collect(service.ask_stream("How much is clearance?", "1", "s")))
+    assert events == [("error", {"detail": APOLOGY})]
+    assert cache.stored == []
+    assert memory.saved == []
+
+
+def test_stream_success_is_cached_and_remembered():
+    memory, cache = FakeMemory(), FakeAnswerCache()
+    service = _service(FakeStreamingModel(), memory, cache)
+    events = asyncio.run(_collect(service.ask_stream("How much is clearance?", "1", "s")))
+    assert events[-1] == ("done", {"is_grounded": True})
+    assert "".join(data["text"] for event, data in events if event == "token") == "Fifty pesos."
+    assert len(cache.stored) == 1
+    assert memory.saved == [("How much is clearance?", "Fifty pesos.")]
@@ -0,0 +1,20 @@
+"""Fused retrieval keeps the cosine threshold, so grounding means what it did with Pinecone alone."""
+
+from app.domain.IEmbeddingService.vector_store.hybrid_rag_repository import HybridRAGVectorRepository
+
+
+def _repository():
+    repo = HybridRAGVectorRepository(vector_repo=None)
+    repo._put("faq#clearance", [1.0, 0.0], {"content": "Barangay clearance requires a valid ID.", "source": "faq.pdf"})
+    repo._put("faq#garbage", [0.0, 1.0], {"content": "Garbage trucks pass the barangay on Mondays.", "source": "faq.pdf"})
+    return repo
+
+
+def test_keyword_match_below_cosine_threshold_is_dropped():
+    ranked = _repository()._rank([1.0, 0.0], "garbage clearance", None)
+    assert [chunk_id for chunk_id, _ in ranked] == ["faq#clearance"]
+
+
+def test_off_topic_question_sharing_a_keyword_gets_no_context():
+    ranked = _repository()._rank([-1.0, -1.0], "barangay garbage", None)
+    assert ranked == []
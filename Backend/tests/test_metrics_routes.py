@@ -0,0 +1,33 @@
+"""Process metrics expose internals and must stay behind the superadmin check."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies.auth_dependency import get_current_user
+from app.models.user import User
+from app.routers import metrics_routes
+
+
+def _client(role):
+    app = FastAPI()
+    app.include_router(metrics_routes.router, prefix="/metrics")
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, role=role)
+    return TestClient(app)
+
+
+def test_metrics_require_superadmin():
+    client = _client("lgu_official")
+    for path in ["/metrics/db-pool", "/metrics/auth", "/metrics/sse", "/metrics/rag-retrieval"]:
+        assert client.get(path).status_code == 403
+
+
+def test_superadmin_reads_metrics():
+    response = _client("superadmin").get("/metrics/auth")
+    assert response.status_code == 200
+    assert "cached_tokens" in response.json()
+
+
+def test_metrics_reject_anonymous_requests():
+    app = FastAPI()
+    app.include_router(metrics_routes.router, prefix="/metrics")
+    assert TestClient(app).get("/metrics/auth").status_code in (401, 403)
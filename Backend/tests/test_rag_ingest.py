@@ -0,0 +1,209 @@
+"""
+Runs _ingest_pdf the way the Celery worker does: inside a daemonic billiard
+pool child (docker-compose starts the worker with the prefork pool), through
+run_async on the per-process worker loop.
+
+Redis, OpenAI and Pinecone are replaced with in-memory fakes; PDF parsing,
+chunking, page-range extraction and the sync plan run for real.
+"""
+
+import asyncio
+
+import pytest
+
+billiard = pytest.importorskip("billiard")
+pytest.importorskip("pdfplumber")
+
+# app.tasks first: rag_services reaches its embedding factory through app.tasks
+from app.tasks import rag_tasks
+from app.services import rag_services
+from app.tasks.worker_loop import run_async
+
+
+SECTIONS = [
+    ("GARBAGE COLLECTION", "Trash is collected every Monday and Thursday morning."),
+    ("BARANGAY CLEARANCE", "Bring a valid ID and pay the fee at the barangay hall."),
+]
+
+
+def _write_pdf(path, pages):
+    """Minimal PDF with one Helvetica text block per page."""
+    page_count = len(pages)
+    font_id = 3 + 2 * page_count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        (
+            "<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (" ".join(f"{3 + 2 * i} 0 R" for i in range(page_count)), page_count)
+        ).encode(),
+    ]
+    for i, lines in enumerate(pages):
+        content = "BT /F1 12 Tf 72 720 Td " + " 0 -20 Td ".join(f"({line}) Tj" for line in lines) + " ET"
+        objects.append((
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        ).encode())
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+
+
+class FakeIndex:
+    def __init__(self, stored_ids=()):
+        self.stored = set(stored_ids)
+        self.upserted = []
+        self.deleted = []
+
+    def list(self, prefix=""):
+        yield [chunk_id for chunk_id in sorted(self.stored) if chunk_id.startswith(prefix)]
+
+    def upsert(self, vectors):
+        self.upserted.extend(v["id"] for v in vectors)
+        self.stored.update(v["id"] for v in vectors)
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+        self.stored.difference_update(ids)
+
+
+class FakeAnswerCache:
+    def __init__(self):
+        self.invalidated = []
+
+    async def invalidate_chunks(self, chunk_ids):
+        self.invalidated.extend(chunk_ids)
+        return 0
+
+
+class FakeRedis:
+    async def expire(self, key, seconds):
+        return True
+
+
+def _ingest_in_worker(job_id, file_path, source, stored_ids):
+    """Runs in the pool child, like ingest_pdf_task."""
+    daemon = billiard.current_process().daemon
+    index = FakeIndex(stored_ids)
+    job = {}
+    embedded = []
+    corpus_changes = []
+    answer_cache = FakeAnswerCache()
+
+    async def update_ingest_job(_job_id, **fields):
+        job.update(fields)
+
+    async def advance_ingest_job(_job_id, field, amount):
+        job[field] = job.get(field, 0) + amount
+
+    async def embed(texts, on_batch=None):
+        embedded.extend(texts)
+        vectors = [[0.0] * 4 for _ in texts]
+        if on_batch is not None and texts:
+            await on_batch(0, vectors)
+        return vectors
+
+    async def record_corpus_changes(chunk_ids):
+        corpus_changes.extend(chunk_ids)
+
+    rag_tasks.update_ingest_job = update_ingest_job
+    rag_tasks.advance_ingest_job = advance_ingest_job
+    rag_tasks._embed = embed
+    rag_tasks._get_or_create_index = lambda: index
+    rag_tasks.record_corpus_changes = record_corpus_changes
+    rag_tasks.semantic_answer_cache = answer_cache
+    rag_tasks.redis_client = FakeRedis()
+
+    run_async(rag_tasks._ingest_pdf(job_id, file_path, source))
+    return {
+        "daemon": daemon,
+        "job": job,
+        "embedded": embedded,
+        "upserted": index.upserted,
+        "deleted": index.deleted,
+        "stored": sorted(index.stored),
+        "corpus_changes": corpus_changes,
+        "invalidated": answer_cache.invalidated,
+    }
+
+
+def _run_in_worker_pool(*args):
+    pool = billiard.Pool(processes=1)
+    try:
+        return pool.apply(_ingest_in_worker, args)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _pages(sections):
+    return [[title, body] for title, body in sections]
+
+
+def test_ingest_runs_inside_daemonic_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_tasks.settings, "RAG_INGEST_PAGES_PER_TASK", 1)
+    pdf_path = tmp_path / "faq.pdf"
+    _write_pdf(pdf_path, _pages(SECTIONS))
+
+    result = _run_in_worker_pool("job-1", str(pdf_path), "faq.pdf", [])
+
+    assert result["daemon"] is True
+    assert result["job"]["status"] == "completed"
+    assert result["job"]["pages_total"] == 2
+    assert result["job"]["pages_extracted"] == 2
+    assert result["job"]["chunks_total"] == 2
+    assert result["job"]["chunks_indexed"] == 2
+    assert len(result["upserted"]) == 2
+    assert all(chunk_id.startswith("faq#") for chunk_id in result["upserted"])
+
+
+def test_reingest_embeds_only_changed_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_tasks.settings, "RAG_INGEST_PAGES_PER_TASK", 1)
+    chunks = rag_services._assign_chunk_ids(
+        [{"chunk_id": i + 1, "title": t, "content": f"{t}\n{b}"} for i, (t, b) in enumerate(SECTIONS)],
+        "faq.pdf",
+    )
+    stored_ids = [c["id"] for c in chunks] + ["faq#removedsection"]
+
+    amended = [SECTIONS[0], ("BARANGAY CLEARANCE", "Bring a valid ID. The fee is now waived for seniors.")]
+    pdf_path = tmp_path / "faq.pdf"
+    _write_pdf(pdf_path, _pages(amended))
+
+    result = _run_in_worker_pool("job-2", str(pdf_path), "faq.pdf", stored_ids)
+
+    assert result["job"]["status"] == "completed"
+    assert result["job"]["chunks_unchanged"] == 1
+    assert len(result["embedded"]) == 1
+    assert "waived" in result["embedded"][0]
+    assert sorted(result["deleted"]) == sorted([chunks[1]["id"], "faq#removedsection"])
+    assert sorted(result["invalidated"]) == sorted(result["deleted"])
+    assert chunks[0]["id"] in result["stored"]
+
+
+def test_prune_legacy_chunks_keeps_content_addressed_ids(monkeypatch):
+    index = FakeIndex(["chunk_1", "chunk_2", "faq#abc123"])
+    answer_cache = FakeAnswerCache()
+    corpus_changes = []
+
+    async def record_corpus_changes(chunk_ids):
+        corpus_changes.extend(chunk_ids)
+
+    monkeypatch.setattr(rag_tasks, "_get_or_create_index", lambda: index)
+    monkeypatch.setattr(rag_tasks, "record_corpus_changes", record_corpus_changes)
+    monkeypatch.setattr(rag_tasks, "semantic_answer_cache", answer_cache)
+
+    pruned = asyncio.run(rag_tasks._prune_legacy_chunks())
+
+    assert pruned == 2
+    assert sorted(index.stored) == ["faq#abc123"]
+    assert corpus_changes == ["chunk_1", "chunk_2"]
+    assert answer_cache.invalidated == ["chunk_1", "chunk_2"]
@@ -0,0 +1,47 @@
+"""Results read from a replica must not be cached for the primary's usual TTL."""
+
+import asyncio
+import contextvars
+
+from app.utils import caching
+
+
+class FakeRedis:
+    def __init__(self):
+        self.writes = []
+
+    async def setex(self, key, expiration, value):
+        self.writes.append((key, expiration))
+
+
+def _set_cache(mark_replica: bool):
+    async def run():
+        if mark_replica:
+            caching.mark_served_from_replica()
+        await caching.set_cache("stats:weekly", {"total": 3}, expiration=3600)
+
+    # Fresh context per call, like one request per task
+    contextvars.Context().run(asyncio.run, run())
+
+
+def test_primary_reads_keep_their_ttl(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(caching, "redis_auto", redis)
+    _set_cache(mark_replica=False)
+    assert redis.writes == [("stats:weekly", 3600)]
+
+
+def test_replica_reads_are_cached_briefly(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(caching, "redis_auto", redis)
+    monkeypatch.setattr(caching.settings, "REPLICA_CACHE_TTL_SECONDS", 15)
+    _set_cache(mark_replica=True)
+    assert redis.writes == [("stats:weekly", 15)]
+
+
+def test_replica_reads_skip_cache_when_disabled(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(caching, "redis_auto", redis)
+    monkeypatch.setattr(caching.settings, "REPLICA_CACHE_TTL_SECONDS", 0)
+    _set_cache(mark_replica=True)
+    assert redis.writes == []